@@ -69,17 +69,52 @@ TEMPLATES = [
 WSGI_APPLICATION = 'user_service.wsgi.application'
 
 # Database
+# Connection handling. By default each worker thread keeps its connection for
+# DB_CONN_MAX_AGE seconds and checks it before reuse. DB_POOL_ENABLED swaps in
+# a process-wide pool (users.db.pool) that connections return to after every
+# request; use it for ASGI, where request threads do not live long enough to
+# benefit from persistent connections.
+DB_POOL = {
+    'ENABLED': config('DB_POOL_ENABLED', default=False, cast=bool),
+    'MAX_SIZE': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+    'TIMEOUT': config('DB_POOL_TIMEOUT', default=5, cast=float),
+    'MAX_LIFETIME': config('DB_POOL_MAX_LIFETIME', default=1800, cast=int),
+    'CHECK_AFTER': config('DB_POOL_CHECK_AFTER', default=30, cast=int),
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'users.db.pooled_postgresql' if DB_POOL['ENABLED'] else 'django.db.backends.postgresql',
         'NAME': config('DB_NAME', default='user_service'),
         'USER': config('DB_USER', default='postgres'),
         'PASSWORD': config('DB_PASSWORD', default='password'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default=5432),
+        'CONN_MAX_AGE': 0 if DB_POOL['ENABLED'] else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
     }
 }
 
+# Read replica. With DB_REPLICA_ENABLED, list/retrieve/bulk lookups, status
+# history, segment exports and user cache reloads read from the 'replica'
+# alias (see users.routers); a request that writes reads the primary from
+# then on. Users written in the last STICKY_SECONDS are reloaded from the
+# primary. Under tests the alias mirrors default.
+DATABASE_REPLICA = {
+    'ENABLED': config('DB_REPLICA_ENABLED', default=False, cast=bool),
+    'ALIAS': 'replica',
+    'STICKY_SECONDS': config('DB_REPLICA_STICKY_SECONDS', default=5, cast=int),
+}
+
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'HOST': config('DB_REPLICA_HOST', default=DATABASES['default']['HOST']),
+    'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+    'TEST': {'MIRROR': 'default'},
+}
+
+DATABASE_ROUTERS = ['users.routers.PrimaryReplicaRouter']
+
 # Redis Cache
 CACHES = {
     'default': {
@@ -108,6 +143,54 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing. PASSWORD_HASHING['ALGORITHM'] picks the hasher for new
+# passwords; hashes from the others still verify and are upgraded on the
+# next login. Argon2 needs argon2-cffi and bcrypt needs bcrypt installed.
+# `manage.py benchmark_password_hashers` reports the per-request cost.
+PASSWORD_HASHING = {
+    'ALGORITHM': config('PASSWORD_HASH_ALGORITHM', default='pbkdf2'),
+    'PBKDF2_ITERATIONS': config('PASSWORD_HASH_PBKDF2_ITERATIONS', default=600000, cast=int),
+    'ARGON2_TIME_COST': config('PASSWORD_HASH_ARGON2_TIME_COST', default=2, cast=int),
+    'ARGON2_MEMORY_COST': config('PASSWORD_HASH_ARGON2_MEMORY_COST', default=102400, cast=int),
+    'ARGON2_PARALLELISM': config('PASSWORD_HASH_ARGON2_PARALLELISM', default=8, cast=int),
+    'BCRYPT_ROUNDS': config('PASSWORD_HASH_BCRYPT_ROUNDS', default=12, cast=int),
+}
+
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'users.hashers.TunedPBKDF2PasswordHasher',
+    'argon2': 'users.hashers.TunedArgon2PasswordHasher',
+    'bcrypt': 'users.hashers.TunedBCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHING['ALGORITHM']]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items()
+    if name != PASSWORD_HASHING['ALGORITHM']
+]
+
+# Passwords are hashed and verified on a dedicated thread pool; requests
+# beyond WORKERS running + QUEUE_DEPTH waiting get 429 instead of queueing.
+PASSWORD_HASH_POOL = {
+    'WORKERS': config('PASSWORD_HASH_POOL_WORKERS', default=4, cast=int),
+    'QUEUE_DEPTH': config('PASSWORD_HASH_POOL_QUEUE_DEPTH', default=16, cast=int),
+}
+
+AUTHENTICATION_BACKENDS = [
+    'users.backends.PooledModelBackend',
+]
+
+# Sliding-window rate limits ('num/period'), enforced atomically in Redis.
+# login_* and register_ip guard the password hashing endpoints; status_callback
+# applies per service credential to the notification status endpoints.
+RATE_LIMIT = {
+    'ENABLED': config('RATE_LIMIT_ENABLED', default=True, cast=bool),
+    'BACKEND': config('RATE_LIMIT_BACKEND', default='users.throttling.RedisRateLimitBackend'),
+    'RATES': {
+        'login_ip': config('RATE_LIMIT_LOGIN_IP', default='30/min'),
+        'login_email': config('RATE_LIMIT_LOGIN_EMAIL', default='10/min'),
+        'register_ip': config('RATE_LIMIT_REGISTER_IP', default='20/hour'),
+        'status_callback': config('RATE_LIMIT_STATUS_CALLBACK', default='6000/min'),
+    },
+}
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -127,14 +210,28 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Same bytes as rest_framework.renderers.JSONRenderer, encoded with orjson,
+    # except for exponent and non-finite floats (see ORJSONRenderer);
+    # internal services can send and accept application/msgpack instead
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'users.renderers.ORJSONRenderer',
+        'users.renderers.MessagePackRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'users.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    # Reverse proxies in front of the app. Per-IP throttles take the client
+    # address from that many X-Forwarded-For hops; 0 uses REMOTE_ADDR, so a
+    # client-supplied X-Forwarded-For can never pick its own throttle key
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
 }
 
 # CORS
@@ -150,6 +247,113 @@ JWT_SECRET_KEY = config('JWT_SECRET_KEY', default=SECRET_KEY)
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_DELTA = timedelta(days=7)
 
+# Authenticated principal cache (in-process LRU in front of Redis)
+AUTH_PRINCIPAL_CACHE = {
+    'ENABLED': config('AUTH_PRINCIPAL_CACHE_ENABLED', default=True, cast=bool),
+    'TTL': config('AUTH_PRINCIPAL_CACHE_TTL', default=300, cast=int),
+    'LOCAL_TTL': config('AUTH_PRINCIPAL_CACHE_LOCAL_TTL', default=30, cast=int),
+    'LOCAL_MAXSIZE': config('AUTH_PRINCIPAL_CACHE_LOCAL_MAXSIZE', default=10000, cast=int),
+}
+
+# Minimum seconds between last_login writes for the same user (0 = every login)
+LAST_LOGIN_UPDATE_INTERVAL = config('LAST_LOGIN_UPDATE_INTERVAL', default=300, cast=int)
+
+# User cache. Redis entries go stale after TTL (+/- JITTER) and are served
+# stale for up to STALE_TTL while a single request, holding a LOCK_TTL lock,
+# reloads them. Entries are encoded with CODEC (users.codecs.JSONCodec, or
+# MsgpackCodec when msgpack is installed) and zlib-compressed from
+# COMPRESS_MIN_SIZE bytes (0 disables). L1_* configure the optional
+# process-local tier in front.
+USER_CACHE = {
+    'CODEC': config('USER_CACHE_CODEC', default='users.codecs.JSONCodec'),
+    'COMPRESS_MIN_SIZE': config('USER_CACHE_COMPRESS_MIN_SIZE', default=1024, cast=int),
+    'TTL': config('USER_CACHE_TTL', default=300, cast=int),
+    'JITTER': config('USER_CACHE_JITTER', default=0.1, cast=float),
+    'STALE_TTL': config('USER_CACHE_STALE_TTL', default=60, cast=int),
+    'LOCK_TTL': config('USER_CACHE_LOCK_TTL', default=5, cast=int),
+    'LOCK_WAIT': config('USER_CACHE_LOCK_WAIT', default=0.2, cast=float),
+    'L1_ENABLED': config('USER_CACHE_L1_ENABLED', default=False, cast=bool),
+    'L1_TTL': config('USER_CACHE_L1_TTL', default=30, cast=int),
+    'L1_MAXSIZE': config('USER_CACHE_L1_MAXSIZE', default=10000, cast=int),
+}
+
+# Redis pub/sub channel that keeps process-local caches (user L1, principal
+# cache) coherent across workers and nodes
+LOCAL_CACHE_INVALIDATION = {
+    'ENABLED': config('LOCAL_CACHE_INVALIDATION_ENABLED', default=True, cast=bool),
+    'CHANNEL': config('LOCAL_CACHE_INVALIDATION_CHANNEL', default='user_service:cache_invalidation'),
+}
+
+# Maximum number of ids accepted by POST /api/v1/users/bulk/
+USER_BULK_LOOKUP_MAX_IDS = config('USER_BULK_LOOKUP_MAX_IDS', default=5000, cast=int)
+
+# Push device registry. Users keep their MAX_PER_USER most recently seen
+# devices; register, unregister and prune accept at most MAX_BATCH tokens per
+# call, and per-user token lists are cached for CACHE_TTL seconds.
+DEVICE_TOKENS = {
+    'MAX_PER_USER': config('DEVICE_TOKENS_MAX_PER_USER', default=20, cast=int),
+    'MAX_BATCH': config('DEVICE_TOKENS_MAX_BATCH', default=500, cast=int),
+    'CACHE_TTL': config('DEVICE_TOKENS_CACHE_TTL', default=300, cast=int),
+}
+
+# Rows fetched per server-side cursor round trip when exporting recipient segments
+SEGMENT_EXPORT_CHUNK_SIZE = config('SEGMENT_EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Maximum number of events accepted by POST /api/v1/status/batch/
+NOTIFICATION_STATUS_BATCH_MAX = config('NOTIFICATION_STATUS_BATCH_MAX', default=1000, cast=int)
+
+# Write-behind ingestion of status callbacks through a Redis stream.
+# When enabled the status endpoints return 202 and `manage.py consume_status_stream`
+# writes the events to notification_status_logs. Each consumer also takes
+# over entries another consumer read but left unacked for CLAIM_IDLE_MS (a
+# crashed worker's), at startup and then every CLAIM_IDLE_MS. Keep it well
+# above the time a batch takes to write.
+NOTIFICATION_STATUS_STREAM = {
+    'ENABLED': config('NOTIFICATION_STATUS_STREAM_ENABLED', default=False, cast=bool),
+    'BACKEND': config('NOTIFICATION_STATUS_STREAM_BACKEND', default='users.streams.RedisStreamBackend'),
+    'NAME': config('NOTIFICATION_STATUS_STREAM_NAME', default='user_service:notification_status_events'),
+    'GROUP': config('NOTIFICATION_STATUS_STREAM_GROUP', default='status-writers'),
+    'MAXLEN': config('NOTIFICATION_STATUS_STREAM_MAXLEN', default=1000000, cast=int),
+    'BATCH_SIZE': config('NOTIFICATION_STATUS_STREAM_BATCH_SIZE', default=500, cast=int),
+    'BLOCK_MS': config('NOTIFICATION_STATUS_STREAM_BLOCK_MS', default=5000, cast=int),
+    'CLAIM_IDLE_MS': config('NOTIFICATION_STATUS_STREAM_CLAIM_IDLE_MS', default=60000, cast=int),
+}
+
+# Range partitions of notification_status_logs on timestamp (PostgreSQL).
+# `manage.py manage_status_partitions` (run daily) keeps PREMAKE upcoming
+# INTERVAL ('day', 'week' or 'month') partitions ahead and drops, or
+# detaches for archiving, partitions older than RETENTION_DAYS (0 keeps all).
+# If the job stops, rows past the newest partition collect in the DEFAULT
+# partition (migration 0010) until the next run moves them out.
+# On PostgreSQL, history queries never look further back than the retention
+# window; other backends keep the plain table and show everything.
+NOTIFICATION_STATUS_PARTITIONS = {
+    'INTERVAL': config('STATUS_PARTITION_INTERVAL', default='month'),
+    'PREMAKE': config('STATUS_PARTITION_PREMAKE', default=3, cast=int),
+    'RETENTION_DAYS': config('STATUS_RETENTION_DAYS', default=180, cast=int),
+    'EXPIRED_ACTION': config('STATUS_PARTITION_EXPIRED_ACTION', default='drop'),
+}
+
+# Local archive of expired status logs, written by
+# `manage.py archive_status_logs` as DIR/<YYYY-MM-DD>/<type>.ndjson.gz.
+# Rows are streamed CHUNK_SIZE at a time and deleted DELETE_BATCH_SIZE at a
+# time once the files are verified. Run it before manage_status_partitions.
+NOTIFICATION_STATUS_ARCHIVE = {
+    'DIR': config('STATUS_ARCHIVE_DIR', default=os.path.join(BASE_DIR, 'archive', 'status_logs')),
+    'CHUNK_SIZE': config('STATUS_ARCHIVE_CHUNK_SIZE', default=5000, cast=int),
+    'DELETE_BATCH_SIZE': config('STATUS_ARCHIVE_DELETE_BATCH_SIZE', default=1000, cast=int),
+    'COMPRESS_LEVEL': config('STATUS_ARCHIVE_COMPRESS_LEVEL', default=6, cast=int),
+}
+
+# Delivery statistics rollups, rebuilt by `manage.py rollup_status_logs` (run
+# every few minutes). Each run recounts buckets from LATE_MINUTES before the
+# previous run, which must cover the status stream's worst consumer lag.
+# GET /api/v1/status/stats/ reads only the rollups, at most MAX_RANGE_DAYS at a time.
+NOTIFICATION_STATUS_ROLLUP = {
+    'LATE_MINUTES': config('STATUS_ROLLUP_LATE_MINUTES', default=60, cast=int),
+    'MAX_RANGE_DAYS': config('STATUS_ROLLUP_MAX_RANGE_DAYS', default=90, cast=int),
+}
+
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 
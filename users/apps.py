@@ -1,8 +1,10 @@
-from django.apps import AppConfig
 # users/apps.py
 from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
-    verbose_name = 'Users'
\ No newline at end of file
+    verbose_name = 'Users'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,236 @@
+# users/archive.py
+import gzip
+import json
+import logging
+import os
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import NotificationStatusLog
+from .partitions import advance, floor
+
+logger = logging.getLogger(__name__)
+
+ArchivedDay = namedtuple('ArchivedDay', ['day', 'notification_type', 'rows', 'deleted', 'path'])
+
+
+class ArchiveError(Exception):
+    """An archive file did not match the rows it was written from."""
+
+
+class StatusLogArchive:
+    """
+    Moves expired NotificationStatusLog rows to gzipped NDJSON files on local
+    disk, one file per UTC day and notification type:
+
+        <DIR>/2026-04-17/email.ndjson.gz
+
+    Each day is streamed off the (timestamp, id) index in chunks, written to a
+    temporary file, re-read and checked against the database count, and only
+    then deleted in bounded batches. A crash at any point leaves either no
+    file or a complete one. Deletes take their ids from the verified file,
+    so rows committed after the day was streamed are left for the next run.
+    """
+    FIELDS = ('id', 'notification_id', 'user_id', 'notification_type', 'status', 'error', 'timestamp')
+    SUFFIX = '.ndjson.gz'
+
+    @staticmethod
+    def config():
+        return settings.NOTIFICATION_STATUS_ARCHIVE
+
+    @classmethod
+    def directory(cls, directory=None):
+        return Path(directory or cls.config()['DIR'])
+
+    @staticmethod
+    def cutoff(days, now=None):
+        """Start of the UTC day `days` ago; rows before it are archived."""
+        return floor((now or timezone.now()) - timedelta(days=days), 'day')
+
+    @classmethod
+    def encode(cls, row):
+        record = dict(zip(cls.FIELDS, row))
+        record['id'] = str(record['id'])
+        record['user_id'] = str(record['user_id'])
+        record['timestamp'] = record['timestamp'].isoformat()
+        return json.dumps(record, separators=(',', ':')) + '\n'
+
+    @classmethod
+    def path_for(cls, root, day, notification_type):
+        """Next free file for the day and type; a re-run never overwrites an earlier file."""
+        folder = root / day.strftime('%Y-%m-%d')
+        path = folder / f"{notification_type}{cls.SUFFIX}"
+        sequence = 1
+        while path.exists():
+            path = folder / f"{notification_type}.{sequence}{cls.SUFFIX}"
+            sequence += 1
+        return path
+
+    @staticmethod
+    def day_queryset(day, before):
+        return NotificationStatusLog.objects.filter(timestamp__gte=day, timestamp__lt=min(advance(day, 'day'), before))
+
+    @staticmethod
+    def through(queryset, last):
+        """Rows of queryset at or before the (timestamp, id) key last."""
+        timestamp, id = last
+        return queryset.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lte=id))
+
+    @classmethod
+    def days(cls, before):
+        """Yield each UTC day that still has rows before the cutoff, oldest first."""
+        day = None
+        while True:
+            queryset = NotificationStatusLog.objects.filter(timestamp__lt=before)
+            if day is not None:
+                queryset = queryset.filter(timestamp__gte=advance(day, 'day'))
+            first = queryset.order_by('timestamp').values_list('timestamp', flat=True).first()
+            if first is None:
+                return
+            day = floor(first, 'day')
+            yield day
+
+    @classmethod
+    def write_day(cls, root, day, before, chunk_size):
+        """
+        Write one day of rows to temporary per-type files; returns
+        {type: (path, temporary, rows, last)}, where last is the (timestamp, id)
+        of the type's final row.
+        """
+        files, written, last = {}, {}, {}
+        rows = cls.day_queryset(day, before).order_by('timestamp', 'id').values_list(*cls.FIELDS)
+        try:
+            lines = {}
+            for row in rows.iterator(chunk_size=chunk_size):
+                notification_type = row[3]
+                if notification_type not in files:
+                    path = cls.path_for(root, day, notification_type)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    temporary = path.with_name(path.name + '.tmp')
+                    files[notification_type] = (path, temporary, gzip.open(
+                        temporary, 'wt', encoding='utf-8', compresslevel=cls.config()['COMPRESS_LEVEL']
+                    ))
+                    lines[notification_type] = []
+                    written[notification_type] = 0
+                lines[notification_type].append(cls.encode(row))
+                written[notification_type] += 1
+                last[notification_type] = (row[6], row[0])
+                if len(lines[notification_type]) >= chunk_size:
+                    files[notification_type][2].write(''.join(lines[notification_type]))
+                    lines[notification_type] = []
+            for notification_type, (_, _, fh) in files.items():
+                fh.write(''.join(lines[notification_type]))
+                fh.close()
+        except BaseException:
+            for _, temporary, fh in files.values():
+                fh.close()
+                temporary.unlink(missing_ok=True)
+            raise
+
+        result = {}
+        for notification_type, (path, temporary, _) in files.items():
+            result[notification_type] = (path, temporary, written[notification_type], last[notification_type])
+        return result
+
+    @staticmethod
+    def count_lines(path):
+        with gzip.open(path, 'rb') as fh:
+            return sum(1 for _ in fh)
+
+    @classmethod
+    def delete(cls, path, day, before, batch_size):
+        """Delete the rows recorded in an archive file, in batches of at most batch_size."""
+        # The timestamp range lets partitioned tables prune to one partition
+        queryset = cls.day_queryset(day, before)
+        deleted = 0
+        with gzip.open(path, 'rb') as fh:
+            while True:
+                ids = [json.loads(line)['id'] for _, line in zip(range(batch_size), fh)]
+                if not ids:
+                    return deleted
+                count, _ = queryset.filter(id__in=ids).delete()
+                deleted += count
+
+    @classmethod
+    def archive(cls, before, directory=None, chunk_size=None, batch_size=None, delete=True):
+        """
+        Archive every row older than `before`, one day at a time. Yields an
+        ArchivedDay per file written. Raises ArchiveError, leaving that day's
+        rows in place, if a file's line count or the database count disagree
+        with the rows streamed into it.
+        """
+        config = cls.config()
+        root = cls.directory(directory)
+        chunk_size = chunk_size or config['CHUNK_SIZE']
+        batch_size = batch_size or config['DELETE_BATCH_SIZE']
+
+        for day in cls.days(before):
+            files = cls.write_day(root, day, before, chunk_size)
+            try:
+                for notification_type, (path, temporary, rows, last) in sorted(files.items()):
+                    # Rows committed after the stream are past `last` and not counted;
+                    # a late row stamped before it means the stream missed it
+                    expected = cls.through(
+                        cls.day_queryset(day, before).filter(notification_type=notification_type), last
+                    ).count()
+                    stored = cls.count_lines(temporary)
+                    if not rows == stored == expected:
+                        raise ArchiveError(
+                            f"{path}: streamed {rows} rows, file has {stored}, database has {expected}"
+                        )
+            except BaseException:
+                for _, temporary, _, _ in files.values():
+                    temporary.unlink(missing_ok=True)
+                raise
+
+            for notification_type, (path, temporary, rows, _) in sorted(files.items()):
+                os.replace(temporary, path)
+                deleted = cls.delete(path, day, before, batch_size) if delete else 0
+                if delete and deleted != rows:
+                    # Only fewer is possible: something else deleted archived rows meanwhile
+                    logger.warning("%s: archived %d rows but deleted %d", path, rows, deleted)
+                yield ArchivedDay(day, notification_type, rows, deleted, path)
+
+    @classmethod
+    def plan(cls, before):
+        """Yield (day, {type: rows}) for what archive() would move, without touching anything."""
+        for day in cls.days(before):
+            counts = cls.day_queryset(day, before).order_by().values('notification_type').annotate(rows=Count('id'))
+            yield day, {row['notification_type']: row['rows'] for row in counts}
+
+    @classmethod
+    def files(cls, directory=None, since=None, until=None, notification_type=None):
+        """Archive files oldest first, limited to days in [since, until] and one type."""
+        root = cls.directory(directory)
+        if not root.is_dir():
+            return
+        for folder in sorted(root.iterdir()):
+            try:
+                day = datetime.strptime(folder.name, '%Y-%m-%d').date()
+            except ValueError:
+                continue
+            if (since and day < since) or (until and day > until):
+                continue
+            for path in sorted(folder.glob(f"*{cls.SUFFIX}")):
+                # <type>.ndjson.gz, or <type>.<n>.ndjson.gz for later runs over the same day
+                if notification_type is None or path.name.split('.')[0] == notification_type:
+                    yield path
+
+    @classmethod
+    def search(cls, notification_id, directory=None, since=None, until=None, notification_type=None):
+        """
+        Yield archived records for a notification_id, streaming one line at a
+        time. Lines are matched on their encoded bytes first, so only hits are
+        parsed.
+        """
+        needle = json.dumps({'notification_id': notification_id}, separators=(',', ':'))[1:-1].encode()
+        for path in cls.files(directory, since, until, notification_type):
+            with gzip.open(path, 'rb') as fh:
+                for line in fh:
+                    if needle in line:
+                        record = json.loads(line)
+                        if record['notification_id'] == notification_id:
+                            yield record
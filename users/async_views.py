@@ -0,0 +1,144 @@
+# users/async_views.py
+import json
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import make_password
+from django.http import JsonResponse
+from .authentication import generate_jwt_token
+from .hash_pool import PasswordHashPoolSaturated, acheck_user_password, get_password_hash_pool
+from .models import User
+from .serializers import UserCreateSerializer
+from .services import UserCacheService, LastLoginService
+from .throttling import RateLimiter, SlidingWindowThrottle, apply_rate_limit_headers, hash_ident
+
+# Async twins of UserViewSet.create and UserViewSet.login for ASGI deployments.
+# Password hashing is awaited on the bounded hash pool, so a burst of logins
+# never occupies the event loop or the threads serving other endpoints.
+
+def error_response(error, message, data=None, status=400):
+    response = JsonResponse({
+        "success": False,
+        "error": error,
+        "message": message,
+        "data": data or {}
+    }, status=status)
+    if status == 429:
+        response['Retry-After'] = '1'
+    return response
+
+def parse_json(request):
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+def saturated_response():
+    return error_response(
+        "too_many_requests", PasswordHashPoolSaturated.default_detail, status=429
+    )
+
+def rate_limited_response(rate_limit):
+    return apply_rate_limit_headers(error_response(
+        "too_many_requests", "Request was throttled, please retry later", status=429
+    ), rate_limit)
+
+def client_ip(request):
+    return SlidingWindowThrottle().get_ident(request)
+
+async def register(request):
+    """
+    POST /api/v1/auth/register/
+    Same body and response as POST /api/v1/users/
+    """
+    if request.method != 'POST':
+        return error_response("method_not_allowed", "Method not allowed", status=405)
+    
+    rate_limit = await sync_to_async(RateLimiter.check)([('register_ip', client_ip(request))])
+    if rate_limit and not rate_limit.allowed:
+        return rate_limited_response(rate_limit)
+    
+    payload = parse_json(request)
+    if payload is None:
+        return error_response("invalid_json", "Request body must be a JSON object")
+    
+    serializer = UserCreateSerializer(data=payload)
+    if not await sync_to_async(serializer.is_valid)():
+        return error_response("validation_failed", "Please check your input", serializer.errors)
+    
+    try:
+        password_hash = await get_password_hash_pool().arun(
+            make_password, serializer.validated_data['password']
+        )
+    except PasswordHashPoolSaturated:
+        return saturated_response()
+    
+    user = await sync_to_async(serializer.save)(password_hash=password_hash)
+    token = generate_jwt_token(user)
+    user_data = await sync_to_async(UserCacheService.set_user)(user)
+    
+    return apply_rate_limit_headers(JsonResponse({
+        "success": True,
+        "message": "User created successfully",
+        "data": {
+            "user": user_data,
+            "token": token
+        }
+    }, status=201), rate_limit)
+
+async def login(request):
+    """
+    POST /api/v1/auth/login/
+    Same body and response as POST /api/v1/users/login/
+    """
+    if request.method != 'POST':
+        return error_response("method_not_allowed", "Method not allowed", status=405)
+    
+    payload = parse_json(request)
+    email = payload.get('email') if payload else None
+    password = payload.get('password') if payload else None
+    if not email or not password:
+        return error_response(
+            "authentication_failed", "Invalid credentials",
+            {"non_field_errors": ['Must include "email" and "password"']}, status=401
+        )
+    
+    rate_limit = await sync_to_async(RateLimiter.check)([
+        ('login_ip', client_ip(request)),
+        ('login_email', hash_ident(email) if isinstance(email, str) and email else None),
+    ])
+    if rate_limit and not rate_limit.allowed:
+        return rate_limited_response(rate_limit)
+    
+    user = await User.objects.filter(email=email).afirst()
+    try:
+        if user is None:
+            # Hash anyway so unknown emails cost the same as wrong passwords
+            await get_password_hash_pool().arun(make_password, password)
+            authenticated = False
+        else:
+            authenticated = await acheck_user_password(user, password) and user.is_active
+    except PasswordHashPoolSaturated:
+        return saturated_response()
+    
+    if not authenticated:
+        return error_response(
+            "authentication_failed", "Invalid credentials",
+            {"non_field_errors": ["Invalid credentials"]}, status=401
+        )
+    
+    token = generate_jwt_token(user)
+    await sync_to_async(LastLoginService.record)(user)
+    user_data = await sync_to_async(UserCacheService.get_user)(user.id)
+    
+    return apply_rate_limit_headers(JsonResponse({
+        "success": True,
+        "message": "Login successful",
+        "data": {
+            "user": user_data,
+            "token": token
+        }
+    }), rate_limit)
+
+# Token-less JSON endpoints, like the DRF views they mirror
+register.csrf_exempt = True
+login.csrf_exempt = True
@@ -1,11 +1,9 @@
 # users/authentication.py
 import jwt
 from django.conf import settings
-from django.contrib.auth import get_user_model
 from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
-
-User = get_user_model()
+from .services import PrincipalCacheService
 
 class JWTAuthentication(authentication.BaseAuthentication):
     def authenticate(self, request):
@@ -26,13 +24,13 @@ class JWTAuthentication(authentication.BaseAuthentication):
             if not user_id:
                 raise AuthenticationFailed('Invalid token')
                 
-            user = User.objects.get(id=user_id, is_active=True)
+            user = PrincipalCacheService.get_user(user_id)
+            if user is None:
+                raise AuthenticationFailed('User not found')
             return (user, token)
             
         except (IndexError, jwt.ExpiredSignatureError, jwt.InvalidTokenError):
             raise AuthenticationFailed('Invalid token')
-        except User.DoesNotExist:
-            raise AuthenticationFailed('User not found')
 
 def generate_jwt_token(user):
     from datetime import datetime, timedelta
@@ -0,0 +1,27 @@
+# users/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from .hash_pool import check_user_password, get_password_hash_pool
+
+UserModel = get_user_model()
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend that verifies passwords on the bounded password hash pool."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so unknown emails cost the same as wrong passwords
+            get_password_hash_pool().run(make_password, password)
+            return None
+
+        if check_user_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,138 @@
+# users/cache.py
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Bounded, thread-safe in-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class InvalidationBus:
+    """
+    Keeps per-process caches coherent across gunicorn workers and nodes.
+    Writers publish the ids of users whose cached data changed on a Redis
+    channel; a daemon thread in every process subscribes and hands them to
+    the registered handlers. Handlers get None (drop everything) whenever
+    the subscription is (re)established, since messages may have been
+    missed while it was down.
+    """
+
+    def __init__(self):
+        self._origin = None
+        self._pid = None
+        self._handlers = []
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def origin(self):
+        """Id of this process's messages; renewed after fork, e.g. gunicorn --preload."""
+        pid = os.getpid()
+        if self._pid != pid:
+            self._pid, self._origin = pid, uuid.uuid4().hex
+        return self._origin
+
+    @staticmethod
+    def _config():
+        return settings.LOCAL_CACHE_INVALIDATION
+
+    def register(self, handler):
+        self._handlers.append(handler)
+
+    def publish(self, user_ids):
+        config = self._config()
+        if not config['ENABLED']:
+            return
+        message = json.dumps({'origin': self.origin, 'ids': [str(user_id) for user_id in user_ids]})
+        try:
+            get_redis_connection('default').publish(config['CHANNEL'], message)
+        except Exception:
+            # Other processes fall back to their local TTL
+            logger.warning("Could not publish cache invalidation", exc_info=True)
+
+    def ensure_listening(self):
+        if not self._config()['ENABLED'] or (self._thread and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._listen, name='cache-invalidation', daemon=True)
+            self._thread.start()
+
+    def _listen(self):
+        backoff = 1
+        while True:
+            try:
+                pubsub = get_redis_connection('default').pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._config()['CHANNEL'])
+                self.dispatch(None)
+                backoff = 1
+                for message in pubsub.listen():
+                    self.handle(message['data'])
+            except Exception:
+                logger.warning("Cache invalidation subscriber disconnected", exc_info=True)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def handle(self, data):
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get('origin') != self.origin:
+            self.dispatch(message.get('ids', []))
+
+    def dispatch(self, user_ids):
+        for handler in self._handlers:
+            handler(user_ids)
+
+
+invalidation_bus = InvalidationBus()
@@ -0,0 +1,86 @@
+# users/codecs.py
+import json
+import zlib
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Every encoded value starts with one header byte: the codec tag in the low
+# bits and COMPRESSED set when the body is zlib-compressed. Decoding dispatches
+# on the header, so entries written under a previous CODEC setting stay readable
+# while a new one rolls out.
+COMPRESSED = 0x80
+
+
+class JSONCodec:
+    """Compact JSON; uses orjson when it is installed."""
+    tag = 1
+
+    def dumps(self, value):
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, separators=(',', ':')).encode()
+
+    def loads(self, data):
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    """MessagePack; requires the msgpack package."""
+    tag = 2
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImproperlyConfigured("MsgpackCodec requires the msgpack package")
+
+    def dumps(self, value):
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data):
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS = {codec.tag: codec for codec in (JSONCodec, MsgpackCodec)}
+_instances = {}
+
+
+def get_codec(path_or_tag):
+    """Shared codec instance for a dotted path or a header tag."""
+    if path_or_tag not in _instances:
+        if isinstance(path_or_tag, int):
+            codec_class = CODECS.get(path_or_tag)
+            if codec_class is None:
+                raise ValueError(f"Unknown cache codec tag {path_or_tag}")
+        else:
+            codec_class = import_string(path_or_tag)
+        _instances[path_or_tag] = codec_class()
+    return _instances[path_or_tag]
+
+
+def encode(value, codec, compress_min_size=0):
+    """Serialize value with codec, zlib-compressing bodies of compress_min_size bytes or more."""
+    body = codec.dumps(value)
+    header = codec.tag
+    if compress_min_size and len(body) >= compress_min_size:
+        compressed = zlib.compress(body, 1)
+        if len(compressed) < len(body):
+            body, header = compressed, header | COMPRESSED
+    return bytes([header]) + body
+
+
+def decode(data):
+    header, body = data[0], data[1:]
+    if header & COMPRESSED:
+        body = zlib.decompress(body)
+    return get_codec(header & ~COMPRESSED).loads(body)
@@ -0,0 +1,163 @@
+# users/db/pool.py
+import threading
+import time
+from collections import Counter, deque
+from django.conf import settings
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of open DB-API connections, shared by every thread.
+    At most max_size connections exist at once; callers wait up to timeout
+    for a free slot. Idle connections older than max_lifetime are replaced,
+    and ones idle longer than check_after are pinged before reuse. params
+    records what the connections point at; once retired, a pool closes every
+    connection handed back to it.
+    """
+
+    def __init__(self, max_size=10, timeout=5, max_lifetime=1800, check_after=30, params=None):
+        self.max_size = max_size
+        self.params = params
+        self.retired = False
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = deque()
+        self._created = {}
+        self._lock = threading.Lock()
+        self._stats = Counter()
+
+    def acquire(self, connect, check=None):
+        """
+        Return an open connection, reusing an idle one when possible.
+        connect() opens a new connection; check(connection) must raise if
+        an idle connection is no longer usable.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            self._stats['timeouts'] += 1
+            raise PoolTimeout(f"No database connection available within {self.timeout}s")
+
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    connection, released_at = self._idle.pop()
+
+                now = time.monotonic()
+                if now - self._created[id(connection)] > self.max_lifetime:
+                    self._discard(connection)
+                    continue
+                if check is not None and now - released_at > self.check_after:
+                    try:
+                        check(connection)
+                    except Exception:
+                        self._discard(connection)
+                        continue
+                self._stats['reused'] += 1
+                return connection
+
+            connection = connect()
+            with self._lock:
+                self._created[id(connection)] = time.monotonic()
+            self._stats['opened'] += 1
+            return connection
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection, discard=False):
+        """Hand a connection back; discard=True closes it instead of keeping it idle."""
+        try:
+            if discard or self.retired:
+                self._discard(connection)
+            else:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def _discard(self, connection):
+        with self._lock:
+            self._created.pop(id(connection), None)
+        self._stats['discarded'] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_idle(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def retire(self):
+        """Stop reusing connections: idle ones close now, borrowed ones on release."""
+        self.retired = True
+        self.close_idle()
+
+    def stats(self):
+        with self._lock:
+            size, idle = len(self._created), len(self._idle)
+        return {
+            'max_size': self.max_size,
+            'size': size,
+            'idle': idle,
+            'in_use': size - idle,
+            **{counter: self._stats[counter] for counter in ('opened', 'reused', 'discarded', 'timeouts')},
+        }
+
+
+def params_key(conn_params):
+    """Comparable form of a backend's connection params."""
+    return tuple(sorted((name, repr(value)) for name, value in conn_params.items()))
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, params=None):
+    """
+    The shared pool for a database alias, configured by settings.DB_POOL.
+    When the alias's connection params change (the test runner points NAME
+    at the test database, for one), the old pool is retired and replaced so
+    no connection to the previous database is handed out again.
+    """
+    pool = _pools.get(alias)
+    if pool is None or pool.params != params:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None or pool.params != params:
+                if pool is not None:
+                    pool.retire()
+                config = settings.DB_POOL
+                pool = _pools[alias] = ConnectionPool(
+                    max_size=config['MAX_SIZE'],
+                    timeout=config['TIMEOUT'],
+                    max_lifetime=config['MAX_LIFETIME'],
+                    check_after=config['CHECK_AFTER'],
+                    params=params,
+                )
+    return pool
+
+
+def connection_stats():
+    """Connection mode per database alias, with pool metrics where pooling is on."""
+    stats = {}
+    for alias, database in settings.DATABASES.items():
+        if alias in _pools:
+            stats[alias] = {'mode': 'pool', **_pools[alias].stats()}
+        else:
+            stats[alias] = {
+                'mode': 'per_request' if database.get('CONN_MAX_AGE', 0) == 0 else 'persistent',
+                'conn_max_age': database.get('CONN_MAX_AGE', 0),
+                'health_checks': database.get('CONN_HEALTH_CHECKS', False),
+            }
+    return stats
@@ -0,0 +1,48 @@
+# users/db/pooled_postgresql/base.py
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from users.db.pool import PoolTimeout, get_pool, params_key
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend that borrows connections from users.db.pool instead
+    of opening one per thread. Django's close() at the end of a request hands
+    the connection back, so run it with CONN_MAX_AGE = 0. Meant for ASGI,
+    where request threads come and go and persistent connections leak.
+    """
+
+    def get_new_connection(self, conn_params):
+        # Remembered so the connection goes back to the pool it came from
+        self._pool = get_pool(self.alias, params_key(conn_params))
+        try:
+            connection = self._pool.acquire(
+                lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                check=self._ping
+            )
+        except PoolTimeout as e:
+            raise self.Database.OperationalError(str(e)) from e
+        # super() only sets this when it opens a new connection
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    @staticmethod
+    def _ping(connection):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        connection.rollback()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        connection = self.connection
+        discard = bool(connection.closed)
+        if not discard and connection.info.transaction_status != self.Database.extensions.TRANSACTION_STATUS_IDLE:
+            # Closed mid-transaction (e.g. after an error); never hand out a dirty session
+            try:
+                connection.rollback()
+            except self.Database.Error:
+                discard = True
+        self._pool.release(connection, discard=discard)
@@ -8,4 +8,10 @@ class NotificationStatus(models.TextChoices):
 
 class NotificationType(models.TextChoices):
     EMAIL = "email", "Email"
-    PUSH = "push", "Push"
\ No newline at end of file
+    PUSH = "push", "Push"
+
+
+class DevicePlatform(models.TextChoices):
+    IOS = "ios", "iOS"
+    ANDROID = "android", "Android"
+    WEB = "web", "Web"
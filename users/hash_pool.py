@@ -0,0 +1,101 @@
+# users/hash_pool.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework.exceptions import Throttled
+
+class PasswordHashPoolSaturated(Throttled):
+    default_detail = 'Too many password operations in progress, please retry shortly.'
+    default_code = 'password_hash_pool_saturated'
+
+    def __init__(self):
+        super().__init__(wait=1)
+
+
+class PasswordHashPool:
+    """
+    Dedicated, bounded executor for password hashing. At most `workers`
+    hashes run at once and at most `queue_depth` more may wait; anything
+    beyond that is refused immediately with PasswordHashPoolSaturated (429)
+    instead of tying up request workers that cheap endpoints need.
+    """
+
+    def __init__(self, workers, queue_depth):
+        self.workers = workers
+        self.capacity = workers + queue_depth
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashPoolSaturated()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def run(self, fn, *args):
+        """Run fn on the pool and block the calling thread until it finishes."""
+        return self.submit(fn, *args).result()
+
+    async def arun(self, fn, *args):
+        """Run fn on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'capacity': self.capacity,
+            'in_flight': self._in_flight,
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_password_hash_pool():
+    # Built on first use so each forked worker process gets its own threads
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = settings.PASSWORD_HASH_POOL
+                _pool = PasswordHashPool(config['WORKERS'], config['QUEUE_DEPTH'])
+    return _pool
+
+
+def verify_password(password, encoded):
+    """Return (is_correct, must_update) for password against encoded."""
+    must_update = []
+    is_correct = check_password(password, encoded, setter=lambda raw: must_update.append(True))
+    return is_correct, bool(must_update)
+
+def check_user_password(user, password):
+    pool = get_password_hash_pool()
+    is_correct, must_update = pool.run(verify_password, password, user.password)
+    if must_update:
+        user.password = pool.run(make_password, password)
+        user.save(update_fields=['password'])
+    return is_correct
+
+async def acheck_user_password(user, password):
+    pool = get_password_hash_pool()
+    is_correct, must_update = await pool.arun(verify_password, password, user.password)
+    if must_update:
+        user.password = await pool.arun(make_password, password)
+        await user.asave(update_fields=['password'])
+    return is_correct
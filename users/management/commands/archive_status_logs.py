@@ -0,0 +1,41 @@
+# users/management/commands/archive_status_logs.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from users.archive import ArchiveError, StatusLogArchive
+
+class Command(BaseCommand):
+    help = 'Archive status logs older than the retention window to gzipped NDJSON, then delete them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help="Archive rows older than this many days (defaults to STATUS_RETENTION_DAYS)")
+        parser.add_argument('--dir', default=None, help="Archive directory (defaults to NOTIFICATION_STATUS_ARCHIVE['DIR'])")
+        parser.add_argument('--chunk-size', type=int, default=None)
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows deleted per statement')
+        parser.add_argument('--keep', action='store_true', help='Write the archive but leave the rows in place')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be archived without writing')
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is None:
+            days = settings.NOTIFICATION_STATUS_PARTITIONS['RETENTION_DAYS']
+        if not days or days < 1:
+            raise CommandError('Pass --days; retention is disabled')
+        before = StatusLogArchive.cutoff(days)
+
+        if options['dry_run']:
+            for day, counts in StatusLogArchive.plan(before):
+                for notification_type, rows in sorted(counts.items()):
+                    self.stdout.write(f"Would archive {day:%Y-%m-%d} {notification_type}: {rows} rows")
+            return
+
+        try:
+            for archived in StatusLogArchive.archive(
+                before, options['dir'], options['chunk_size'], options['batch_size'], delete=not options['keep']
+            ):
+                self.stdout.write(
+                    f"Archived {archived.day:%Y-%m-%d} {archived.notification_type}: "
+                    f"{archived.rows} rows to {archived.path}, deleted {archived.deleted}"
+                )
+        except ArchiveError as e:
+            raise CommandError(str(e))
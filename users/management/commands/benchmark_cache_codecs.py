@@ -0,0 +1,85 @@
+# users/management/commands/benchmark_cache_codecs.py
+import json
+import pickle
+import time
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand
+from users import codecs
+from users.models import User
+from users.serializers import UserResponseSerializer
+from users.services import UserCacheService
+
+class Command(BaseCommand):
+    help = 'Compare size and encode/decode time of user cache entries across codecs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=10000, help='Encode/decode samples per codec')
+        parser.add_argument('--compress-min-size', type=int, default=None,
+                            help="Compression threshold (defaults to USER_CACHE['COMPRESS_MIN_SIZE'])")
+
+    def sample(self):
+        user = User.objects.select_related('preference').filter(preference__isnull=False).first()
+        if user is not None:
+            return UserResponseSerializer(user).data
+        return {
+            'id': '3f2b8c1e-7a4d-4e8f-9b6a-2c1d0e9f8a7b',
+            'name': 'Benchmark User',
+            'email': 'benchmark.user@example.com',
+            'push_token': 'f' * 152,
+            'preferences': {'email': True, 'push': True},
+            'created_at': '2024-01-01T12:00:00.000000Z',
+            'updated_at': '2024-01-01T12:00:00.000000Z',
+        }
+
+    def measure(self, rounds, encode, decode):
+        value = encode()
+        started = time.perf_counter()
+        for _ in range(rounds):
+            encode()
+        encode_us = (time.perf_counter() - started) * 1e6 / rounds
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            decode(value)
+        decode_us = (time.perf_counter() - started) * 1e6 / rounds
+        # django-redis pickles every non-integer value; that is what Redis stores
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)), encode_us, decode_us
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        compress_min_size = options['compress_min_size']
+        if compress_min_size is None:
+            compress_min_size = settings.USER_CACHE['COMPRESS_MIN_SIZE']
+        user_data = self.sample()
+        soft_expires = int(time.time())
+        version = soft_expires * 1_000_000
+
+        rows = [(
+            'json envelope (legacy)',
+            *self.measure(
+                rounds,
+                lambda: json.dumps({'data': user_data, 'soft_expires': soft_expires}),
+                json.loads
+            )
+        )]
+        for codec_class in codecs.CODECS.values():
+            try:
+                codec = codec_class()
+            except ImproperlyConfigured as e:
+                self.stdout.write(f"{codec_class.__name__}: skipped: {e}")
+                continue
+            for threshold in sorted({0, compress_min_size}):
+                label = codec_class.__name__ + (f' (zlib >= {threshold}B)' if threshold else '')
+                rows.append((label, *self.measure(
+                    rounds,
+                    lambda: codecs.encode(UserCacheService._pack(user_data, soft_expires, version), codec, threshold),
+                    lambda value: UserCacheService._unpack(codecs.decode(value))
+                )))
+
+        baseline = rows[0][1]
+        self.stdout.write(f"{'format':<34} {'bytes/key':>10} {'vs legacy':>10} {'encode us':>10} {'decode us':>10}")
+        for label, size, encode_us, decode_us in rows:
+            self.stdout.write(
+                f"{label:<34} {size:>10} {size / baseline:>9.0%} {encode_us:>10.1f} {decode_us:>10.1f}"
+            )
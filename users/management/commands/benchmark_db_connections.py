@@ -0,0 +1,64 @@
+# users/management/commands/benchmark_db_connections.py
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import connections
+from users.db.pool import get_pool
+
+class Command(BaseCommand):
+    help = (
+        'Time one simulated request (connect if needed, SELECT 1, end of request) '
+        'with a fresh connection, a persistent one and, when enabled, the pool'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per mode')
+        parser.add_argument('--database', default='default', help='Database alias')
+
+    def run(self, requests, request):
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            request()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        pooled = connection.settings_dict['ENGINE'] == 'users.db.pooled_postgresql'
+
+        def query(conn):
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+
+        def fresh():
+            # What CONN_MAX_AGE = 0 costs without a pool: TCP + auth on every request
+            conn = connection.Database.connect(**connection.get_connection_params())
+            query(conn)
+            conn.close()
+
+        def persistent():
+            connection.ensure_connection()
+            query(connection.connection)
+
+        def pool():
+            connection.ensure_connection()
+            query(connection.connection)
+            connection.close()
+
+        modes = [('fresh connection', fresh), ('persistent connection', persistent)]
+        if pooled:
+            modes.append(('pool', pool))
+        else:
+            self.stdout.write("pool: skipped (set DB_POOL_ENABLED=True to include it)")
+
+        self.stdout.write(f"{'mode':<24} {'p50 ms':>10} {'p95 ms':>10}")
+        for label, request in modes:
+            p50, p95 = self.run(options['requests'], request)
+            self.stdout.write(f"{label:<24} {p50:>10.2f} {p95:>10.2f}")
+        connection.close()
+
+        if pooled:
+            self.stdout.write(f"pool stats: {get_pool(connection.alias).stats()}")
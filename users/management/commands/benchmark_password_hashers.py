@@ -0,0 +1,35 @@
+# users/management/commands/benchmark_password_hashers.py
+import time
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+class Command(BaseCommand):
+    help = 'Time hashing (signup) and verification (login) for each configured password hasher'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=5, help='Samples per hasher')
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        password = 'benchmark-password-123'
+        self.stdout.write(f"{'algorithm':<24} {'hash ms':>10} {'verify ms':>10}")
+
+        for position, hasher in enumerate(get_hashers()):
+            try:
+                encoded = hasher.encode(password, hasher.salt())
+            except ValueError as e:  # optional library (argon2-cffi, bcrypt) missing
+                self.stdout.write(f"{hasher.algorithm:<24} skipped: {e}")
+                continue
+
+            started = time.perf_counter()
+            for _ in range(rounds):
+                hasher.encode(password, hasher.salt())
+            hash_ms = (time.perf_counter() - started) * 1000 / rounds
+
+            started = time.perf_counter()
+            for _ in range(rounds):
+                hasher.verify(password, encoded)
+            verify_ms = (time.perf_counter() - started) * 1000 / rounds
+
+            marker = ' (preferred)' if position == 0 else ''
+            self.stdout.write(f"{hasher.algorithm:<24} {hash_ms:>10.1f} {verify_ms:>10.1f}{marker}")
@@ -0,0 +1,82 @@
+# users/management/commands/consume_status_stream.py
+import os
+import socket
+import time
+from django.core.management.base import BaseCommand
+from users.streams import NotificationStatusStream
+
+class Command(BaseCommand):
+    help = 'Drain the notification status stream into notification_status_logs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--consumer', default=f'{socket.gethostname()}-{os.getpid()}')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--block-ms', type=int, default=None)
+        parser.add_argument('--claim-idle-ms', type=int, default=None,
+                            help="Take over entries other consumers left unacked this long "
+                                 "(defaults to NOTIFICATION_STATUS_STREAM['CLAIM_IDLE_MS'])")
+        parser.add_argument('--once', action='store_true', help='Exit once the stream is drained')
+        parser.add_argument('--stats', action='store_true', help='Print stream lag metrics and exit')
+        parser.add_argument('--stats-interval', type=int, default=60, help='Seconds between lag reports')
+
+    def handle(self, *args, **options):
+        backend = NotificationStatusStream.get_backend()
+        backend.ensure_group()
+
+        if options['stats']:
+            self.report(backend)
+            return
+
+        consumer = options['consumer']
+        block_ms = options['block_ms']
+        if options['once'] and block_ms is None:
+            block_ms = 1  # don't wait for new entries once drained
+        consume_options = {
+            'batch_size': options['batch_size'],
+            'block_ms': block_ms,
+            'backend': backend,
+        }
+
+        claim_idle_ms = options['claim_idle_ms']
+        if claim_idle_ms is None:
+            claim_idle_ms = NotificationStatusStream.config()['CLAIM_IDLE_MS']
+
+        # Entries this consumer read but never acked (e.g. crashed mid-batch) first
+        while NotificationStatusStream.consume(consumer, pending=True, **consume_options):
+            pass
+
+        processed = 0
+        last_report = time.monotonic()
+        last_claim = None
+        while True:
+            if last_claim is None or time.monotonic() - last_claim >= claim_idle_ms / 1000:
+                processed += self.claim(consumer, claim_idle_ms, consume_options)
+                last_claim = time.monotonic()
+
+            count = NotificationStatusStream.consume(consumer, **consume_options)
+            processed += count
+
+            if time.monotonic() - last_report >= options['stats_interval']:
+                self.report(backend, processed)
+                last_report = time.monotonic()
+
+            if options['once'] and not count:
+                break
+
+        self.report(backend, processed)
+
+    def claim(self, consumer, claim_idle_ms, consume_options):
+        # Consumer names change on restart, so entries a crashed worker read
+        # are only written once another consumer claims them
+        claimed = 0
+        while True:
+            count = NotificationStatusStream.consume(consumer, claim_idle_ms=claim_idle_ms, **consume_options)
+            if not count:
+                return claimed
+            claimed += count
+
+    def report(self, backend, processed=None):
+        stats = backend.stats()
+        if processed is not None:
+            stats['processed'] = processed
+        self.stdout.write(' '.join(f'{key}={value}' for key, value in stats.items()))
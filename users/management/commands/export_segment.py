@@ -0,0 +1,25 @@
+# users/management/commands/export_segment.py
+from django.core.management.base import BaseCommand
+from users.services import RecipientSegmentService
+
+class Command(BaseCommand):
+    help = 'Stream a campaign recipient segment as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('segment', choices=RecipientSegmentService.SEGMENTS)
+        parser.add_argument('--output', choices=list(RecipientSegmentService.CONTENT_TYPES), default='ndjson')
+        parser.add_argument('--chunk-size', type=int, default=None)
+        parser.add_argument('--file', help='Write to this path instead of stdout')
+
+    def handle(self, *args, **options):
+        chunks = RecipientSegmentService.stream(
+            options['segment'], options['output'], options['chunk_size']
+        )
+
+        if options['file']:
+            with open(options['file'], 'w', newline='') as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,41 @@
+# users/management/commands/manage_status_partitions.py
+from django.core.management.base import BaseCommand, CommandError
+from users.partitions import StatusLogPartitions
+
+class Command(BaseCommand):
+    help = 'Create upcoming notification_status_logs partitions and expire old ones (run daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--premake', type=int, default=None,
+                            help="Intervals to create ahead (defaults to NOTIFICATION_STATUS_PARTITIONS['PREMAKE'])")
+        parser.add_argument('--action', choices=['drop', 'detach'], default=None,
+                            help='What to do with expired partitions (defaults to EXPIRED_ACTION)')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would change without changing it')
+        parser.add_argument('--list', action='store_true', help='Only list the current partitions')
+
+    def handle(self, *args, **options):
+        if not StatusLogPartitions.supported():
+            raise CommandError('notification_status_logs is only partitioned on PostgreSQL')
+
+        if options['list']:
+            for partition in StatusLogPartitions.list():
+                self.stdout.write(f"{partition.name:<40} {partition.start or 'MINVALUE'} -> {partition.end or 'MAXVALUE'}")
+            default = StatusLogPartitions.default()
+            if default:
+                self.stdout.write(f"{default:<40} DEFAULT ({StatusLogPartitions.default_rows()} rows)")
+            return
+
+        verb = 'Would' if options['dry_run'] else 'Did'
+        for partition in StatusLogPartitions.ensure(premake=options['premake'], dry_run=options['dry_run']):
+            self.stdout.write(f"{verb} create {partition.name} [{partition.start}, {partition.end})")
+
+        action = options['action'] or StatusLogPartitions.config()['EXPIRED_ACTION']
+        for partition in StatusLogPartitions.expire(action=action, dry_run=options['dry_run']):
+            self.stdout.write(f"{verb} {action} {partition.name} (ends {partition.end})")
+
+        if options['dry_run']:
+            return
+        waiting = StatusLogPartitions.default_rows()
+        if waiting:
+            # Only rows beyond the premake horizon are left; they never expire from DEFAULT
+            self.stderr.write(f"{waiting} rows are still in the DEFAULT partition; raise --premake to cover them")
@@ -0,0 +1,13 @@
+# users/management/commands/rollup_status_logs.py
+from django.core.management.base import BaseCommand
+from users.services import StatusRollupService
+
+class Command(BaseCommand):
+    help = 'Bring the delivery statistics rollups up to date (run every few minutes)'
+
+    def handle(self, *args, **options):
+        start = StatusRollupService.refresh()
+        if start is None:
+            self.stdout.write('No status logs to roll up')
+        else:
+            self.stdout.write(f"Rebuilt rollups from {start.isoformat()} to {StatusRollupService.watermark().isoformat()}")
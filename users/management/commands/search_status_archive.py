@@ -0,0 +1,22 @@
+# users/management/commands/search_status_archive.py
+import json
+from datetime import date
+from django.core.management.base import BaseCommand
+from users.archive import StatusLogArchive
+
+class Command(BaseCommand):
+    help = 'Print archived status logs for a notification_id as NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('notification_id')
+        parser.add_argument('--since', type=date.fromisoformat, default=None, help='First day to scan (YYYY-MM-DD)')
+        parser.add_argument('--until', type=date.fromisoformat, default=None, help='Last day to scan (YYYY-MM-DD)')
+        parser.add_argument('--type', choices=['email', 'push'], default=None)
+        parser.add_argument('--dir', default=None, help="Archive directory (defaults to NOTIFICATION_STATUS_ARCHIVE['DIR'])")
+
+    def handle(self, *args, **options):
+        records = StatusLogArchive.search(
+            options['notification_id'], options['dir'], options['since'], options['until'], options['type']
+        )
+        for record in records:
+            self.stdout.write(json.dumps(record))
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationStatusLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('notification_id', models.CharField(db_index=True, max_length=255)),
+                ('notification_type', models.CharField(choices=[('email', 'Email'), ('push', 'Push')], max_length=20)),
+                ('status', models.CharField(choices=[('delivered', 'Delivered'), ('pending', 'Pending'), ('failed', 'Failed')], max_length=20)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'notification_status_logs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='last_login',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email'], name='users_email_4b85f2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['created_at'], name='users_created_6541e9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_active'], name='users_is_acti_847b48_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_active', 'created_at', 'id'], name='users_active_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('push_token__isnull', False)), fields=['created_at', 'id'], name='users_push_token_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationstatuslog',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_statuses', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notificationstatuslog',
+            index=models.Index(fields=['notification_id'], name='notificatio_notific_c46f50_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationstatuslog',
+            index=models.Index(fields=['user', 'timestamp'], name='notificatio_user_id_1d164d_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:03
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_list_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationstatuslog',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_status_log_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCurrentStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_id', models.CharField(max_length=255)),
+                ('notification_type', models.CharField(choices=[('email', 'Email'), ('push', 'Push')], max_length=20)),
+                ('status', models.CharField(choices=[('delivered', 'Delivered'), ('pending', 'Pending'), ('failed', 'Failed')], max_length=20)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='current_notification_statuses', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'notification_current_status',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='notificationcurrentstatus',
+            constraint=models.UniqueConstraint(fields=('notification_id', 'notification_type'), name='notification_current_status_uniq'),
+        ),
+    ]
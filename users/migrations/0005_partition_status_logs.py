@@ -0,0 +1,88 @@
+# Converts notification_status_logs into a table range-partitioned on timestamp.
+#
+# PostgreSQL cannot partition a table in place, so the existing table is
+# renamed and attached, unchanged, as the partition for everything before the
+# start of next month: no rows are copied. Partitioned tables need the
+# partition key in the primary key, so it becomes (id, timestamp); building
+# that index and the ATTACH bound check each read the old table once.
+# Other backends keep the plain table.
+
+import hashlib
+from datetime import timedelta
+from django.db import migrations
+from django.utils import timezone
+
+TABLE = 'notification_status_logs'
+LEGACY = 'notification_status_logs_legacy'
+PREMAKE_MONTHS = 3
+
+
+def next_month(moment):
+    moment = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (moment + timedelta(days=32)).replace(day=1)
+
+
+def partition_status_logs(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [TABLE])
+        if cursor.fetchone()[0] == 'p':
+            return
+        cursor.execute("""
+            SELECT index_class.relname, pg_get_indexdef(pg_index.indexrelid), pg_index.indisprimary
+            FROM pg_index
+            JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+            WHERE pg_index.indrelid = %s::regclass
+        """, [TABLE])
+        indexes = cursor.fetchall()
+
+    execute = schema_editor.execute
+    execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY}"')
+    # Index names are schema-wide; free them for the partitioned parent
+    for name, _, primary in indexes:
+        if primary:
+            # A partition's primary key must match the parent's
+            execute(
+                f'ALTER TABLE "{LEGACY}" DROP CONSTRAINT "{name}", '
+                f'ADD CONSTRAINT "{LEGACY}_pkey" PRIMARY KEY ("id", "timestamp")'
+            )
+        else:
+            execute(f'ALTER INDEX "{name}" RENAME TO "nsl_legacy_{hashlib.md5(name.encode()).hexdigest()[:16]}"')
+
+    execute(f'CREATE TABLE "{TABLE}" (LIKE "{LEGACY}" INCLUDING DEFAULTS) PARTITION BY RANGE ("timestamp")')
+    execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_pkey" PRIMARY KEY ("id", "timestamp")')
+    execute(
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_user_id_fk_users_id" '
+        'FOREIGN KEY ("user_id") REFERENCES "users" ("id") DEFERRABLE INITIALLY DEFERRED'
+    )
+    # Same definitions and names as before, now on the parent; the legacy
+    # table's matching indexes are adopted when it is attached
+    for _, definition, primary in indexes:
+        if not primary:
+            execute(definition)
+
+    start = next_month(timezone.now())
+    execute(f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{LEGACY}" FOR VALUES FROM (MINVALUE) TO (%s)', [start])
+    for _ in range(PREMAKE_MONTHS):
+        end = next_month(start)
+        execute(
+            f'CREATE TABLE "{TABLE}_p{start:%Y%m}" PARTITION OF "{TABLE}" FOR VALUES FROM (%s) TO (%s)',
+            [start, end]
+        )
+        start = end
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_notification_current_status'),
+    ]
+
+    operations = [
+        # The partitioned table is schema-compatible with the model, so going
+        # back leaves it in place
+        migrations.RunPython(partition_status_logs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_partition_status_logs'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notificationstatuslog',
+            index=models.Index(fields=['timestamp', 'id'], name='status_logs_timestamp_id_idx'),
+        ),
+    ]
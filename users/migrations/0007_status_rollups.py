@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_status_log_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationStatusHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('notification_type', models.CharField(choices=[('email', 'Email'), ('push', 'Push')], max_length=20)),
+                ('status', models.CharField(choices=[('delivered', 'Delivered'), ('pending', 'Pending'), ('failed', 'Failed')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'notification_status_hourly',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('position', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'rollup_watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserNotificationDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('notification_type', models.CharField(choices=[('email', 'Email'), ('push', 'Push')], max_length=20)),
+                ('status', models.CharField(choices=[('delivered', 'Delivered'), ('pending', 'Pending'), ('failed', 'Failed')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_daily_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_notification_daily',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='notificationstatushourly',
+            constraint=models.UniqueConstraint(fields=('hour', 'notification_type', 'status'), name='notification_status_hourly_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='usernotificationdaily',
+            index=models.Index(fields=['day'], name='user_notif_daily_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='usernotificationdaily',
+            constraint=models.UniqueConstraint(fields=('user', 'day', 'notification_type', 'status'), name='user_notification_daily_uniq'),
+        ),
+    ]
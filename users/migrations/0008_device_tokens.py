@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:30
+
+import hashlib
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def copy_push_tokens(apps, schema_editor):
+    """Seed one device per user from the legacy users.push_token column."""
+    User = apps.get_model('users', 'User')
+    DeviceToken = apps.get_model('users', 'DeviceToken')
+    seen, devices = set(), []
+    users = (
+        User.objects.exclude(push_token__isnull=True).exclude(push_token='')
+        .order_by('-updated_at').values_list('id', 'push_token', 'updated_at')
+    )
+    for user_id, token, updated_at in users.iterator(chunk_size=2000):
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        # A token shared by several accounts belongs to the one that set it last
+        if token_hash in seen:
+            continue
+        seen.add(token_hash)
+        devices.append(DeviceToken(
+            user_id=user_id, token=token, token_hash=token_hash, created_at=updated_at, last_seen_at=updated_at
+        ))
+        if len(devices) >= 1000:
+            DeviceToken.objects.bulk_create(devices)
+            devices = []
+    DeviceToken.objects.bulk_create(devices)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_status_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeviceToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.TextField()),
+                ('token_hash', models.CharField(max_length=64, unique=True)),
+                ('platform', models.CharField(blank=True, choices=[('ios', 'iOS'), ('android', 'Android'), ('web', 'Web')], default='', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_seen_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='device_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'device_tokens',
+                'indexes': [models.Index(fields=['user', 'last_seen_at'], name='device_tokens_user_seen_idx')],
+            },
+        ),
+        migrations.RunPython(copy_push_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_device_tokens'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='notificationcurrentstatus',
+            name='notification_current_status_uniq',
+        ),
+        migrations.AddConstraint(
+            model_name='notificationcurrentstatus',
+            constraint=models.UniqueConstraint(fields=('notification_id', 'notification_type', 'user'), name='notification_current_status_uniq'),
+        ),
+    ]
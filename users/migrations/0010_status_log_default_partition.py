@@ -0,0 +1,36 @@
+# Adds a DEFAULT partition to notification_status_logs.
+#
+# Range partitions only exist as far ahead as manage_status_partitions has
+# created them. Without a DEFAULT partition, an insert past the newest range
+# (the daily job stopped running, say) fails outright; with one, the row
+# lands there and the next manage_status_partitions run moves it into the
+# range partition it creates. Other backends keep the plain table.
+
+from django.db import migrations
+
+TABLE = 'notification_status_logs'
+DEFAULT = 'notification_status_logs_default'
+
+
+def add_default_partition(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [TABLE])
+        if cursor.fetchone()[0] != 'p':
+            return
+    schema_editor.execute(f'CREATE TABLE IF NOT EXISTS "{DEFAULT}" PARTITION OF "{TABLE}" DEFAULT')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_current_status_per_user'),
+    ]
+
+    operations = [
+        # Dropping the partition on the way back could drop rows, so it stays
+        migrations.RunPython(add_default_partition, migrations.RunPython.noop),
+    ]
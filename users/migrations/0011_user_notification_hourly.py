@@ -0,0 +1,82 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:57
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Trunc
+import django.db.models.deletion
+
+ROLLUP = 'notification_status_rollups'
+
+
+def seed_recent_hours(apps, schema_editor):
+    # Refreshes now move daily rows by the change in per-user hourly counts,
+    # so the hours the next refresh recounts need their current counts. The
+    # days they fall in are recounted too, so both come from one snapshot.
+    Watermark = apps.get_model('users', 'RollupWatermark')
+    Log = apps.get_model('users', 'NotificationStatusLog')
+    Daily = apps.get_model('users', 'UserNotificationDaily')
+    Hourly = apps.get_model('users', 'UserNotificationHourly')
+
+    position = Watermark.objects.filter(name=ROLLUP).values_list('position', flat=True).first()
+    if position is None:
+        return
+    start = position - timedelta(minutes=settings.NOTIFICATION_STATUS_ROLLUP['LATE_MINUTES'])
+    start = start.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    day = datetime(start.year, start.month, start.day, tzinfo=dt_timezone.utc)
+
+    daily = {}
+    hourly = []
+    buckets = (
+        Log.objects.filter(timestamp__gte=day)
+        .annotate(bucket=Trunc('timestamp', 'hour', tzinfo=dt_timezone.utc))
+        .values_list('user_id', 'bucket', 'notification_type', 'status')
+        .annotate(rows=Count('id'))
+        .order_by()
+    )
+    for user_id, hour, notification_type, status, rows in buckets:
+        key = (user_id, hour.date(), notification_type, status)
+        daily[key] = daily.get(key, 0) + rows
+        if hour >= start:
+            hourly.append(Hourly(
+                user_id=user_id, hour=hour, notification_type=notification_type, status=status, count=rows
+            ))
+
+    Daily.objects.filter(day__gte=day.date()).delete()
+    Daily.objects.bulk_create(
+        (Daily(user_id=key[0], day=key[1], notification_type=key[2], status=key[3], count=rows)
+         for key, rows in daily.items()),
+        batch_size=1000
+    )
+    Hourly.objects.bulk_create(hourly, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_status_log_default_partition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserNotificationHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('notification_type', models.CharField(choices=[('email', 'Email'), ('push', 'Push')], max_length=20)),
+                ('status', models.CharField(choices=[('delivered', 'Delivered'), ('pending', 'Pending'), ('failed', 'Failed')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_hourly_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_notification_hourly',
+                'indexes': [models.Index(fields=['hour'], name='user_notif_hourly_hour_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='usernotificationhourly',
+            constraint=models.UniqueConstraint(fields=('user', 'hour', 'notification_type', 'status'), name='user_notification_hourly_uniq'),
+        ),
+        migrations.RunPython(seed_recent_hours, migrations.RunPython.noop),
+    ]
@@ -1,16 +1,40 @@
 # users/models.py
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
-from .enums import NotificationStatus, NotificationType
+from .enums import DevicePlatform, NotificationStatus, NotificationType
 
-class UserManager(BaseUserManager):
+# Sent by UserQuerySet.update() with the pks of the rows it changed, since
+# queryset updates send no post_save; see users.signals
+users_updated = Signal()
+
+class UserQuerySet(models.QuerySet):
+    # Bookkeeping columns nothing caches; updates touching only these stay one query
+    UNCACHED_FIELDS = {'last_login'}
+
+    def update(self, **kwargs):
+        if set(kwargs) <= self.UNCACHED_FIELDS:
+            return super().update(**kwargs)
+        # The filter may no longer match afterwards (e.g. is_active), so collect first
+        with transaction.atomic(using=self.db, savepoint=False):
+            pks = list(self.values_list('pk', flat=True))
+            rows = super().update(**kwargs)
+        users_updated.send(sender=self.model, pks=pks, fields=set(kwargs))
+        return rows
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     def create_user(self, email, password=None, **extra_fields):
+        return self.create_user_with_hash(email, make_password(password), **extra_fields)
+
+    def create_user_with_hash(self, email, password_hash, **extra_fields):
+        """Create a user from an already hashed password (see users.hash_pool)"""
         if not email:
             raise ValueError('The Email field must be set')
         email = self.normalize_email(email)
-        user = self.model(email=email, **extra_fields)
-        user.set_password(password)
+        user = self.model(email=email, password=password_hash, **extra_fields)
         user.save(using=self._db)
         return user
 
@@ -52,6 +76,13 @@ class User(AbstractBaseUser):
             models.Index(fields=['email']),
             models.Index(fields=['created_at']),
             models.Index(fields=['is_active']),
+            # Keyset pagination of the user list: (created_at, id) seeks
+            models.Index(fields=['is_active', 'created_at', 'id'], name='users_active_created_id_idx'),
+            models.Index(
+                fields=['created_at', 'id'],
+                name='users_push_token_created_idx',
+                condition=models.Q(push_token__isnull=False),
+            ),
         ]
 
     def __str__(self):
@@ -75,6 +106,29 @@ class UserPreference(models.Model):
     def __str__(self):
         return f"Preferences for {self.user.email}"
 
+class DeviceToken(models.Model):
+    """
+    One push token per device; a user can have several. Tokens are looked up
+    by the SHA-256 of their value, a fixed-size unique key, since provider
+    tokens and web push endpoints can be hundreds of characters long.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='device_tokens')
+    token = models.TextField()
+    token_hash = models.CharField(max_length=64, unique=True)
+    platform = models.CharField(max_length=20, choices=DevicePlatform.choices, blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    last_seen_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'device_tokens'
+        indexes = [
+            # Per-user listing and trimming to the newest devices
+            models.Index(fields=['user', 'last_seen_at'], name='device_tokens_user_seen_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.platform or 'device'} {self.token_hash[:12]}"
+
 class NotificationStatusLog(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     notification_id = models.CharField(max_length=255, db_index=True)  # From notification service
@@ -82,14 +136,123 @@ class NotificationStatusLog(models.Model):
     notification_type = models.CharField(max_length=20, choices=NotificationType.choices)
     status = models.CharField(max_length=20, choices=NotificationStatus.choices)
     error = models.TextField(blank=True, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: write-behind ingestion stores the time the callback arrived
+    timestamp = models.DateTimeField(default=timezone.now)
     
     class Meta:
         db_table = 'notification_status_logs'
         indexes = [
             models.Index(fields=['notification_id']),
             models.Index(fields=['user', 'timestamp']),
+            # Archiving walks expired rows day by day in (timestamp, id) order
+            models.Index(fields=['timestamp', 'id'], name='status_logs_timestamp_id_idx'),
         ]
 
     def __str__(self):
-        return f"{self.notification_id} - {self.status}"
\ No newline at end of file
+        return f"{self.notification_id} - {self.status}"
+
+class NotificationCurrentStatus(models.Model):
+    """Latest status per notification, maintained by upsert next to the append-only log"""
+    notification_id = models.CharField(max_length=255)
+    notification_type = models.CharField(max_length=20, choices=NotificationType.choices)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='current_notification_statuses')
+    status = models.CharField(max_length=20, choices=NotificationStatus.choices)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'notification_current_status'
+        constraints = [
+            # Scoped to the user: callbacks for the same notification_id from
+            # another account must not overwrite this one
+            models.UniqueConstraint(
+                fields=['notification_id', 'notification_type', 'user'],
+                name='notification_current_status_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.notification_id} - {self.status}"
+
+class NotificationStatusHourly(models.Model):
+    """Status log rows per hour, type and status, rebuilt from the log by StatusRollupService"""
+    hour = models.DateTimeField()
+    notification_type = models.CharField(max_length=20, choices=NotificationType.choices)
+    status = models.CharField(max_length=20, choices=NotificationStatus.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'notification_status_hourly'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hour', 'notification_type', 'status'],
+                name='notification_status_hourly_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.hour} {self.notification_type} {self.status}: {self.count}"
+
+class UserNotificationDaily(models.Model):
+    """Status log rows per user, UTC day, type and status, kept current by StatusRollupService"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_daily_counts')
+    day = models.DateField()
+    notification_type = models.CharField(max_length=20, choices=NotificationType.choices)
+    status = models.CharField(max_length=20, choices=NotificationStatus.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'user_notification_daily'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'day', 'notification_type', 'status'],
+                name='user_notification_daily_uniq',
+            ),
+        ]
+        indexes = [
+            # Refreshes only touch the days from the recount window onwards
+            models.Index(fields=['day'], name='user_notif_daily_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.notification_type} {self.status}: {self.count}"
+
+class UserNotificationHourly(models.Model):
+    """
+    Status log rows per user, hour, type and status, kept only for the hours
+    StatusRollupService may still recount; it is what those hours already
+    added to UserNotificationDaily
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_hourly_counts')
+    hour = models.DateTimeField()
+    notification_type = models.CharField(max_length=20, choices=NotificationType.choices)
+    status = models.CharField(max_length=20, choices=NotificationStatus.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'user_notification_hourly'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'hour', 'notification_type', 'status'],
+                name='user_notification_hourly_uniq',
+            ),
+        ]
+        indexes = [
+            # Each refresh reads and deletes by hour
+            models.Index(fields=['hour'], name='user_notif_hourly_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.hour} {self.notification_type} {self.status}: {self.count}"
+
+class RollupWatermark(models.Model):
+    """How far a rollup has consumed its source; the row is also the rollup's lock"""
+    name = models.CharField(max_length=100, primary_key=True)
+    position = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'rollup_watermarks'
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
@@ -0,0 +1,123 @@
+# users/pagination.py
+import base64
+import json
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a (column, tiebreaker) ordering. The cursor
+    carries the last row's values and the next page is fetched with a
+    WHERE on them, so every page costs the same index range scan and no
+    OFFSET or COUNT(*) is issued.
+    """
+    ordering = ('created_at', 'id')
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    include_count_query_param = 'include_count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        # Totals are opt-in; a COUNT(*) is the one full scan this class avoids
+        self.count = None
+        if request.query_params.get(self.include_count_query_param, '').lower() in ('1', 'true'):
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            position = self.clean_position(queryset.model, position)
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.page = rows[:self.page_size]
+        self.has_next = len(rows) > self.page_size
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_position_filter(self, position):
+        column, tiebreaker = self.ordering
+        lookup = 'lt' if column.startswith('-') else 'gt'
+        column, tiebreaker = column.lstrip('-'), tiebreaker.lstrip('-')
+        value, pk = position
+        # The redundant bound on the leading column keeps the predicate
+        # sargable on its own, so range-partitioned tables prune partitions
+        return Q(**{f'{column}__{lookup}e': value}) & (
+            Q(**{f'{column}__{lookup}': value}) | Q(**{f'{tiebreaker}__{lookup}': pk})
+        )
+
+    def get_position(self, row):
+        values = []
+        for name in self.ordering:
+            name = name.lstrip('-')
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return values
+
+    def clean_position(self, model, position):
+        """Convert cursor values to the ordering fields' types; forged cursors are rejected."""
+        cleaned = []
+        for name, value in zip(self.ordering, position):
+            field = model._meta.get_field(name.lstrip('-'))
+            try:
+                value = field.to_python(value)
+            except (DjangoValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            cleaned.append(value)
+        return cleaned
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != 2:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        cursor = self.encode_cursor(self.get_position(self.page[-1]))
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_data(self, data):
+        paginated = {
+            "results": data,
+            "next": self.get_next_link(),
+        }
+        if self.count is not None:
+            paginated["count"] = self.count
+        return paginated
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class NotificationHistoryPagination(KeysetPagination):
+    # Newest first; seeks along the (user, timestamp) index
+    ordering = ('-timestamp', '-id')
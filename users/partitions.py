@@ -0,0 +1,192 @@
+# users/partitions.py
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+Partition = namedtuple('Partition', ['name', 'start', 'end'])
+
+INTERVALS = ('day', 'week', 'month')
+_BOUND = re.compile(r"FROM \((MINVALUE|'[^']+')\) TO \((MAXVALUE|'[^']+')\)")
+
+
+def floor(moment, interval):
+    """Start of the partition interval containing moment (UTC)."""
+    moment = moment.astimezone(dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == 'month':
+        return moment.replace(day=1)
+    if interval == 'week':
+        return moment - timedelta(days=moment.weekday())
+    return moment
+
+def advance(start, interval):
+    if interval == 'month':
+        return (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=7 if interval == 'week' else 1)
+
+
+class StatusLogPartitions:
+    """
+    Range partitions of notification_status_logs on timestamp (PostgreSQL;
+    see migrations 0005 and 0010). ensure() creates the upcoming partitions
+    and expire() drops or detaches those entirely older than the retention
+    window. Rows past the newest range land in the DEFAULT partition until
+    ensure() creates their range and moves them there. Other backends keep
+    the plain table and every call is a no-op.
+    """
+    table = 'notification_status_logs'
+
+    @staticmethod
+    def config():
+        return settings.NOTIFICATION_STATUS_PARTITIONS
+
+    @classmethod
+    def supported(cls):
+        return connection.vendor == 'postgresql'
+
+    @classmethod
+    def retention_start(cls, now=None):
+        """Oldest timestamp kept by the retention policy, or None to keep everything."""
+        days = cls.config()['RETENTION_DAYS']
+        if not days:
+            return None
+        return (now or timezone.now()) - timedelta(days=days)
+
+    @classmethod
+    def partition_name(cls, start, interval):
+        suffix = {'month': '%Y%m', 'week': '%Y%m%d', 'day': '%Y%m%d'}[interval]
+        return f"{cls.table}_p{start.strftime(suffix)}"
+
+    @classmethod
+    def list(cls):
+        """Attached partitions ordered by range; MINVALUE/MAXVALUE bounds are None."""
+        if not cls.supported():
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s
+            """, [cls.table])
+            rows = cursor.fetchall()
+
+        partitions = []
+        for name, bound in rows:
+            match = _BOUND.search(bound)
+            if match is None:  # DEFAULT partition
+                continue
+            start, end = (
+                None if value in ('MINVALUE', 'MAXVALUE') else datetime.fromisoformat(value.strip("'"))
+                for value in match.groups()
+            )
+            partitions.append(Partition(name, start, end))
+        return sorted(partitions, key=lambda p: p.start or datetime.min.replace(tzinfo=dt_timezone.utc))
+
+    @classmethod
+    def default(cls):
+        """Name of the attached DEFAULT partition, or None."""
+        if not cls.supported():
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s AND pg_get_expr(child.relpartbound, child.oid) = 'DEFAULT'
+            """, [cls.table])
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    @classmethod
+    def default_rows(cls):
+        """Rows waiting in the DEFAULT partition for a range partition to cover them."""
+        default = cls.default()
+        if default is None:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM "{default}"')
+            return cursor.fetchone()[0]
+
+    @classmethod
+    def create(cls, partition, default=None):
+        """Create one range partition, first moving any of its rows out of the DEFAULT partition."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            if default is not None:
+                cursor.execute(
+                    f'SELECT EXISTS (SELECT 1 FROM "{default}" WHERE "timestamp" >= %s AND "timestamp" < %s)',
+                    [partition.start, partition.end]
+                )
+                if cursor.fetchone()[0]:
+                    # PostgreSQL refuses a range the DEFAULT partition holds rows for,
+                    # so build the partition standalone, move the rows, then attach it
+                    cursor.execute(f'CREATE TABLE "{partition.name}" (LIKE "{cls.table}" INCLUDING DEFAULTS)')
+                    cursor.execute(
+                        f'WITH moved AS (DELETE FROM "{default}" WHERE "timestamp" >= %s AND "timestamp" < %s '
+                        f'RETURNING *) INSERT INTO "{partition.name}" SELECT * FROM moved',
+                        [partition.start, partition.end]
+                    )
+                    cursor.execute(
+                        f'ALTER TABLE "{cls.table}" ATTACH PARTITION "{partition.name}" FOR VALUES FROM (%s) TO (%s)',
+                        [partition.start, partition.end]
+                    )
+                    return
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS "{partition.name}" PARTITION OF "{cls.table}" '
+                'FOR VALUES FROM (%s) TO (%s)',
+                [partition.start, partition.end]
+            )
+
+    @classmethod
+    def ensure(cls, now=None, premake=None, dry_run=False):
+        """Create partitions so that the next `premake` intervals are covered; returns them."""
+        if not cls.supported():
+            return []
+        config = cls.config()
+        interval = config['INTERVAL']
+        premake = config['PREMAKE'] if premake is None else premake
+        now = now or timezone.now()
+
+        existing = cls.list()
+        # Continue from the newest bound so a changed INTERVAL never overlaps old ranges
+        start = max((p.end for p in existing if p.end), default=floor(now, interval))
+        horizon = floor(now, interval)
+        for _ in range(premake + 1):
+            horizon = advance(horizon, interval)
+
+        default = None if dry_run else cls.default()
+        created = []
+        while start < horizon:
+            end = advance(floor(start, interval), interval)
+            partition = Partition(cls.partition_name(start, interval), start, end)
+            if not dry_run:
+                cls.create(partition, default)
+            created.append(partition)
+            start = end
+        return created
+
+    @classmethod
+    def expire(cls, now=None, action=None, dry_run=False):
+        """Drop or detach partitions whose whole range is older than the retention window."""
+        if not cls.supported():
+            return []
+        cutoff = cls.retention_start(now)
+        if cutoff is None:
+            return []
+        action = action or cls.config()['EXPIRED_ACTION']
+
+        expired = [p for p in cls.list() if p.end is not None and p.end <= cutoff]
+        for partition in expired:
+            if dry_run:
+                continue
+            with transaction.atomic(), connection.cursor() as cursor:
+                if action == 'detach':
+                    # Kept as a standalone table for archiving; drop it by hand later
+                    cursor.execute(f'ALTER TABLE "{cls.table}" DETACH PARTITION "{partition.name}"')
+                else:
+                    cursor.execute(f'DROP TABLE "{partition.name}"')
+        return expired
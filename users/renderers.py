@@ -0,0 +1,69 @@
+# users/renderers.py
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # falls back to JSONRenderer
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer that encodes with orjson. Output matches the stock
+    compact, UTF-8 renderer byte for byte for strings, integers, booleans,
+    datetimes and anything else routed through DRF's JSONEncoder, and
+    U+2028/U+2029 are escaped the same way. Floats differ in two ways, both
+    left alone because spotting them would mean walking every payload:
+    exponents are written without '+' or padding (1e16, not 1e+16), and
+    NaN/Infinity render as null where the strict JSONRenderer raises.
+    Indented output (browsable API, ?indent=), ASCII-only settings and
+    values orjson rejects use JSONRenderer.
+    """
+    _options = orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if (
+            orjson is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self._options)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits or non-string keys; let json report or handle them
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    application/msgpack for service-to-service callers. Values are the same
+    as in the JSON body: datetimes, UUIDs and lazy strings are converted by
+    DRF's JSONEncoder, so clients can switch formats without other changes.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = encoders.JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if msgpack is None:
+            raise ImproperlyConfigured("MessagePackRenderer requires the msgpack package")
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.encoder_class().default, use_bin_type=True)
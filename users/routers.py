@@ -0,0 +1,82 @@
+# users/routers.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+
+PRIMARY = 'primary'
+REPLICA = 'replica'
+
+# Where reads go in the current context. Requests and commands start on the
+# primary and opt in to replica reads; the first write switches back for the
+# rest of the context, so read-after-write never sees replication lag.
+_reads = ContextVar('database_reads', default=PRIMARY)
+
+
+def replica_alias():
+    config = settings.DATABASE_REPLICA
+    return config['ALIAS'] if config['ENABLED'] else None
+
+
+@contextmanager
+def use_replica():
+    token = _reads.set(REPLICA)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+@contextmanager
+def use_primary():
+    token = _reads.set(PRIMARY)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Reads go to the replica inside use_replica(); everything else uses default."""
+
+    def db_for_read(self, model, **hints):
+        if _reads.get() == REPLICA:
+            return replica_alias() or 'default'
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        if _reads.get() == REPLICA:
+            _reads.set(PRIMARY)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaReadsMixin:
+    """
+    Runs the viewset actions listed in replica_actions inside use_replica().
+    Authentication happens inside the scope too, so principal cache misses
+    are served by the replica as well. The scope opens in initial(), once
+    the action is known, and closes when dispatch() returns or raises.
+    """
+    replica_actions = ()
+
+    def initial(self, request, *args, **kwargs):
+        if self.action in self.replica_actions:
+            self._replica_reads = use_replica()
+            self._replica_reads.__enter__()
+        super().initial(request, *args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # finalize_response is skipped when an exception escapes handle_exception
+            replica_reads = getattr(self, '_replica_reads', None)
+            if replica_reads is not None:
+                self._replica_reads = None
+                replica_reads.__exit__(None, None, None)
@@ -1,8 +1,22 @@
 # users/serializers.py
+from datetime import timedelta
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import authenticate
-from .models import User, UserPreference, NotificationStatusLog
-from .enums import NotificationStatus
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from .models import User, UserPreference, NotificationStatusLog, NotificationCurrentStatus
+from .enums import DevicePlatform, NotificationStatus, NotificationType
+from .hash_pool import get_password_hash_pool
+
+def register_push_token(user, push_token):
+    """Mirror a push_token written to the legacy column into the device registry."""
+    # services imports this module
+    from .services import DeviceTokenService
+
+    if push_token:
+        DeviceTokenService.register(user.pk, [{"token": push_token}])
 
 class UserPreferenceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -22,12 +36,16 @@ class UserCreateSerializer(serializers.ModelSerializer):
         preferences_data = validated_data.pop('preferences')
         password = validated_data.pop('password')
         
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
+        # The async register view hashes before saving; otherwise hash on the pool
+        password_hash = validated_data.pop('password_hash', None)
+        if password_hash is None:
+            password_hash = get_password_hash_pool().run(make_password, password)
         
-        # Create user preferences
-        UserPreference.objects.create(user=user, **preferences_data)
+        # One hash and one INSERT per row; the user never exists without preferences
+        with transaction.atomic():
+            user = User.objects.create_user_with_hash(password_hash=password_hash, **validated_data)
+            UserPreference.objects.create(user=user, **preferences_data)
+            register_push_token(user, validated_data.get('push_token'))
         
         return user
 
@@ -42,9 +60,11 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         preferences_data = validated_data.pop('preferences', None)
         
         # Update user fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        with transaction.atomic():
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            register_push_token(instance, validated_data.get('push_token'))
         
         # Update preferences if provided
         if preferences_data:
@@ -62,15 +82,101 @@ class UserResponseSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'name', 'email', 'push_token', 'preferences', 'created_at', 'updated_at']
 
+# Hand-written equivalents of UserResponseSerializer and NotificationStatusSerializer
+# for the read-heavy paths. They build the same dicts straight from .values()
+# rows, skipping per-instance field introspection; test_fast_serialization keeps
+# the rendered output byte-for-byte identical.
+_datetime_field = serializers.DateTimeField()
+
+USER_VALUES = (
+    'id', 'name', 'email', 'push_token', 'preference__email', 'preference__push', 'created_at', 'updated_at'
+)
+
+def user_row_data(row):
+    """UserResponseSerializer output for a .values(*USER_VALUES) row."""
+    to_datetime = _datetime_field.to_representation
+    preferences = None
+    if row['preference__email'] is not None:
+        preferences = {'email': row['preference__email'], 'push': row['preference__push']}
+    return {
+        'id': str(row['id']),
+        'name': row['name'],
+        'email': row['email'],
+        'push_token': row['push_token'],
+        'preferences': preferences,
+        'created_at': to_datetime(row['created_at']),
+        'updated_at': to_datetime(row['updated_at']),
+    }
+
+# id is only selected for keyset pagination cursors
+STATUS_LOG_VALUES = ('id', 'notification_id', 'status', 'timestamp', 'error')
+
+def status_log_row_data(row):
+    """NotificationStatusSerializer output for a .values(*STATUS_LOG_VALUES) row."""
+    return {
+        'notification_id': row['notification_id'],
+        'status': row['status'],
+        'timestamp': _datetime_field.to_representation(row['timestamp']),
+        'error': row['error'],
+    }
+
+class UserBulkLookupSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.USER_BULK_LOOKUP_MAX_IDS
+    )
+
+class DeviceSerializer(serializers.Serializer):
+    token = serializers.CharField(max_length=4096)
+    platform = serializers.ChoiceField(choices=DevicePlatform.choices, required=False, allow_blank=True)
+
+class DeviceRegisterSerializer(serializers.Serializer):
+    devices = serializers.ListField(
+        child=DeviceSerializer(),
+        allow_empty=False,
+        max_length=settings.DEVICE_TOKENS['MAX_BATCH']
+    )
+
+class DeviceTokenListSerializer(serializers.Serializer):
+    tokens = serializers.ListField(
+        child=serializers.CharField(max_length=4096),
+        allow_empty=False,
+        max_length=settings.DEVICE_TOKENS['MAX_BATCH']
+    )
+
+class NotificationStatsQuerySerializer(serializers.Serializer):
+    """Query parameters of GET /api/v1/status/stats/; days are UTC and inclusive"""
+    scope = serializers.ChoiceField(choices=['user', 'global'], default='user')
+    type = serializers.ChoiceField(choices=NotificationType.choices, required=False)
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        until = attrs.setdefault('until', timezone.now().date())
+        since = attrs.setdefault('since', until - timedelta(days=6))
+        if since > until:
+            raise serializers.ValidationError({'since': 'since must not be after until'})
+        max_days = settings.NOTIFICATION_STATUS_ROLLUP['MAX_RANGE_DAYS']
+        if (until - since).days >= max_days:
+            raise serializers.ValidationError({'since': f'At most {max_days} days can be requested'})
+        return attrs
+
 class NotificationStatusSerializer(serializers.ModelSerializer):
     class Meta:
         model = NotificationStatusLog
         fields = ['notification_id', 'status', 'timestamp', 'error']
+        read_only_fields = ['timestamp']
     
     def create(self, validated_data):
         # The user will be set in the view
         return super().create(validated_data)
 
+class NotificationCurrentStatusSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = NotificationCurrentStatus
+        fields = ['notification_id', 'notification_type', 'status', 'error', 'created_at', 'updated_at']
+
 class UserLoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
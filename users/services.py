@@ -1,56 +1,886 @@
 # users/services.py
+import csv
+import hashlib
 import json
+import random
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
 from django.core.cache import cache
-from .models import User
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from . import codecs
+from .cache import LRUCache, invalidation_bus
+from .enums import NotificationStatus, NotificationType
+from .models import (
+    User, DeviceToken, NotificationCurrentStatus, NotificationStatusLog,
+    NotificationStatusHourly, UserNotificationDaily, UserNotificationHourly, RollupWatermark,
+)
+from .routers import replica_alias, use_primary
+from .serializers import USER_VALUES, UserPreferenceSerializer, UserResponseSerializer, user_row_data
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
 
 class UserCacheService:
+    """
+    Read-through / write-through cache of the UserResponseSerializer payload.
+    The user:{id} entry is the single source for cached user data; preferences
+    are read from it rather than from a separately cached key.
+
+    With USER_CACHE['L1_ENABLED'] a bounded in-process LRU (L1) sits in front
+    of Redis (L2). Write paths publish the user id on the invalidation bus so
+    other processes drop their L1 copy; L1_TTL bounds staleness otherwise.
+    Payloads returned from L1 are shared and must not be mutated.
+
+    Expiry never stampedes Postgres: Redis entries carry a jittered soft
+    expiry and outlive it by STALE_TTL. Once stale, one request takes a short
+    lock and reloads while the others keep serving the stale copy; on a
+    hard miss the losers of the lock wait up to LOCK_WAIT for the winner.
+
+    Entries are stored as positional rows through the configured CODEC (see
+    users.codecs), tagged with a LAYOUT fingerprint of the serializer fields;
+    rows from a different layout are treated as misses. Each entry also keeps
+    its version, the newest updated_at of the user and preference rows, so
+    conditional requests can be answered from the cache.
+    """
+    USER_FIELDS = tuple(UserResponseSerializer().fields)
+    PREFERENCE_FIELDS = tuple(UserPreferenceSerializer().fields)
+    VALUES = USER_VALUES + ('preference__updated_at',)
+    LAYOUT = zlib.crc32(','.join(('version',) + USER_FIELDS + PREFERENCE_FIELDS).encode()) & 0xffff
+
+    _l1 = None
+    _l1_config = None
+    _stats = Counter()
+
+    @staticmethod
+    def _cache_key(user_id):
+        return f"user:{user_id}"
+
+    @classmethod
+    def _l1_cache(cls):
+        config = settings.USER_CACHE
+        if not config['L1_ENABLED']:
+            return None
+        if cls._l1 is None or cls._l1_config != config:
+            cls._l1 = LRUCache(maxsize=config['L1_MAXSIZE'], ttl=config['L1_TTL'])
+            cls._l1_config = dict(config)
+            invalidation_bus.ensure_listening()
+        return cls._l1
+
+    @classmethod
+    def _count(cls, counter, amount=1):
+        cls._stats[counter] += amount
+
+    @classmethod
+    def get_stats(cls):
+        """Per-process hit/miss counters for each tier."""
+        l1 = cls._l1_cache()
+        return {
+            'l1_enabled': l1 is not None,
+            'l1_size': len(l1) if l1 is not None else 0,
+            **{
+                counter: cls._stats[counter]
+                for counter in ('l1_hits', 'l1_misses', 'l2_hits', 'l2_stale', 'l2_misses')
+            },
+        }
+
+    @staticmethod
+    def _config():
+        return settings.USER_CACHE
+
+    @staticmethod
+    def _version(*timestamps):
+        """Newest of the given updated_at values, in epoch microseconds."""
+        return max((ts - EPOCH) // timedelta(microseconds=1) for ts in timestamps if ts is not None)
+
+    @classmethod
+    def _pack(cls, user_data, soft_expires, version):
+        # Positional rows instead of dicts: field names are not repeated in every entry
+        return [cls.LAYOUT, soft_expires, version] + [
+            [user_data[field][name] for name in cls.PREFERENCE_FIELDS]
+            if field == 'preferences' and user_data[field] is not None else user_data[field]
+            for field in cls.USER_FIELDS
+        ]
+
+    @classmethod
+    def _unpack(cls, entry):
+        user_data = dict(zip(cls.USER_FIELDS, entry[3:]))
+        if user_data.get('preferences') is not None:
+            user_data['preferences'] = dict(zip(cls.PREFERENCE_FIELDS, user_data['preferences']))
+        return user_data, entry[1], entry[2]
+
+    @classmethod
+    def _encode(cls, user_data, version):
+        config = cls._config()
+        ttl = config['TTL'] * random.uniform(1 - config['JITTER'], 1 + config['JITTER'])
+        return codecs.encode(
+            cls._pack(user_data, int(time.time() + ttl), version),
+            codecs.get_codec(config['CODEC']),
+            config['COMPRESS_MIN_SIZE']
+        )
+
+    @classmethod
+    def _decode(cls, cached_user):
+        """Return (payload, soft expiry, version), or None for an entry this release cannot read."""
+        if isinstance(cached_user, str):
+            # JSON text written by earlier releases; served, but counted as stale
+            entry = json.loads(cached_user)
+            return (entry['data'], 0, None) if 'soft_expires' in entry else (entry, 0, None)
+        try:
+            entry = codecs.decode(cached_user)
+        except Exception:
+            return None
+        if entry[0] != cls.LAYOUT:
+            return None
+        return cls._unpack(entry)
+
+    @classmethod
+    def _hard_ttl(cls):
+        config = cls._config()
+        return int(config['TTL'] * (1 + config['JITTER']) + config['STALE_TTL'])
+
+    @classmethod
+    def _store(cls, user_data, version):
+        cache_key = cls._cache_key(user_data['id'])
+        cache.set(cache_key, cls._encode(user_data, version), cls._hard_ttl())
+        l1 = cls._l1_cache()
+        if l1 is not None:
+            l1.set(cache_key, (user_data, version))
+        return user_data, version
+
     @staticmethod
-    def get_user(user_id):
-        cache_key = f"user:{user_id}"
+    def _written_key(user_id):
+        return f"written:user:{user_id}"
+
+    @classmethod
+    def _mark_written(cls, user_id):
+        # Reloads of this user read the primary until the replica has caught up
+        sticky = settings.DATABASE_REPLICA['STICKY_SECONDS']
+        if replica_alias() and sticky:
+            cache.set(cls._written_key(user_id), 1, sticky)
+
+    @classmethod
+    def _query(cls, user_ids):
+        """.values() rows for the active users among user_ids, honouring _mark_written."""
+        pinned = set()
+        if replica_alias():
+            written = cache.get_many([cls._written_key(user_id) for user_id in user_ids])
+            pinned = {user_id for user_id in user_ids if cls._written_key(user_id) in written}
+
+        queryset = User.objects.filter(is_active=True).values(*cls.VALUES)
+        rows = list(queryset.filter(id__in=[user_id for user_id in user_ids if user_id not in pinned]))
+        if pinned:
+            with use_primary():
+                rows += list(queryset.filter(id__in=pinned))
+        return rows
+
+    @classmethod
+    def _load(cls, user_id, lock_key):
+        """Reload user_id from the database into the cache, then release lock_key."""
+        try:
+            try:
+                rows = cls._query([str(user_id)])
+            except ValidationError:
+                rows = []
+            if not rows:
+                cache.delete(cls._cache_key(user_id))
+                return None
+            row = rows[0]
+            return cls._store(user_row_data(row), cls._version(row['updated_at'], row['preference__updated_at']))
+        finally:
+            cache.delete(lock_key)
+
+    @classmethod
+    def _wait_for(cls, cache_key):
+        """Poll for the entry another request is loading; None after LOCK_WAIT."""
+        deadline = time.monotonic() + cls._config()['LOCK_WAIT']
+        while time.monotonic() < deadline:
+            time.sleep(0.02)
+            cached_user = cache.get(cache_key)
+            decoded = cls._decode(cached_user) if cached_user else None
+            if decoded:
+                return decoded[0], decoded[2]
+        return None
+
+    @classmethod
+    def set_user(cls, user):
+        """Write the current state of user to the cache and return the payload."""
+        preference = getattr(user, 'preference', None)
+        user_data, _ = cls._store(
+            UserResponseSerializer(user).data,
+            cls._version(user.updated_at, preference.updated_at if preference else None)
+        )
+        cls._mark_written(user.id)
+        invalidation_bus.publish([user.id])
+        return user_data
+
+    @classmethod
+    def get_user(cls, user_id):
+        cached = cls.get_user_version(user_id)
+        return cached[0] if cached else None
+
+    @classmethod
+    def get_user_version(cls, user_id):
+        """
+        Return (payload, version) for an active user, or None. version is the
+        newest updated_at of the user and preference rows in epoch microseconds,
+        or None for an entry written by an older release.
+        """
+        cache_key = cls._cache_key(user_id)
+        l1 = cls._l1_cache()
+        if l1 is not None:
+            cached = l1.get(cache_key)
+            if cached is not None:
+                cls._count('l1_hits')
+                return cached
+            cls._count('l1_misses')
+
         cached_user = cache.get(cache_key)
+        decoded = cls._decode(cached_user) if cached_user else None
+        lock_key = f"lock:{cache_key}"
         
-        if cached_user:
-            return json.loads(cached_user)
-        
-        try:
-            user = User.objects.select_related('preference').get(id=user_id)
-            user_data = {
-                'id': str(user.id),
-                'email': user.email,
-                'name': user.name,
-                'push_token': user.push_token,
-                'preferences': {
-                    'email': user.preference.email,
-                    'push': user.preference.push
-                }
-            }
+        if decoded:
+            user_data, soft_expires, version = decoded
+            if time.time() < soft_expires:
+                cls._count('l2_hits')
+                if l1 is not None:
+                    l1.set(cache_key, (user_data, version))
+                return user_data, version
             
-            cache.set(cache_key, json.dumps(user_data), 300)
-            return user_data
-        except User.DoesNotExist:
-            return None
+            # Stale: a single request refreshes, everyone else serves the old copy
+            cls._count('l2_stale')
+            if not cache.add(lock_key, 1, cls._config()['LOCK_TTL']):
+                return user_data, version
+            return cls._load(user_id, lock_key)
+        
+        cls._count('l2_misses')
+        if not cache.add(lock_key, 1, cls._config()['LOCK_TTL']):
+            cached = cls._wait_for(cache_key)
+            if cached is not None:
+                return cached
+        return cls._load(user_id, lock_key)
+    
+    @classmethod
+    def get_users(cls, user_ids):
+        """
+        Resolve many users at once: L1 first, then one get_many against Redis,
+        then a single id__in query for the misses, which are written back with
+        set_many. Returns a dict of user id -> payload for the active users found.
+        """
+        keys = {cls._cache_key(user_id): str(user_id) for user_id in user_ids}
+        users = {}
+
+        l1 = cls._l1_cache()
+        if l1 is not None:
+            for key, user_id in keys.items():
+                cached = l1.get(key)
+                if cached is not None:
+                    users[user_id] = cached[0]
+            cls._count('l1_hits', len(users))
+            cls._count('l1_misses', len(keys) - len(users))
+
+        remote_keys = [key for key, user_id in keys.items() if user_id not in users]
+        stale = []
+        now = time.time()
+        for key, cached_user in cache.get_many(remote_keys).items():
+            decoded = cls._decode(cached_user)
+            if decoded is None:
+                continue
+            user_data, soft_expires, version = decoded
+            users[keys[key]] = user_data
+            if soft_expires <= now:
+                stale.append(keys[key])
+            elif l1 is not None:
+                l1.set(key, (user_data, version))
+
+        # Stale entries ride along in the single refresh query
+        missing = [user_id for user_id in keys.values() if user_id not in users]
+        cls._count('l2_hits', len(remote_keys) - len(missing) - len(stale))
+        cls._count('l2_stale', len(stale))
+        cls._count('l2_misses', len(missing))
+        if missing or stale:
+            to_cache = {}
+            for row in cls._query(missing + stale):
+                user_data = user_row_data(row)
+                version = cls._version(row['updated_at'], row['preference__updated_at'])
+                users[user_data['id']] = user_data
+                to_cache[cls._cache_key(user_data['id'])] = cls._encode(user_data, version)
+                if l1 is not None:
+                    l1.set(cls._cache_key(user_data['id']), (user_data, version))
+            cache.set_many(to_cache, cls._hard_ttl())
+            # Stale entries the query no longer returns are deactivated or deleted users
+            gone = [user_id for user_id in stale if cls._cache_key(user_id) not in to_cache]
+            for user_id in gone:
+                del users[user_id]
+            if gone:
+                cache.delete_many([cls._cache_key(user_id) for user_id in gone])
+
+        return users
+
+    @classmethod
+    def invalidate_user(cls, user_id):
+        # user_preferences:{id} was written by earlier releases; drop it too
+        cache.delete_many([
+            cls._cache_key(user_id),
+            f"user_preferences:{user_id}",
+        ])
+        cls._mark_written(user_id)
+        cls.drop_local([user_id])
+        invalidation_bus.publish([user_id])
+
+    @classmethod
+    def drop_local(cls, user_ids):
+        """Invalidation bus handler: forget L1 entries (all of them for None)."""
+        if cls._l1 is None:
+            return
+        if user_ids is None:
+            cls._l1.clear()
+            return
+        for user_id in user_ids:
+            cls._l1.delete(cls._cache_key(user_id))
     
+    @classmethod
+    def get_user_preferences(cls, user_id):
+        user_data = cls.get_user(user_id)
+        if user_data is None:
+            return None
+        return user_data['preferences']
+
+
+class PrincipalCacheService:
+    """
+    Caches the columns JWTAuthentication needs to build request.user, so
+    authenticated requests skip the users table. Entries live in a small
+    in-process LRU in front of Redis and are hydrated into a deferred User
+    instance (password and the other columns load lazily if touched).
+    """
+    FIELDS = ('id', 'email', 'name', 'push_token', 'is_active', 'is_staff', 'is_superuser')
+
+    _local = None
+
+    @staticmethod
+    def _config():
+        return settings.AUTH_PRINCIPAL_CACHE
+
+    @classmethod
+    def _local_cache(cls):
+        if cls._local is None:
+            config = cls._config()
+            cls._local = LRUCache(maxsize=config['LOCAL_MAXSIZE'], ttl=config['LOCAL_TTL'])
+            invalidation_bus.ensure_listening()
+        return cls._local
+
     @staticmethod
-    def invalidate_user(user_id):
-        cache_key = f"user:{user_id}"
+    def _cache_key(user_id):
+        return f"auth_principal:{user_id}"
+
+    @classmethod
+    def get_user(cls, user_id):
+        """Return the active user for user_id, or None if missing or inactive."""
+        config = cls._config()
+        if not config['ENABLED']:
+            return User.objects.filter(id=user_id, is_active=True).first()
+
+        cache_key = cls._cache_key(user_id)
+        local = cls._local_cache()
+
+        values = local.get(cache_key)
+        if values is None:
+            values = cache.get(cache_key)
+            if values is None:
+                values = User.objects.filter(
+                    id=user_id, is_active=True
+                ).values_list(*cls.FIELDS).first()
+                if values is None:
+                    return None
+                cache.set(cache_key, values, config['TTL'])
+            local.set(cache_key, values)
+
+        return User.from_db(User.objects.db, cls.FIELDS, values)
+
+    @classmethod
+    def invalidate(cls, user_id):
+        cache_key = cls._cache_key(user_id)
+        cls._local_cache().delete(cache_key)
         cache.delete(cache_key)
-    
+        invalidation_bus.publish([user_id])
+
+    @classmethod
+    def drop_local(cls, user_ids):
+        """Invalidation bus handler: forget local entries (all of them for None)."""
+        if cls._local is None:
+            return
+        if user_ids is None:
+            cls._local.clear()
+            return
+        for user_id in user_ids:
+            cls._local.delete(cls._cache_key(user_id))
+
+
+invalidation_bus.register(UserCacheService.drop_local)
+invalidation_bus.register(PrincipalCacheService.drop_local)
+
+
+class LastLoginService:
+    """
+    Records last_login with a single-column UPDATE. With
+    LAST_LOGIN_UPDATE_INTERVAL set, a Redis marker (SET NX) limits that to
+    one write per user per interval, since logins are the busiest write.
+    """
+
     @staticmethod
-    def get_user_preferences(user_id):
-        cache_key = f"user_preferences:{user_id}"
-        cached_prefs = cache.get(cache_key)
-        
-        if cached_prefs:
-            return json.loads(cached_prefs)
-        
-        try:
-            user = User.objects.select_related('preference').get(id=user_id)
-            preferences = {
-                'email': user.preference.email,
-                'push': user.preference.push
-            }
-            
-            cache.set(cache_key, json.dumps(preferences), 600)
-            return preferences
-        except User.DoesNotExist:
-            return None
\ No newline at end of file
+    def record(user):
+        """Update user.last_login; returns False when coalesced away."""
+        interval = settings.LAST_LOGIN_UPDATE_INTERVAL
+        if interval and not cache.add(f"last_login:{user.pk}", 1, interval):
+            return False
+
+        now = timezone.now()
+        # queryset.update(): no full-row save, no updated_at bump, no signals
+        User.objects.filter(pk=user.pk).update(last_login=now)
+        user.last_login = now
+        return True
+
+
+class DeviceTokenService:
+    """
+    Registry of push tokens, several devices per user. Writes upsert on the
+    token hash, so a token that moves to another account changes owner
+    instead of being duplicated. Per-user token lists for fan-out are cached
+    in Redis and fetched for many users with one get_many.
+    """
+    COLUMNS = ('user_id', 'token', 'token_hash', 'platform', 'created_at', 'last_seen_at')
+
+    @staticmethod
+    def _config():
+        return settings.DEVICE_TOKENS
+
+    @staticmethod
+    def hash_token(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def _cache_key(user_id):
+        return f"device_tokens:{user_id}"
+
+    @classmethod
+    def _owners(cls, token_hashes):
+        return set(DeviceToken.objects.filter(token_hash__in=token_hashes).values_list('user_id', flat=True))
+
+    @classmethod
+    def register(cls, user_id, devices):
+        """Add or refresh devices ({'token', 'platform'} dicts) for a user; returns how many."""
+        # Last entry wins for repeated tokens within one request
+        devices = {cls.hash_token(device['token']): device for device in devices}
+        now = timezone.now()
+        fields = [DeviceToken._meta.get_field(column) for column in cls.COLUMNS]
+        params = []
+        for token_hash, device in devices.items():
+            values = (user_id, device['token'], token_hash, device.get('platform') or '', now, now)
+            params.extend(field.get_db_prep_save(value, connection) for field, value in zip(fields, values))
+
+        qn = connection.ops.quote_name
+        columns = ', '.join(qn(field.column) for field in fields)
+        placeholders = ', '.join(['(' + ', '.join(['%s'] * len(fields)) + ')'] * len(devices))
+        sql = (
+            f"INSERT INTO {qn(DeviceToken._meta.db_table)} ({columns}) VALUES {placeholders} "
+            f"ON CONFLICT ({qn('token_hash')}) DO UPDATE SET "
+            f"{qn('user_id')} = EXCLUDED.{qn('user_id')}, "
+            f"{qn('platform')} = EXCLUDED.{qn('platform')}, "
+            f"{qn('last_seen_at')} = EXCLUDED.{qn('last_seen_at')}"
+        )
+
+        with transaction.atomic():
+            previous_owners = cls._owners(list(devices))
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+            cls._trim(user_id)
+        cls.invalidate(previous_owners | {user_id})
+        return len(devices)
+
+    @classmethod
+    def _trim(cls, user_id):
+        """Forget the least recently seen devices beyond MAX_PER_USER."""
+        keep = cls._config()['MAX_PER_USER']
+        stale = list(
+            DeviceToken.objects.filter(user_id=user_id)
+            .order_by('-last_seen_at', '-id').values_list('id', flat=True)[keep:]
+        )
+        if stale:
+            DeviceToken.objects.filter(id__in=stale).delete()
+
+    @classmethod
+    def unregister(cls, user_id, tokens):
+        """Remove a user's devices by token; tokens owned by others are ignored."""
+        hashes = [cls.hash_token(token) for token in tokens]
+        with transaction.atomic():
+            deleted, _ = DeviceToken.objects.filter(user_id=user_id, token_hash__in=hashes).delete()
+            if deleted:
+                cls._clear_legacy([user_id], tokens)
+        if deleted:
+            cls.invalidate([user_id])
+        return deleted
+
+    @classmethod
+    def prune(cls, tokens):
+        """Remove tokens the push provider reported as invalid, whoever owns them."""
+        hashes = [cls.hash_token(token) for token in tokens]
+        with transaction.atomic():
+            owners = cls._owners(hashes)
+            deleted, _ = DeviceToken.objects.filter(token_hash__in=hashes).delete()
+            cls._clear_legacy(owners, tokens)
+        cls.invalidate(owners)
+        return deleted
+
+    @staticmethod
+    def _clear_legacy(user_ids, tokens):
+        """Blank users.push_token where it still holds a removed token."""
+        # Every legacy token is also in the registry, so its owners are the only candidates
+        if user_ids:
+            User.objects.filter(pk__in=list(user_ids), push_token__in=list(tokens)).update(
+                push_token=None, updated_at=timezone.now()
+            )
+
+    @classmethod
+    def get_tokens(cls, user_ids):
+        """{user_id: [{'token', 'platform'}, ...]} for fan-out, newest device first."""
+        user_ids = [str(user_id) for user_id in user_ids]
+        keys = {cls._cache_key(user_id): user_id for user_id in user_ids}
+        cached = cache.get_many(list(keys))
+        tokens = {keys[key]: value for key, value in cached.items()}
+
+        missing = [user_id for user_id in user_ids if user_id not in tokens]
+        if missing:
+            loaded = {user_id: [] for user_id in missing}
+            rows = (
+                DeviceToken.objects.filter(user_id__in=missing)
+                .order_by('user_id', '-last_seen_at', '-id').values_list('user_id', 'token', 'platform')
+            )
+            for user_id, token, platform in rows:
+                loaded[str(user_id)].append({'token': token, 'platform': platform})
+            # Empty lists are cached too, so users without devices cost no query
+            cache.set_many({cls._cache_key(user_id): value for user_id, value in loaded.items()}, cls._config()['CACHE_TTL'])
+            tokens.update(loaded)
+        return {user_id: tokens[user_id] for user_id in user_ids}
+
+    @classmethod
+    def invalidate(cls, user_ids):
+        if user_ids:
+            cache.delete_many([cls._cache_key(user_id) for user_id in user_ids])
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to csv.writer's caller."""
+    def write(self, value):
+        return value
+
+
+class RecipientSegmentService:
+    """
+    Streams campaign recipient segments straight off a server-side cursor,
+    so memory stays flat regardless of how many users match. The push
+    segment has one row per registered device.
+    """
+    FIELDS = ('id', 'email', 'name', 'push_token')
+    SEGMENTS = ('email', 'push')
+    CONTENT_TYPES = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+    }
+
+    @staticmethod
+    def get_queryset(segment):
+        if segment == 'email':
+            queryset = User.objects.filter(is_active=True, preference__email=True)
+            return queryset.order_by().values_list(*RecipientSegmentService.FIELDS)
+        if segment == 'push':
+            queryset = DeviceToken.objects.filter(user__is_active=True, user__preference__push=True)
+            return queryset.order_by().values_list('user_id', 'user__email', 'user__name', 'token')
+        raise ValueError(f"Unknown segment: {segment}")
+
+    @classmethod
+    def iter_rows(cls, segment, chunk_size=None):
+        chunk_size = chunk_size or settings.SEGMENT_EXPORT_CHUNK_SIZE
+        # Exports tolerate replication lag; the explicit alias also covers
+        # streaming responses, which are consumed after the view returns
+        queryset = cls.get_queryset(segment).using(replica_alias() or 'default')
+        for user_id, *values in queryset.iterator(chunk_size=chunk_size):
+            yield (str(user_id), *values)
+
+    @classmethod
+    def stream(cls, segment, output='ndjson', chunk_size=None):
+        """Yield the segment encoded as NDJSON or CSV, one string per chunk of rows."""
+        if output not in cls.CONTENT_TYPES:
+            raise ValueError(f"Unknown output format: {output}")
+        chunk_size = chunk_size or settings.SEGMENT_EXPORT_CHUNK_SIZE
+
+        if output == 'csv':
+            writer = csv.writer(_Echo())
+            encode = writer.writerow
+            yield encode(cls.FIELDS)
+        else:
+            def encode(row):
+                return json.dumps(dict(zip(cls.FIELDS, row))) + '\n'
+
+        lines = []
+        for row in cls.iter_rows(segment, chunk_size):
+            lines.append(encode(row))
+            if len(lines) >= chunk_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+
+
+class CurrentStatusService:
+    """
+    Keeps notification_current_status at one row per (notification_id, type, user).
+    Transitions only move forward, pending -> delivered | failed, so retried
+    or out-of-order callbacks are no-ops.
+    """
+    COLUMNS = ('notification_id', 'notification_type', 'user_id', 'status', 'error', 'created_at', 'updated_at')
+    RANK = {
+        NotificationStatus.PENDING: 0,
+        NotificationStatus.DELIVERED: 1,
+        NotificationStatus.FAILED: 1,
+    }
+    # Rows per INSERT statement, kept well under the bind parameter limits
+    BATCH_SIZE = 1000
+
+    @classmethod
+    def record(cls, logs):
+        """Upsert the current status from NotificationStatusLog instances."""
+        # Collapse each notification to its furthest transition; the first
+        # terminal status seen wins, as it would in the database
+        latest = {}
+        for log in logs:
+            key = (log.notification_id, log.notification_type, log.user_id)
+            if key not in latest or cls.RANK[log.status] > cls.RANK[latest[key].status]:
+                latest[key] = log
+        rows = list(latest.values())
+        for start in range(0, len(rows), cls.BATCH_SIZE):
+            cls._upsert(rows[start:start + cls.BATCH_SIZE])
+
+    @classmethod
+    def _upsert(cls, logs):
+        fields = [NotificationCurrentStatus._meta.get_field(column) for column in cls.COLUMNS]
+        params = []
+        for log in logs:
+            values = (
+                log.notification_id, log.notification_type, log.user_id,
+                log.status, log.error, log.timestamp, log.timestamp
+            )
+            params.extend(
+                field.get_db_prep_save(value, connection) for field, value in zip(fields, values)
+            )
+
+        qn = connection.ops.quote_name
+        table = qn(NotificationCurrentStatus._meta.db_table)
+        columns = ', '.join(qn(field.column) for field in fields)
+        placeholders = ', '.join(['(' + ', '.join(['%s'] * len(fields)) + ')'] * len(logs))
+        sql = (
+            f"INSERT INTO {table} ({columns}) VALUES {placeholders} "
+            f"ON CONFLICT ({qn('notification_id')}, {qn('notification_type')}, {qn('user_id')}) DO UPDATE SET "
+            f"{qn('status')} = EXCLUDED.{qn('status')}, "
+            f"{qn('error')} = EXCLUDED.{qn('error')}, "
+            f"{qn('updated_at')} = EXCLUDED.{qn('updated_at')} "
+            f"WHERE {table}.{qn('status')} = %s AND EXCLUDED.{qn('status')} <> %s"
+        )
+        params.extend([NotificationStatus.PENDING.value, NotificationStatus.PENDING.value])
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+
+class StatusRollupService:
+    """
+    Maintains notification_status_hourly (hour x type x status) and
+    user_notification_daily (user x day x type x status) from the status log.
+    refresh() recounts every bucket from the watermark, less LATE_MINUTES,
+    onwards: reruns are idempotent, rows committed late by the write-behind
+    consumer are still counted, and older buckets are left alone, so they
+    outlive the raw rows once those are archived. Daily rows move by the
+    difference between the recount and the per-user hourly counts the
+    previous run stored for the same hours, so no run reads more of the log
+    than that window.
+    """
+    NAME = 'notification_status_rollups'
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def config():
+        return settings.NOTIFICATION_STATUS_ROLLUP
+
+    @classmethod
+    def watermark(cls):
+        return RollupWatermark.objects.filter(name=cls.NAME).values_list('position', flat=True).first()
+
+    @classmethod
+    def refresh(cls, now=None):
+        """Rebuild the rollups up to now; returns the start of the rebuilt range, or None if the log is empty."""
+        now = now or timezone.now()
+        with transaction.atomic():
+            RollupWatermark.objects.get_or_create(name=cls.NAME)
+            # Serializes concurrent refreshes
+            watermark = RollupWatermark.objects.select_for_update().get(name=cls.NAME)
+            if watermark.position is None:
+                start = NotificationStatusLog.objects.order_by('timestamp').values_list('timestamp', flat=True).first()
+            else:
+                start = watermark.position - timedelta(minutes=cls.config()['LATE_MINUTES'])
+
+            if start is not None:
+                start = start.astimezone(dt_timezone.utc)
+                hour = start.replace(minute=0, second=0, microsecond=0)
+                cls._rebuild_hourly(hour)
+                cls._rebuild_daily(hour)
+            watermark.position = now
+            watermark.save(update_fields=['position'])
+        return start
+
+    @classmethod
+    def _rebuild_hourly(cls, hour):
+        NotificationStatusHourly.objects.filter(hour__gte=hour).delete()
+        buckets = (
+            NotificationStatusLog.objects.filter(timestamp__gte=hour)
+            .annotate(bucket=Trunc('timestamp', 'hour', tzinfo=dt_timezone.utc))
+            .values('bucket', 'notification_type', 'status')
+            .annotate(rows=Count('id'))
+            .order_by()
+        )
+        NotificationStatusHourly.objects.bulk_create(
+            (
+                NotificationStatusHourly(
+                    hour=bucket['bucket'], notification_type=bucket['notification_type'],
+                    status=bucket['status'], count=bucket['rows']
+                )
+                for bucket in buckets
+            ),
+            batch_size=cls.BATCH_SIZE
+        )
+
+    @classmethod
+    def _rebuild_daily(cls, hour):
+        """Recount the per-user hours from `hour` on and move the daily rows by the difference."""
+        # Take back what the previous run counted for these hours
+        counted = UserNotificationHourly.objects.filter(
+            hour__gte=hour,
+            user_id=OuterRef('user_id'),
+            hour__date=OuterRef('day'),
+            notification_type=OuterRef('notification_type'),
+            status=OuterRef('status'),
+        )
+        total = counted.order_by().values('user_id').annotate(total=Sum('count')).values('total')
+        daily = UserNotificationDaily.objects.filter(Exists(counted), day__gte=hour.date())
+        with timezone.override(dt_timezone.utc):
+            daily.update(count=F('count') - Subquery(total))
+            daily.filter(count=0).delete()
+        # Hours before the window are never recounted, so only the daily rows keep
+        # their counts; the window's hours are stored again below
+        UserNotificationHourly.objects.all().delete()
+
+        buckets = (
+            NotificationStatusLog.objects.filter(timestamp__gte=hour)
+            .annotate(bucket=Trunc('timestamp', 'hour', tzinfo=dt_timezone.utc))
+            .values_list('user_id', 'bucket', 'notification_type', 'status')
+            .annotate(rows=Count('id'))
+            .order_by()
+        )
+        batch = []
+        for bucket in buckets.iterator(chunk_size=cls.BATCH_SIZE):
+            batch.append(bucket)
+            if len(batch) >= cls.BATCH_SIZE:
+                cls._add_hours(batch)
+                batch = []
+        if batch:
+            cls._add_hours(batch)
+
+    @classmethod
+    def _add_hours(cls, buckets):
+        """Store (user_id, hour, type, status, rows) buckets and add them to the daily rows."""
+        UserNotificationHourly.objects.bulk_create(
+            UserNotificationHourly(
+                user_id=user_id, hour=hour, notification_type=notification_type, status=status, count=rows
+            )
+            for user_id, hour, notification_type, status, rows in buckets
+        )
+        # One row per daily key, as a single upsert cannot touch a row twice
+        days = Counter()
+        for user_id, hour, notification_type, status, rows in buckets:
+            days[(user_id, hour.date(), notification_type, status)] += rows
+
+        fields = [
+            UserNotificationDaily._meta.get_field(name)
+            for name in ('user_id', 'day', 'notification_type', 'status', 'count')
+        ]
+        params = []
+        for key, rows in days.items():
+            params.extend(field.get_db_prep_save(value, connection) for field, value in zip(fields, (*key, rows)))
+
+        qn = connection.ops.quote_name
+        table = qn(UserNotificationDaily._meta.db_table)
+        columns = ', '.join(qn(field.column) for field in fields)
+        placeholders = ', '.join(['(' + ', '.join(['%s'] * len(fields)) + ')'] * len(days))
+        sql = (
+            f"INSERT INTO {table} ({columns}) VALUES {placeholders} "
+            f"ON CONFLICT ({qn('user_id')}, {qn('day')}, {qn('notification_type')}, {qn('status')}) DO UPDATE SET "
+            f"{qn('count')} = {table}.{qn('count')} + EXCLUDED.{qn('count')}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    @staticmethod
+    def summarize(buckets):
+        """Totals and delivery/failure rates per type from (type, status, count) rows."""
+        totals = {
+            notification_type: {status: 0 for status in NotificationStatus.values}
+            for notification_type in NotificationType.values
+        }
+        for notification_type, status, count in buckets:
+            totals[notification_type][status] += count
+        for counts in totals.values():
+            finished = counts[NotificationStatus.DELIVERED] + counts[NotificationStatus.FAILED]
+            counts['total'] = sum(counts[status] for status in NotificationStatus.values)
+            counts['delivery_rate'] = round(counts[NotificationStatus.DELIVERED] / finished, 4) if finished else None
+            counts['failure_rate'] = round(counts[NotificationStatus.FAILED] / finished, 4) if finished else None
+        return totals
+
+    @classmethod
+    def user_stats(cls, user_id, since, until, notification_type=None):
+        """Per-day counts and totals for one user over [since, until] (dates, inclusive)."""
+        queryset = UserNotificationDaily.objects.filter(user_id=user_id, day__gte=since, day__lte=until)
+        if notification_type:
+            queryset = queryset.filter(notification_type=notification_type)
+        rows = list(queryset.order_by('day', 'notification_type', 'status').values_list(
+            'day', 'notification_type', 'status', 'count'
+        ))
+        return cls._stats(rows, 'day')
+
+    @classmethod
+    def global_stats(cls, since, until, notification_type=None):
+        """Per-hour counts and totals across all users over [since, until] (dates, inclusive)."""
+        start = datetime(since.year, since.month, since.day, tzinfo=dt_timezone.utc)
+        end = datetime(until.year, until.month, until.day, tzinfo=dt_timezone.utc) + timedelta(days=1)
+        queryset = NotificationStatusHourly.objects.filter(hour__gte=start, hour__lt=end)
+        if notification_type:
+            queryset = queryset.filter(notification_type=notification_type)
+        rows = list(queryset.order_by('hour', 'notification_type', 'status').values_list(
+            'hour', 'notification_type', 'status', 'count'
+        ))
+        return cls._stats(rows, 'hour')
+
+    @classmethod
+    def _stats(cls, rows, bucket):
+        watermark = cls.watermark()
+        return {
+            "as_of": watermark.isoformat() if watermark else None,
+            "totals": cls.summarize(row[1:] for row in rows),
+            "series": [
+                {bucket: value.isoformat(), "notification_type": notification_type, "status": status, "count": count}
+                for value, notification_type, status, count in rows
+            ],
+        }
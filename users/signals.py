@@ -0,0 +1,33 @@
+# users/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import User, UserPreference, users_updated
+from .services import PrincipalCacheService, UserCacheService
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_principal_cache(sender, instance, **kwargs):
+    # Covers deactivation, push token and profile changes made through save()
+    PrincipalCacheService.invalidate(instance.pk)
+
+@receiver(post_save, sender=User)
+def invalidate_inactive_user_cache(sender, instance, **kwargs):
+    # Write paths refresh user:{id} themselves; only deactivation needs a purge
+    if not instance.is_active:
+        UserCacheService.invalidate_user(instance.pk)
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user_cache(sender, instance, **kwargs):
+    UserCacheService.invalidate_user(instance.pk)
+
+@receiver(users_updated, sender=User)
+def invalidate_updated_user_caches(sender, pks, **kwargs):
+    # queryset.update() paths (bulk deactivation, cleared push tokens) never
+    # refresh user:{id} themselves, so drop both entries
+    for pk in pks:
+        PrincipalCacheService.invalidate(pk)
+        UserCacheService.invalidate_user(pk)
+
+@receiver(post_save, sender=UserPreference)
+def invalidate_preference_user_cache(sender, instance, **kwargs):
+    UserCacheService.invalidate_user(instance.user_id)
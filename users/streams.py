@@ -0,0 +1,265 @@
+# users/streams.py
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import User, NotificationStatusLog
+from .services import CurrentStatusService
+
+logger = logging.getLogger(__name__)
+
+
+class RedisStreamBackend:
+    """Status events in a Redis stream, drained through a consumer group."""
+
+    def __init__(self, name, group, maxlen=None):
+        from django_redis import get_redis_connection
+
+        self.name = name
+        self.group = group
+        self.maxlen = maxlen
+        self.client = get_redis_connection('default')
+
+    def ensure_group(self):
+        from redis.exceptions import ResponseError
+
+        try:
+            self.client.xgroup_create(self.name, self.group, id='0', mkstream=True)
+        except ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    def add(self, payloads):
+        pipe = self.client.pipeline(transaction=False)
+        for payload in payloads:
+            pipe.xadd(self.name, {'event': payload}, maxlen=self.maxlen, approximate=True)
+        return [entry_id.decode() for entry_id in pipe.execute()]
+
+    def read(self, consumer, count, block_ms=None, pending=False):
+        # pending=True re-reads entries delivered to this consumer but never acked
+        response = self.client.xreadgroup(
+            self.group, consumer, {self.name: '0' if pending else '>'},
+            count=count, block=None if pending else block_ms
+        )
+        if not response:
+            return []
+        return [
+            (entry_id.decode(), fields[b'event'].decode() if fields else None)
+            for entry_id, fields in response[0][1]
+        ]
+
+    def claim(self, consumer, count, min_idle_ms):
+        """Take over up to count entries other consumers read but left unacked for min_idle_ms."""
+        start, claimed = '0-0', []
+        while len(claimed) < count:
+            response = self.client.xautoclaim(
+                self.name, self.group, consumer, min_idle_ms, start_id=start, count=count - len(claimed)
+            )
+            start, messages = response[0], response[1]
+            claimed.extend(
+                (entry_id.decode(), fields[b'event'].decode() if fields else None)
+                for entry_id, fields in messages
+            )
+            # The cursor wraps to 0-0 once the whole pending list was scanned
+            if start in (b'0-0', '0-0'):
+                break
+        return claimed
+
+    def ack(self, entry_ids):
+        if entry_ids:
+            self.client.xack(self.name, self.group, *entry_ids)
+
+    def stats(self):
+        from redis.exceptions import ResponseError
+
+        try:
+            groups = self.client.xinfo_groups(self.name)
+        except ResponseError:
+            groups = []
+        group = next((g for g in groups if g['name'].decode() == self.group), {})
+        return {
+            'length': self.client.xlen(self.name),
+            'pending': group.get('pending', 0),
+            'lag': group.get('lag'),
+        }
+
+
+class InMemoryStreamBackend:
+    """Process-local stand-in for RedisStreamBackend, for tests and local runs."""
+    _streams = {}
+    _lock = threading.Lock()
+
+    def __init__(self, name, group, maxlen=None):
+        self.name = name
+        self.group = group
+        with self._lock:
+            self._state = self._streams.setdefault(name, {
+                'entries': OrderedDict(), 'sequence': 0, 'delivered': 0, 'pending': OrderedDict(), 'read_at': {}
+            })
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._streams.clear()
+
+    def ensure_group(self):
+        pass
+
+    def add(self, payloads):
+        entry_ids = []
+        with self._lock:
+            for payload in payloads:
+                self._state['sequence'] += 1
+                entry_id = f"0-{self._state['sequence']}"
+                self._state['entries'][entry_id] = payload
+                entry_ids.append(entry_id)
+        return entry_ids
+
+    def read(self, consumer, count, block_ms=None, pending=False):
+        with self._lock:
+            if pending:
+                ids = [i for i, owner in self._state['pending'].items() if owner == consumer][:count]
+            else:
+                ids = list(self._state['entries'])[self._state['delivered']:self._state['delivered'] + count]
+                self._state['delivered'] += len(ids)
+                for entry_id in ids:
+                    self._state['pending'][entry_id] = consumer
+                    self._state['read_at'][entry_id] = time.monotonic()
+            return [(entry_id, self._state['entries'][entry_id]) for entry_id in ids]
+
+    def claim(self, consumer, count, min_idle_ms):
+        with self._lock:
+            now = time.monotonic()
+            ids = [
+                entry_id for entry_id in self._state['pending']
+                if (now - self._state['read_at'].get(entry_id, 0)) * 1000 >= min_idle_ms
+            ][:count]
+            for entry_id in ids:
+                self._state['pending'][entry_id] = consumer
+                self._state['read_at'][entry_id] = now
+            return [(entry_id, self._state['entries'][entry_id]) for entry_id in ids]
+
+    def ack(self, entry_ids):
+        with self._lock:
+            for entry_id in entry_ids:
+                self._state['pending'].pop(entry_id, None)
+                self._state['read_at'].pop(entry_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'length': len(self._state['entries']),
+                'pending': len(self._state['pending']),
+                'lag': len(self._state['entries']) - self._state['delivered'],
+            }
+
+
+class NotificationStatusStream:
+    """
+    Write-behind buffer for NotificationStatusLog. Callbacks publish events
+    to the stream and return immediately; consume() turns a batch of
+    entries into one bulk_create and acks them only after the commit.
+    Entries that can never be written are logged and acked with the batch,
+    so one bad entry cannot hold back the stream.
+    """
+
+    @staticmethod
+    def config():
+        return settings.NOTIFICATION_STATUS_STREAM
+
+    @classmethod
+    def enabled(cls):
+        return cls.config()['ENABLED']
+
+    @classmethod
+    def get_backend(cls):
+        config = cls.config()
+        return import_string(config['BACKEND'])(
+            name=config['NAME'], group=config['GROUP'], maxlen=config['MAXLEN']
+        )
+
+    @classmethod
+    def publish(cls, user_id, events):
+        """Append validated events (dicts with notification_type plus serializer fields)."""
+        received_at = timezone.now().isoformat()
+        payloads = [
+            json.dumps({
+                'user_id': str(user_id),
+                'notification_id': event['notification_id'],
+                'notification_type': event['notification_type'],
+                'status': event['status'],
+                'error': event.get('error'),
+                'timestamp': received_at,
+            })
+            for event in events
+        ]
+        return cls.get_backend().add(payloads)
+
+    @classmethod
+    def log_id(cls, entry_id):
+        # Deterministic row id, so a batch redelivered after a crash between
+        # commit and ack is skipped by ignore_conflicts instead of duplicated
+        return uuid.uuid5(uuid.NAMESPACE_URL, f"{cls.config()['NAME']}/{entry_id}")
+
+    @classmethod
+    def to_log(cls, entry_id, payload):
+        """Unsaved log row for one entry; raises ValueError or ValidationError if it cannot be written."""
+        event = json.loads(payload)
+        if not isinstance(event, dict):
+            raise ValueError("event is not an object")
+        user_id = NotificationStatusLog._meta.get_field('user').target_field.to_python(event.get('user_id'))
+        if user_id is None:
+            raise ValueError("user_id is missing")
+        log = NotificationStatusLog(
+            id=cls.log_id(entry_id),
+            user_id=user_id,
+            notification_id=event.get('notification_id'),
+            notification_type=event.get('notification_type'),
+            status=event.get('status'),
+            error=event.get('error'),
+            timestamp=event.get('timestamp'),
+        )
+        # Same field rules as the table (lengths, choices, a parseable timestamp), without queries
+        log.clean_fields(exclude=['id', 'user'])
+        return log
+
+    @classmethod
+    def consume(cls, consumer, batch_size=None, block_ms=None, pending=False, claim_idle_ms=None, backend=None):
+        """
+        Drain one batch into notification_status_logs; returns entries processed.
+        pending=True re-reads this consumer's unacked entries; claim_idle_ms
+        takes over entries other consumers left unacked for that long instead.
+        """
+        config = cls.config()
+        backend = backend or cls.get_backend()
+        batch_size = batch_size or config['BATCH_SIZE']
+        if claim_idle_ms is not None:
+            entries = backend.claim(consumer, batch_size, claim_idle_ms)
+        else:
+            entries = backend.read(
+                consumer, batch_size, config['BLOCK_MS'] if block_ms is None else block_ms, pending=pending
+            )
+        if not entries:
+            return 0
+
+        logs = []
+        for entry_id, payload in entries:
+            try:
+                logs.append(cls.to_log(entry_id, payload))
+            except (TypeError, ValueError, ValidationError) as e:
+                logger.warning("Dropping malformed status stream entry %s: %s", entry_id, e)
+
+        existing = set(User.objects.filter(id__in={log.user_id for log in logs}).values_list('id', flat=True))
+        logs = [log for log in logs if log.user_id in existing]
+        with transaction.atomic():
+            NotificationStatusLog.objects.bulk_create(logs, ignore_conflicts=True)
+            CurrentStatusService.record(logs)
+        backend.ack([entry_id for entry_id, _ in entries])
+        return len(entries)
@@ -0,0 +1,146 @@
+# users/tests/test_archive.py
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from users.archive import ArchiveError, StatusLogArchive
+from users.models import User, NotificationStatusLog
+
+UTC = dt_timezone.utc
+
+
+class StatusLogArchiveTests(APITestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        archive = override_settings(NOTIFICATION_STATUS_ARCHIVE={
+            'DIR': self.directory, 'CHUNK_SIZE': 2, 'DELETE_BATCH_SIZE': 2, 'COMPRESS_LEVEL': 6,
+        })
+        archive.enable()
+        self.addCleanup(archive.disable)
+
+        self.user = User.objects.create_user(email="archive@example.com", password="testpass123", name="Archive")
+        self.before = datetime(2026, 4, 3, tzinfo=UTC)
+        # Two old days with both types, plus one row on the cutoff day that stays
+        for i, (day, hour, notification_type) in enumerate([
+            (1, 9, 'email'), (1, 10, 'push'), (1, 11, 'email'), (1, 23, 'email'),
+            (2, 0, 'push'), (2, 5, 'push'), (2, 7, 'push'), (3, 0, 'email'),
+        ]):
+            self.log(f"notif-{i}", notification_type, datetime(2026, 4, day, hour, tzinfo=UTC))
+
+    def log(self, notification_id, notification_type, timestamp):
+        log = NotificationStatusLog.objects.create(
+            notification_id=notification_id, user=self.user, notification_type=notification_type, status='delivered'
+        )
+        NotificationStatusLog.objects.filter(pk=log.pk).update(timestamp=timestamp)
+
+    def read(self, relative):
+        with gzip.open(f"{self.directory}/{relative}", 'rt') as fh:
+            return [json.loads(line) for line in fh]
+
+    def test_archive_writes_day_and_type_files_then_deletes(self):
+        """Test expired rows land in per-day, per-type files and leave the table"""
+        archived = list(StatusLogArchive.archive(self.before))
+
+        self.assertEqual(
+            [(a.day.day, a.notification_type, a.rows, a.deleted) for a in archived],
+            [(1, 'email', 3, 3), (1, 'push', 1, 1), (2, 'push', 3, 3)],
+        )
+        email = self.read('2026-04-01/email.ndjson.gz')
+        self.assertEqual([r['notification_id'] for r in email], ['notif-0', 'notif-2', 'notif-3'])
+        self.assertEqual(email[0]['user_id'], str(self.user.id))
+        self.assertEqual(email[0]['timestamp'], '2026-04-01T09:00:00+00:00')
+        self.assertEqual(list(NotificationStatusLog.objects.values_list('notification_id', flat=True)), ['notif-7'])
+
+    def test_rerun_over_same_day_adds_a_file(self):
+        """Test a later run never overwrites an earlier archive file"""
+        list(StatusLogArchive.archive(self.before))
+        self.log("late", 'email', datetime(2026, 4, 1, 12, tzinfo=UTC))
+        list(StatusLogArchive.archive(self.before))
+
+        self.assertEqual(len(self.read('2026-04-01/email.ndjson.gz')), 3)
+        self.assertEqual([r['notification_id'] for r in self.read('2026-04-01/email.1.ndjson.gz')], ['late'])
+
+    def test_count_mismatch_keeps_rows(self):
+        """Test a file that fails verification is removed and nothing is deleted"""
+        with mock.patch.object(StatusLogArchive, 'count_lines', return_value=0):
+            with self.assertRaises(ArchiveError):
+                list(StatusLogArchive.archive(self.before))
+
+        self.assertEqual(NotificationStatusLog.objects.count(), 8)
+        self.assertEqual(list(StatusLogArchive.files()), [])
+
+    def test_rows_committed_after_streaming_are_kept(self):
+        """Test a late row that missed the file is never deleted"""
+        write_day = StatusLogArchive.write_day
+
+        def write_then_commit_late_row(root, day, *args):
+            files = write_day(root, day, *args)
+            if day.day == 1:
+                self.log("late", 'email', datetime(2026, 4, 1, 23, 30, tzinfo=UTC))
+            return files
+
+        with mock.patch.object(StatusLogArchive, 'write_day', side_effect=write_then_commit_late_row):
+            archived = list(StatusLogArchive.archive(self.before))
+
+        self.assertEqual([(a.rows, a.deleted) for a in archived], [(3, 3), (1, 1), (3, 3)])
+        self.assertEqual(
+            sorted(NotificationStatusLog.objects.values_list('notification_id', flat=True)), ['late', 'notif-7']
+        )
+
+    def test_late_row_before_streamed_rows_stops_the_day(self):
+        """Test a late row stamped inside the streamed range fails verification and deletes nothing"""
+        write_day = StatusLogArchive.write_day
+
+        def write_then_commit_late_row(root, day, *args):
+            files = write_day(root, day, *args)
+            self.log("late", 'email', datetime(2026, 4, 1, 12, tzinfo=UTC))
+            return files
+
+        with mock.patch.object(StatusLogArchive, 'write_day', side_effect=write_then_commit_late_row):
+            with self.assertRaises(ArchiveError):
+                list(StatusLogArchive.archive(self.before))
+        self.assertEqual(NotificationStatusLog.objects.count(), 9)
+
+    def test_keep_leaves_rows(self):
+        """Test delete=False only writes the archive"""
+        archived = list(StatusLogArchive.archive(self.before, delete=False))
+        self.assertEqual(sum(a.rows for a in archived), 7)
+        self.assertEqual(NotificationStatusLog.objects.count(), 8)
+
+    def test_search(self):
+        """Test the reader finds a notification across files and honours filters"""
+        list(StatusLogArchive.archive(self.before))
+
+        self.assertEqual([r['notification_type'] for r in StatusLogArchive.search('notif-5')], ['push'])
+        self.assertEqual(list(StatusLogArchive.search('notif-5', notification_type='email')), [])
+        self.assertEqual(list(StatusLogArchive.search('notif-5', until=datetime(2026, 4, 1).date())), [])
+        self.assertEqual(list(StatusLogArchive.search('notif-')), [])
+
+    def test_commands(self):
+        """Test the archive and search commands end to end"""
+        now = self.before + timedelta(days=30, hours=6)
+        with mock.patch('users.archive.timezone.now', return_value=now):
+            out = StringIO()
+            call_command('archive_status_logs', '--days', '30', '--dry-run', stdout=out)
+            self.assertIn('Would archive 2026-04-02 push: 3 rows', out.getvalue())
+            self.assertEqual(NotificationStatusLog.objects.count(), 8)
+
+            call_command('archive_status_logs', '--days', '30', stdout=StringIO())
+        self.assertEqual(NotificationStatusLog.objects.count(), 1)
+
+        out = StringIO()
+        call_command('search_status_archive', 'notif-2', '--type', 'email', stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['notification_id'], 'notif-2')
+
+    @override_settings(NOTIFICATION_STATUS_PARTITIONS={'RETENTION_DAYS': 0})
+    def test_command_requires_days_without_retention(self):
+        """Test the command refuses to guess a cutoff when retention is off"""
+        with self.assertRaises(CommandError):
+            call_command('archive_status_logs', stdout=StringIO())
@@ -0,0 +1,56 @@
+# users/tests/test_authentication.py
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
+from users.authentication import JWTAuthentication, generate_jwt_token
+from users.models import User, UserPreference
+from users.services import PrincipalCacheService
+
+class PrincipalCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        PrincipalCacheService._local_cache().clear()
+        self.user = User.objects.create_user(
+            email="principal@example.com",
+            password="testpass123",
+            name="Principal User"
+        )
+        UserPreference.objects.create(user=self.user)
+        self.token = generate_jwt_token(self.user)
+
+    def authenticate(self):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return JWTAuthentication().authenticate(request)
+
+    def test_repeat_authentication_skips_database(self):
+        """Test second authentication is served from the principal cache"""
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate()
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.email, "principal@example.com")
+
+    def test_deactivation_invalidates_principal(self):
+        """Test deactivated users are rejected once cached"""
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_queryset_deactivation_invalidates_principal(self):
+        """Test users deactivated through queryset.update() are rejected once cached"""
+        self.authenticate()
+        User.objects.filter(email__endswith="@example.com", is_active=True).update(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_last_login_update_keeps_principal(self):
+        """Test the login bookkeeping update leaves the principal cached"""
+        self.authenticate()
+        with self.assertNumQueries(1):
+            User.objects.filter(pk=self.user.pk).update(last_login=self.user.created_at)
+        with self.assertNumQueries(0):
+            self.authenticate()
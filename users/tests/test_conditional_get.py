@@ -0,0 +1,56 @@
+# users/tests/test_conditional_get.py
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference
+
+class ConditionalRetrieveTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="etag@example.com", password="testpass123", name="ETag")
+        self.preference = UserPreference.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+        self.url = f'/api/v1/users/{self.user.id}/'
+
+    def test_retrieve_sets_validators(self):
+        """Test retrieve returns a strong ETag and Last-Modified"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('Accept', response['Vary'])
+
+    def test_if_none_match_returns_304_from_cache(self):
+        """Test a matching If-None-Match is answered with an empty 304 without queries"""
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('Accept', response['Vary'])
+
+    def test_if_modified_since_returns_304(self):
+        """Test an up-to-date If-Modified-Since is answered with 304"""
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_preference_change_changes_etag(self):
+        """Test updating preferences invalidates the previous ETag"""
+        etag = self.client.get(self.url)['ETag']
+        self.preference.email = False
+        self.preference.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertFalse(response.data['data']['preferences']['email'])
+
+    def test_etag_depends_on_representation(self):
+        """Test JSON and msgpack responses carry different ETags"""
+        json_etag = self.client.get(self.url)['ETag']
+        msgpack_etag = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')['ETag']
+        self.assertNotEqual(json_etag, msgpack_etag)
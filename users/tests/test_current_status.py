@@ -0,0 +1,65 @@
+# users/tests/test_current_status.py
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference, NotificationStatusLog, NotificationCurrentStatus
+
+class CurrentStatusTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="current@example.com", password="testpass123", name="Current")
+        UserPreference.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+    def post_status(self, notification_id, status_value, error=None):
+        data = {"notification_id": notification_id, "status": status_value}
+        if error:
+            data["error"] = error
+        return self.client.post('/api/v1/email/status/', data, format='json')
+
+    def current(self, notification_id, notification_type='email'):
+        return self.client.get('/api/v1/status/current/', {'notification_id': notification_id, 'type': notification_type})
+
+    def test_transitions_are_monotonic_and_idempotent(self):
+        """Test pending moves to delivered, and retries never move it back"""
+        self.post_status("n-1", "pending")
+        self.assertEqual(self.current("n-1").data['data']['status'], "pending")
+
+        self.post_status("n-1", "delivered")
+        self.post_status("n-1", "delivered")
+        self.post_status("n-1", "pending")
+        self.post_status("n-1", "failed", error="late bounce")
+
+        self.assertEqual(self.current("n-1").data['data']['status'], "delivered")
+        self.assertEqual(NotificationCurrentStatus.objects.count(), 1)
+        self.assertEqual(NotificationStatusLog.objects.filter(notification_id="n-1").count(), 5)
+
+    def test_batch_collapses_to_latest_transition(self):
+        """Test a batch with several events for one notification upserts once"""
+        events = [
+            {"notification_id": "n-2", "notification_type": "push", "status": "pending"},
+            {"notification_id": "n-2", "notification_type": "push", "status": "failed", "error": "expired"},
+            {"notification_id": "n-2", "notification_type": "email", "status": "delivered"},
+        ]
+        self.client.post('/api/v1/status/batch/', {"events": events}, format='json')
+
+        response = self.current("n-2", 'push')
+        self.assertEqual(response.data['data']['status'], "failed")
+        self.assertEqual(response.data['data']['error'], "expired")
+        self.assertEqual(self.current("n-2", 'email').data['data']['status'], "delivered")
+
+    def test_unknown_notification(self):
+        """Test lookup of a notification with no callbacks"""
+        self.assertEqual(self.current("missing").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.current("n-1", 'sms').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_same_notification_id_is_kept_per_user(self):
+        """Test another user's callback for the same notification_id leaves this user's row alone"""
+        other = User.objects.create_user(email="current-other@example.com", password="testpass123", name="Other")
+        self.post_status("n-shared", "pending")
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(other)}')
+        self.post_status("n-shared", "failed", error="bounced")
+        self.assertEqual(self.current("n-shared").data['data']['status'], "failed")
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+        self.assertEqual(self.current("n-shared").data['data']['status'], "pending")
+        self.assertEqual(NotificationCurrentStatus.objects.filter(notification_id="n-shared").count(), 2)
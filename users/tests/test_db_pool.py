@@ -0,0 +1,97 @@
+# users/tests/test_db_pool.py
+import threading
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from users.db.pool import ConnectionPool, PoolTimeout, _pools, get_pool, params_key
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_released_connections_are_reused(self):
+        """Test a released connection is handed out again instead of opening a new one"""
+        pool = ConnectionPool(max_size=2)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        self.assertIs(pool.acquire(FakeConnection), first)
+        self.assertEqual((pool.stats()['opened'], pool.stats()['reused']), (1, 1))
+
+    def test_acquire_times_out_when_exhausted(self):
+        """Test callers wait at most timeout for a free slot"""
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.acquire(FakeConnection)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_waiter_gets_released_connection(self):
+        """Test a blocked caller proceeds once another thread releases"""
+        pool = ConnectionPool(max_size=1, timeout=2)
+        held = pool.acquire(FakeConnection)
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(pool.acquire(FakeConnection)))
+        waiter.start()
+        pool.release(held)
+        waiter.join()
+        self.assertEqual(result, [held])
+
+    def test_discarded_and_failed_connections_free_their_slot(self):
+        """Test discards and connect errors do not leak pool slots"""
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        connection = pool.acquire(FakeConnection)
+        pool.release(connection, discard=True)
+        self.assertTrue(connection.closed)
+
+        with self.assertRaises(RuntimeError):
+            pool.acquire(mock.Mock(side_effect=RuntimeError))
+        pool.acquire(FakeConnection)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_stale_idle_connection_is_checked(self):
+        """Test idle connections that fail the check are replaced"""
+        pool = ConnectionPool(max_size=1, check_after=0)
+        broken = pool.acquire(FakeConnection)
+        pool.release(broken)
+
+        replacement = pool.acquire(FakeConnection, check=mock.Mock(side_effect=RuntimeError))
+        self.assertIsNot(replacement, broken)
+        self.assertTrue(broken.closed)
+
+    def test_old_connections_are_recycled(self):
+        """Test connections past max_lifetime are closed rather than reused"""
+        pool = ConnectionPool(max_size=1, max_lifetime=0)
+        old = pool.acquire(FakeConnection)
+        pool.release(old)
+        self.assertIsNot(pool.acquire(FakeConnection), old)
+        self.assertTrue(old.closed)
+
+
+@override_settings(DB_POOL={'ENABLED': True, 'MAX_SIZE': 2, 'TIMEOUT': 1, 'MAX_LIFETIME': 1800, 'CHECK_AFTER': 30})
+class PoolRegistryTests(SimpleTestCase):
+    def tearDown(self):
+        _pools.pop('pool-test', None)
+
+    def test_changed_params_get_a_fresh_pool(self):
+        """Test changing NAME between acquires never hands out a connection to the old database"""
+        original = params_key({'dbname': 'user_service', 'host': 'db'})
+        test_db = params_key({'dbname': 'test_user_service', 'host': 'db'})
+
+        pool = get_pool('pool-test', original)
+        idle, borrowed = pool.acquire(FakeConnection), pool.acquire(FakeConnection)
+        pool.release(idle)
+        self.assertIs(get_pool('pool-test', original), pool)
+
+        fresh = get_pool('pool-test', test_db)
+        self.assertIsNot(fresh, pool)
+        self.assertTrue(idle.closed)
+        self.assertIsNot(fresh.acquire(FakeConnection), idle)
+
+        # Connections borrowed before the switch are closed when handed back
+        pool.release(borrowed)
+        self.assertTrue(borrowed.closed)
+        self.assertEqual(pool.stats()['idle'], 0)
@@ -0,0 +1,177 @@
+# users/tests/test_device_tokens.py
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference, DeviceToken
+from users.services import DeviceTokenService
+
+
+@override_settings(DEVICE_TOKENS={'MAX_PER_USER': 3, 'MAX_BATCH': 500, 'CACHE_TTL': 300})
+class DeviceTokenTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = self.make_user("devices@example.com")
+        self.other = self.make_user("other-devices@example.com")
+        self.authenticate(self.user)
+
+    def make_user(self, address):
+        user = User.objects.create_user(email=address, password="testpass123", name=address)
+        UserPreference.objects.create(user=user)
+        return user
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(user)}')
+
+    def register(self, *tokens):
+        return self.client.post('/api/v1/users/devices/', {
+            'devices': [{'token': token, 'platform': 'ios'} for token in tokens]
+        }, format='json')
+
+    def test_register_several_devices(self):
+        """Test a user keeps every registered device"""
+        response = self.register('tok-a', 'tok-b')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['registered'], 2)
+
+        response = self.client.get('/api/v1/users/devices/')
+        self.assertEqual({d['token'] for d in response.data['data']['devices']}, {'tok-a', 'tok-b'})
+        device = DeviceToken.objects.get(token='tok-a')
+        self.assertEqual(device.token_hash, DeviceTokenService.hash_token('tok-a'))
+
+    def test_reregistering_moves_token_to_new_owner(self):
+        """Test a token registered by another account changes owner instead of duplicating"""
+        DeviceTokenService.register(self.other.pk, [{'token': 'shared'}])
+        self.assertEqual(DeviceTokenService.get_tokens([self.other.pk])[str(self.other.pk)][0]['token'], 'shared')
+
+        self.register('shared')
+        self.assertEqual(DeviceToken.objects.get(token='shared').user_id, self.user.pk)
+        # The previous owner's cached list was invalidated
+        self.assertEqual(DeviceTokenService.get_tokens([self.other.pk])[str(self.other.pk)], [])
+
+    def test_oldest_devices_beyond_limit_are_dropped(self):
+        """Test only MAX_PER_USER most recently seen devices are kept"""
+        for token in ('tok-1', 'tok-2', 'tok-3', 'tok-4'):
+            DeviceTokenService.register(self.user.pk, [{'token': token}])
+        self.assertEqual(
+            set(DeviceToken.objects.filter(user=self.user).values_list('token', flat=True)),
+            {'tok-2', 'tok-3', 'tok-4'}
+        )
+
+    def test_unregister_only_touches_own_devices(self):
+        """Test unregister ignores tokens that belong to someone else"""
+        self.register('mine')
+        DeviceTokenService.register(self.other.pk, [{'token': 'theirs'}])
+
+        response = self.client.post('/api/v1/users/devices/unregister/', {'tokens': ['mine', 'theirs']}, format='json')
+        self.assertEqual(response.data['data']['removed'], 1)
+        self.assertEqual(list(DeviceToken.objects.values_list('token', flat=True)), ['theirs'])
+
+    def test_prune_is_staff_only_and_spans_users(self):
+        """Test staff can prune provider-rejected tokens across users"""
+        self.register('bad-1', 'good')
+        DeviceTokenService.register(self.other.pk, [{'token': 'bad-2'}])
+
+        response = self.client.post('/api/v1/users/devices/prune/', {'tokens': ['bad-1', 'bad-2']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.post('/api/v1/users/devices/prune/', {'tokens': ['bad-1', 'bad-2']}, format='json')
+        self.assertEqual(response.data['data']['pruned'], 2)
+        self.assertEqual(list(DeviceToken.objects.values_list('token', flat=True)), ['good'])
+
+    def test_lookup_is_staff_only_and_cached(self):
+        """Test fan-out lookups are limited to staff and served from cache after the first call"""
+        self.register('tok-a')
+        ids = [str(self.user.pk), str(self.other.pk)]
+        response = self.client.post('/api/v1/users/devices/lookup/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['error'], 'permission_denied')
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.post('/api/v1/users/devices/lookup/', {'ids': ids}, format='json')
+        self.assertEqual(response.data['data']['devices'], {
+            str(self.user.pk): [{'token': 'tok-a', 'platform': 'ios'}],
+            str(self.other.pk): [],
+        })
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(DeviceTokenService.get_tokens(ids)[str(self.other.pk)], [])
+        self.assertEqual(len(queries), 0)
+
+    def test_legacy_push_token_endpoint_registers_device(self):
+        """Test update_push_token also adds the device to the registry"""
+        response = self.client.patch(
+            f'/api/v1/users/{self.user.pk}/update_push_token/', {'push_token': 'legacy-tok'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(DeviceToken.objects.filter(user=self.user, token='legacy-tok').exists())
+
+    def test_legacy_push_token_must_be_a_string(self):
+        """Test a malformed push_token is rejected before anything is written"""
+        response = self.client.patch(
+            f'/api/v1/users/{self.user.pk}/update_push_token/', {'push_token': {'token': 'x'}}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'validation_failed')
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.push_token)
+        self.assertFalse(DeviceToken.objects.exists())
+
+    def test_legacy_push_token_rolls_back_with_registry(self):
+        """Test the legacy column is not updated when registering the device fails"""
+        with mock.patch.object(DeviceTokenService, 'register', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                self.client.patch(
+                    f'/api/v1/users/{self.user.pk}/update_push_token/', {'push_token': 'legacy-tok'}, format='json'
+                )
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.push_token)
+
+    def test_removed_tokens_leave_the_legacy_column(self):
+        """Test pruning or unregistering a token also clears users.push_token"""
+        for user, token in ((self.user, 'mine'), (self.other, 'theirs')):
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(user)}')
+            self.client.patch(f'/api/v1/users/{user.pk}/update_push_token/', {'push_token': token}, format='json')
+
+        self.client.post('/api/v1/users/devices/unregister/', {'tokens': ['theirs']}, format='json')
+        self.assertIsNone(self.client.get(f'/api/v1/users/{self.other.pk}/').data['data']['push_token'])
+        DeviceTokenService.prune(['mine'])
+
+        self.assertEqual(list(User.objects.filter(push_token__isnull=False)), [])
+        self.authenticate(self.user)
+        self.assertIsNone(self.client.get(f'/api/v1/users/{self.user.pk}/').data['data']['push_token'])
+
+    def test_profile_update_registers_push_token(self):
+        """Test a push_token written through PATCH /users/{id}/ is added to the registry"""
+        self.register('first-device')
+        response = self.client.patch(f'/api/v1/users/{self.user.pk}/', {'push_token': 'second-device'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(DeviceToken.objects.filter(user=self.user).values_list('token', flat=True)),
+            {'first-device', 'second-device'}
+        )
+
+    def test_registration_registers_push_token(self):
+        """Test a push_token given at sign-up is added to the registry"""
+        response = self.client.post('/api/v1/users/', {
+            'name': 'New', 'email': 'new-device@example.com', 'password': 'testpass123',
+            'push_token': 'signup-tok', 'preferences': {'email': True, 'push': True},
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(DeviceToken.objects.get(token='signup-tok').user.email, 'new-device@example.com')
+
+    def test_invalid_payload(self):
+        """Test empty lists and unknown platforms are rejected"""
+        response = self.client.post('/api/v1/users/devices/', {'devices': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            '/api/v1/users/devices/', {'devices': [{'token': 't', 'platform': 'pager'}]}, format='json'
+        )
+        self.assertEqual(response.data['error'], 'validation_failed')
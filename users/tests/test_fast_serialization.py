@@ -0,0 +1,73 @@
+# users/tests/test_fast_serialization.py
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from users.models import User, UserPreference, NotificationStatusLog
+from users.renderers import ORJSONRenderer
+from users.serializers import (
+    USER_VALUES, STATUS_LOG_VALUES, UserResponseSerializer, NotificationStatusSerializer,
+    user_row_data, status_log_row_data
+)
+
+class FastSerializationParityTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="fast@example.com",
+            password="testpass123",
+            name="Zoë   Fast",
+            push_token="token-123"
+        )
+        UserPreference.objects.create(user=self.user, email=False, push=True)
+        self.bare_user = User.objects.create_user(email="bare@example.com", password="testpass123", name="Bare")
+
+    def assertSameBytes(self, expected, actual):
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_user_row_matches_serializer(self):
+        """Test user_row_data renders exactly like UserResponseSerializer"""
+        for user in (self.user, self.bare_user):
+            row = User.objects.filter(id=user.id).values(*USER_VALUES).get()
+            self.assertSameBytes(UserResponseSerializer(user).data, user_row_data(row))
+
+    def test_status_log_row_matches_serializer(self):
+        """Test status_log_row_data renders exactly like NotificationStatusSerializer"""
+        NotificationStatusLog.objects.create(
+            user=self.user, notification_id="n-1", notification_type="email", status="failed", error="bounced"
+        )
+        NotificationStatusLog.objects.create(
+            user=self.user, notification_id="n-2", notification_type="push", status="delivered"
+        )
+        for log in NotificationStatusLog.objects.all():
+            row = NotificationStatusLog.objects.filter(id=log.id).values(*STATUS_LOG_VALUES).get()
+            self.assertSameBytes(NotificationStatusSerializer(log).data, status_log_row_data(row))
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        """Test ORJSONRenderer output is byte-for-byte identical to JSONRenderer"""
+        payloads = [
+            {"success": True, "message": "ok", "data": UserResponseSerializer(self.user).data},
+            {"success": False, "error": "validation_failed", "data": {"email": [ErrorDetail("Invalid", code="invalid")]}},
+            {"id": uuid.uuid4(), "at": datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc)},
+            {"lazy": gettext_lazy("Invalid credentials"), "separators": "  ", "unicode": "ñ ✓ \u2028 \u2029", "n": 1.5},
+            [1, None, 2 ** 70],
+        ]
+        for payload in payloads:
+            self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_orjson_renderer_float_differences(self):
+        """Test the documented float differences: compact exponents and null for non-finite values"""
+        self.assertEqual(ORJSONRenderer().render({"n": 1e16}), b'{"n":1e16}')
+        self.assertEqual(JSONRenderer().render({"n": 1e16}), b'{"n":1e+16}')
+        self.assertEqual(ORJSONRenderer().render({"n": float('nan'), "i": float('inf')}), b'{"n":null,"i":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({"n": float('nan')})
+
+    def test_orjson_renderer_honours_indent(self):
+        """Test indented requests fall back to the stock renderer"""
+        payload = {"a": [1, 2]}
+        self.assertEqual(
+            ORJSONRenderer().render(payload, 'application/json; indent=4'),
+            JSONRenderer().render(payload, 'application/json; indent=4')
+        )
@@ -0,0 +1,71 @@
+# users/tests/test_hash_pool.py
+import threading
+from unittest import mock
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.hash_pool import PasswordHashPool, PasswordHashPoolSaturated
+from users.models import User, UserPreference
+
+class PasswordHashPoolTests(SimpleTestCase):
+    def test_refuses_work_beyond_capacity(self):
+        """Test the pool rejects submissions once workers and queue are full"""
+        pool = PasswordHashPool(workers=1, queue_depth=1)
+        release = threading.Event()
+        running = [pool.submit(release.wait), pool.submit(release.wait)]
+
+        with self.assertRaises(PasswordHashPoolSaturated):
+            pool.submit(release.wait)
+        self.assertEqual(pool.stats()['in_flight'], 2)
+
+        release.set()
+        for future in running:
+            future.result()
+        self.assertEqual(pool.run(sum, [1, 2]), 3)
+        self.assertEqual(pool.stats()['in_flight'], 0)
+
+class AsyncAuthViewTests(APITestCase):
+    def test_async_register_and_login(self):
+        """Test the async endpoints mirror the DRF register/login responses"""
+        data = {
+            "name": "Async User",
+            "email": "async@example.com",
+            "password": "testpass123",
+            "preferences": {"email": True, "push": True}
+        }
+        response = self.client.post('/api/v1/auth/register/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn('token', response.json()['data'])
+        self.assertTrue(User.objects.get(email="async@example.com").check_password("testpass123"))
+
+        response = self.client.post(
+            '/api/v1/auth/login/', {"email": "async@example.com", "password": "testpass123"}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['user']['email'], "async@example.com")
+
+        response = self.client.post(
+            '/api/v1/auth/login/', {"email": "async@example.com", "password": "wrong-pass"}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_saturated_pool_returns_429(self):
+        """Test both login paths shed load when the hash pool is full"""
+        user = User.objects.create_user(email="busy@example.com", password="testpass123", name="Busy")
+        UserPreference.objects.create(user=user)
+        full_pool = PasswordHashPool(workers=1, queue_depth=0)
+        release = threading.Event()
+        blocker = full_pool.submit(release.wait)
+        credentials = {"email": "busy@example.com", "password": "testpass123"}
+
+        try:
+            with mock.patch('users.hash_pool.get_password_hash_pool', return_value=full_pool):
+                sync_response = self.client.post('/api/v1/users/login/', credentials, format='json')
+                async_response = self.client.post('/api/v1/auth/login/', credentials, format='json')
+        finally:
+            release.set()
+            blocker.result()
+
+        self.assertEqual(sync_response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(async_response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(async_response['Retry-After'], '1')
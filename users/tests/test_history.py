@@ -0,0 +1,50 @@
+# users/tests/test_history.py
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference, NotificationStatusLog
+
+class NotificationHistoryTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="history@example.com", password="testpass123", name="History")
+        UserPreference.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+        now = timezone.now()
+        for i in range(5):
+            log = NotificationStatusLog.objects.create(
+                notification_id=f"notif-{i}",
+                user=self.user,
+                notification_type='email' if i % 2 else 'push',
+                status='failed' if i == 3 else 'delivered',
+                error='bounced' if i == 3 else None
+            )
+            NotificationStatusLog.objects.filter(pk=log.pk).update(timestamp=now - timedelta(minutes=5 - i))
+
+    def collect(self, params):
+        ids, url = [], '/api/v1/status/history/'
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids += [log['notification_id'] for log in response.data['results']]
+            url, params = response.data['next'], None
+        return ids
+
+    def test_history_is_newest_first_across_pages(self):
+        """Test cursor pages walk the history newest first"""
+        self.assertEqual(self.collect({'page_size': 2}), [f"notif-{i}" for i in range(4, -1, -1)])
+
+    def test_history_filters(self):
+        """Test type, status and time window filters"""
+        self.assertEqual(self.collect({'type': 'email'}), ["notif-3", "notif-1"])
+        self.assertEqual(self.collect({'status': 'failed'}), ["notif-3"])
+        since = (timezone.now() - timedelta(minutes=2, seconds=30)).isoformat()
+        self.assertEqual(self.collect({'since': since}), ["notif-4", "notif-3"])
+
+    def test_count_only_when_requested(self):
+        """Test total count is opt-in"""
+        response = self.client.get('/api/v1/status/history/', {'include_count': 'true'})
+        self.assertEqual(response.data['count'], 5)
@@ -0,0 +1,43 @@
+# users/tests/test_login.py
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.models import User, UserPreference
+
+class LoginWritePathTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="lean@example.com", password="testpass123", name="Lean")
+        UserPreference.objects.create(user=self.user)
+        self.credentials = {"email": "lean@example.com", "password": "testpass123"}
+
+    def login(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/v1/users/login/', self.credentials, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+
+    def test_login_sets_last_login_with_narrow_update(self):
+        """Test login writes only last_login and leaves updated_at alone"""
+        updated_at = self.user.updated_at
+        updates = self.login()
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn('SET "last_login"', updates[0])
+        self.assertNotIn('"password"', updates[0])
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+        self.assertEqual(self.user.updated_at, updated_at)
+
+    def test_repeat_logins_are_coalesced(self):
+        """Test a second login inside the interval skips the write"""
+        self.login()
+        self.assertEqual(self.login(), [])
+
+    def test_every_login_recorded_when_interval_disabled(self):
+        """Test LAST_LOGIN_UPDATE_INTERVAL=0 writes on every login"""
+        with self.settings(LAST_LOGIN_UPDATE_INTERVAL=0):
+            self.login()
+            self.assertEqual(len(self.login()), 1)
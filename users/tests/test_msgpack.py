@@ -0,0 +1,51 @@
+# users/tests/test_msgpack.py
+import msgpack
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference, NotificationStatusLog
+
+class MessagePackNegotiationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="packed@example.com", password="testpass123", name="Packed")
+        UserPreference.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+    def post_packed(self, url, data):
+        return self.client.post(
+            url, msgpack.packb(data), content_type='application/msgpack', HTTP_ACCEPT='application/msgpack'
+        )
+
+    def test_retrieve_renders_msgpack(self):
+        """Test Accept: application/msgpack returns the same envelope as JSON"""
+        url = f'/api/v1/users/{self.user.id}/'
+        packed = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(packed.status_code, status.HTTP_200_OK)
+        self.assertEqual(packed['Content-Type'], 'application/msgpack')
+
+        body = msgpack.unpackb(packed.content)
+        self.assertEqual(body, self.client.get(url).json())
+        self.assertEqual(body['data']['email'], "packed@example.com")
+
+    def test_bulk_accepts_msgpack_body(self):
+        """Test the bulk lookup parses a msgpack request body"""
+        response = self.post_packed('/api/v1/users/bulk/', {"ids": [str(self.user.id)]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = msgpack.unpackb(response.content)
+        self.assertTrue(body['success'])
+        self.assertEqual([user['id'] for user in body['data']['users']], [str(self.user.id)])
+
+    def test_status_batch_accepts_msgpack_body(self):
+        """Test status batches can be posted as msgpack"""
+        events = [{"notification_id": "n-1", "notification_type": "push", "status": "delivered"}]
+        response = self.post_packed('/api/v1/status/batch/', {"events": events})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(msgpack.unpackb(response.content)['data']['created'], 1)
+        self.assertTrue(NotificationStatusLog.objects.filter(notification_id="n-1").exists())
+
+    def test_malformed_body_is_rejected(self):
+        """Test an undecodable msgpack body returns 400"""
+        response = self.client.post(
+            '/api/v1/users/bulk/', b'\xc1', content_type='application/msgpack', HTTP_ACCEPT='application/msgpack'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,136 @@
+# users/tests/test_partitions.py
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock, skipUnless
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference, NotificationStatusLog
+from users.partitions import Partition, StatusLogPartitions, advance, floor
+
+UTC = dt_timezone.utc
+PARTITIONS = {'INTERVAL': 'month', 'PREMAKE': 2, 'RETENTION_DAYS': 90, 'EXPIRED_ACTION': 'drop'}
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=UTC)
+
+
+class PartitionIntervalTests(APITestCase):
+    def test_floor(self):
+        """Test floor returns the start of the month, ISO week and day"""
+        moment = utc(2026, 10, 17, 13, 45, 10)
+        self.assertEqual(floor(moment, 'month'), utc(2026, 10, 1))
+        self.assertEqual(floor(moment, 'week'), utc(2026, 10, 12))
+        self.assertEqual(floor(moment, 'day'), utc(2026, 10, 17))
+
+    def test_advance(self):
+        """Test advance steps to the next interval across year ends"""
+        self.assertEqual(advance(utc(2026, 12, 1), 'month'), utc(2027, 1, 1))
+        self.assertEqual(advance(utc(2026, 1, 31), 'month'), utc(2026, 2, 1))
+        self.assertEqual(advance(utc(2026, 12, 28), 'week'), utc(2027, 1, 4))
+        self.assertEqual(advance(utc(2026, 12, 31), 'day'), utc(2027, 1, 1))
+
+
+@override_settings(NOTIFICATION_STATUS_PARTITIONS=PARTITIONS)
+class PartitionMaintenanceTests(APITestCase):
+    existing = [
+        Partition('notification_status_logs_legacy', None, utc(2026, 6, 1)),
+        Partition('notification_status_logs_p202606', utc(2026, 6, 1), utc(2026, 7, 1)),
+        Partition('notification_status_logs_p202607', utc(2026, 7, 1), utc(2026, 8, 1)),
+        Partition('notification_status_logs_p202608', utc(2026, 8, 1), utc(2026, 9, 1)),
+    ]
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(StatusLogPartitions, 'supported', return_value=True),
+            mock.patch.object(StatusLogPartitions, 'list', return_value=self.existing),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_ensure_continues_from_newest_partition(self):
+        """Test ensure fills the gap up to the premake horizon"""
+        created = StatusLogPartitions.ensure(now=utc(2026, 10, 17), dry_run=True)
+        self.assertEqual([p.name for p in created], [
+            'notification_status_logs_p202609',
+            'notification_status_logs_p202610',
+            'notification_status_logs_p202611',
+            'notification_status_logs_p202612',
+        ])
+        self.assertEqual(created[-1].end, utc(2027, 1, 1))
+
+    def test_expire_selects_partitions_older_than_retention(self):
+        """Test only partitions ending before the retention cutoff expire"""
+        expired = StatusLogPartitions.expire(now=utc(2026, 10, 17), dry_run=True)
+        self.assertEqual([p.name for p in expired], [
+            'notification_status_logs_legacy',
+            'notification_status_logs_p202606',
+        ])
+
+    @override_settings(NOTIFICATION_STATUS_PARTITIONS={**PARTITIONS, 'RETENTION_DAYS': 0})
+    def test_expire_keeps_everything_without_retention(self):
+        """Test RETENTION_DAYS=0 never expires partitions"""
+        self.assertEqual(StatusLogPartitions.expire(now=utc(2030, 1, 1), dry_run=True), [])
+
+    def test_command_dry_run(self):
+        """Test the command reports planned work without running DDL"""
+        out = StringIO()
+        with mock.patch('users.partitions.connection.cursor') as cursor:
+            call_command('manage_status_partitions', '--dry-run', stdout=out)
+        cursor.assert_not_called()
+        self.assertIn('Would create notification_status_logs_p202609', out.getvalue())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'notification_status_logs is only partitioned on PostgreSQL')
+@override_settings(NOTIFICATION_STATUS_PARTITIONS=PARTITIONS)
+class DefaultPartitionTests(APITestCase):
+    def test_rows_past_newest_partition_move_out_of_default(self):
+        """Test rows past the newest range land in DEFAULT and ensure moves them to their partition"""
+        newest = StatusLogPartitions.list()[-1].end
+        user = User.objects.create_user(email="default@example.com", password="testpass123", name="Default")
+        log = NotificationStatusLog.objects.create(
+            notification_id='late', user=user, notification_type='email', status='delivered'
+        )
+        NotificationStatusLog.objects.filter(pk=log.pk).update(timestamp=newest + timedelta(days=3))
+        self.assertEqual(StatusLogPartitions.default_rows(), 1)
+
+        created = StatusLogPartitions.ensure(now=newest, premake=0)
+        self.assertEqual([p.start for p in created], [newest])
+        self.assertEqual(StatusLogPartitions.default_rows(), 0)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT tableoid::regclass::text FROM notification_status_logs WHERE id = %s', [log.pk])
+            self.assertEqual(cursor.fetchone()[0], created[0].name)
+
+
+@override_settings(NOTIFICATION_STATUS_PARTITIONS=PARTITIONS)
+class HistoryRetentionTests(APITestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="retention@example.com", password="testpass123", name="Retention")
+        UserPreference.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(user)}')
+        for notification_id, age in (('recent', 1), ('expired', 91)):
+            log = NotificationStatusLog.objects.create(
+                notification_id=notification_id, user=user, notification_type='email', status='delivered'
+            )
+            NotificationStatusLog.objects.filter(pk=log.pk).update(timestamp=timezone.now() - timedelta(days=age))
+
+    def history_ids(self):
+        response = self.client.get('/api/v1/status/history/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [log['notification_id'] for log in response.data['results']]
+
+    def test_history_hides_rows_past_retention(self):
+        """Test history skips rows older than the retention window"""
+        with mock.patch.object(StatusLogPartitions, 'supported', return_value=True):
+            self.assertEqual(self.history_ids(), ['recent'])
+
+    def test_unpartitioned_history_keeps_everything(self):
+        """Test backends without partitions, which never expire rows, show the full history"""
+        with mock.patch.object(StatusLogPartitions, 'supported', return_value=False):
+            self.assertEqual(self.history_ids(), ['recent', 'expired'])
@@ -0,0 +1,52 @@
+# users/tests/test_password_hashing.py
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from users.models import User
+
+TUNED_PBKDF2 = ['users.hashers.TunedPBKDF2PasswordHasher']
+
+def pbkdf2_settings(iterations):
+    return {
+        'ALGORITHM': 'pbkdf2',
+        'PBKDF2_ITERATIONS': iterations,
+        'ARGON2_TIME_COST': 2,
+        'ARGON2_MEMORY_COST': 102400,
+        'ARGON2_PARALLELISM': 8,
+        'BCRYPT_ROUNDS': 12,
+    }
+
+class RegistrationWriteTests(APITestCase):
+    def test_registration_is_a_single_user_write(self):
+        """Test signup inserts the user once and never re-saves it"""
+        data = {
+            "name": "Single Write",
+            "email": "single@example.com",
+            "password": "testpass123",
+            "preferences": {"email": True, "push": False}
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/v1/users/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        user_writes = [
+            q['sql'] for q in queries.captured_queries
+            if q['sql'].startswith(('INSERT INTO "users"', 'UPDATE "users"'))
+        ]
+        self.assertEqual(len(user_writes), 1)
+        self.assertTrue(User.objects.get(email="single@example.com").check_password("testpass123"))
+
+@override_settings(PASSWORD_HASHERS=TUNED_PBKDF2)
+class TunedHasherTests(TestCase):
+    def test_iterations_follow_settings_and_upgrade_on_check(self):
+        """Test a hash with stale iterations verifies and is re-hashed"""
+        with self.settings(PASSWORD_HASHING=pbkdf2_settings(1000)):
+            encoded = make_password("secret-pass")
+        self.assertIn("$1000$", encoded)
+
+        upgraded = []
+        with self.settings(PASSWORD_HASHING=pbkdf2_settings(2000)):
+            self.assertTrue(check_password("secret-pass", encoded, setter=upgraded.append))
+        self.assertEqual(upgraded, ["secret-pass"])
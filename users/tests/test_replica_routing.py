@@ -0,0 +1,86 @@
+# users/tests/test_replica_routing.py
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference, NotificationStatusLog
+from users.routers import PRIMARY, _reads, use_replica
+from users.services import PrincipalCacheService, UserCacheService
+from users.views import UserViewSet
+
+@override_settings(DATABASE_REPLICA={**settings.DATABASE_REPLICA, 'ENABLED': True})
+class ReplicaRoutingTests(APITransactionTestCase):
+    # Rows must be committed to be visible through the replica connection
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        PrincipalCacheService._local_cache().clear()
+        self.user = User.objects.create_user(email="replica@example.com", password="testpass123", name="Replica")
+        UserPreference.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+    def capture(self):
+        return CaptureQueriesContext(connections['default']), CaptureQueriesContext(connections['replica'])
+
+    def test_list_and_history_read_from_replica(self):
+        """Test list and history queries run on the replica alias"""
+        NotificationStatusLog.objects.create(
+            user=self.user, notification_id="n-1", notification_type="email", status="delivered"
+        )
+        primary, replica = self.capture()
+        with primary, replica:
+            self.assertEqual(self.client.get('/api/v1/users/').status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get('/api/v1/status/history/').status_code, status.HTTP_200_OK)
+        self.assertEqual(len(primary.captured_queries), 0)
+        self.assertGreater(len(replica.captured_queries), 0)
+
+    def test_writes_stay_on_primary(self):
+        """Test update_push_token writes and re-reads on the primary"""
+        primary, replica = self.capture()
+        with primary, replica:
+            response = self.client.patch(
+                f'/api/v1/users/{self.user.id}/update_push_token/', {"push_token": "token"}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(primary.captured_queries), 0)
+        self.assertEqual(len(replica.captured_queries), 0)
+
+    def test_first_write_pins_later_reads(self):
+        """Test reads after a write in the same scope go to the primary"""
+        with use_replica():
+            self.assertEqual(User.objects.all().db, 'replica')
+            self.user.name = "Pinned"
+            self.user.save()
+            self.assertEqual(User.objects.all().db, 'default')
+
+    def test_recently_written_user_reloads_from_primary(self):
+        """Test a cache reload right after a write reads the primary"""
+        UserCacheService.invalidate_user(self.user.id)
+        primary, replica = self.capture()
+        with use_replica(), primary, replica:
+            self.assertEqual(UserCacheService.get_user(self.user.id)['email'], "replica@example.com")
+        self.assertEqual(len(replica.captured_queries), 0)
+        self.assertEqual(len(primary.captured_queries), 1)
+
+    def test_cache_miss_reads_replica(self):
+        """Test cache misses for users not written recently use the replica"""
+        cache.clear()
+        primary, replica = self.capture()
+        with use_replica(), primary, replica:
+            self.assertIsNotNone(UserCacheService.get_user(self.user.id))
+        self.assertEqual(len(primary.captured_queries), 0)
+        self.assertEqual(len(replica.captured_queries), 1)
+
+    def test_unhandled_error_leaves_replica_scope(self):
+        """Test an exception escaping the view does not leave the thread reading the replica"""
+        with mock.patch.object(UserViewSet, 'list', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                self.client.get('/api/v1/users/')
+        self.assertEqual(_reads.get(), PRIMARY)
+        self.assertEqual(User.objects.all().db, 'default')
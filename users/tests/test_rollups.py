@@ -0,0 +1,151 @@
+# users/tests/test_rollups.py
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import (
+    User, UserPreference, NotificationStatusLog, NotificationStatusHourly, UserNotificationDaily,
+    UserNotificationHourly,
+)
+from users.services import StatusRollupService
+
+UTC = dt_timezone.utc
+
+
+@override_settings(NOTIFICATION_STATUS_ROLLUP={'LATE_MINUTES': 60, 'MAX_RANGE_DAYS': 31})
+class StatusRollupTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="rollup@example.com", password="testpass123", name="Rollup")
+        self.other = User.objects.create_user(email="other@example.com", password="testpass123", name="Other")
+        UserPreference.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+        for user, notification_type, status_value, timestamp in [
+            (self.user, 'email', 'delivered', datetime(2026, 10, 15, 9, 5, tzinfo=UTC)),
+            (self.user, 'email', 'delivered', datetime(2026, 10, 15, 9, 50, tzinfo=UTC)),
+            (self.user, 'email', 'failed', datetime(2026, 10, 15, 10, 0, tzinfo=UTC)),
+            (self.user, 'push', 'pending', datetime(2026, 10, 16, 8, 0, tzinfo=UTC)),
+            (self.other, 'email', 'delivered', datetime(2026, 10, 15, 9, 30, tzinfo=UTC)),
+        ]:
+            self.log(user, notification_type, status_value, timestamp)
+
+    def log(self, user, notification_type, status_value, timestamp):
+        log = NotificationStatusLog.objects.create(
+            notification_id=f"notif-{timestamp:%d%H%M}", user=user,
+            notification_type=notification_type, status=status_value,
+            error='bounced' if status_value == 'failed' else None
+        )
+        NotificationStatusLog.objects.filter(pk=log.pk).update(timestamp=timestamp)
+
+    def test_refresh_builds_hourly_and_daily_buckets(self):
+        """Test the first refresh counts the whole log per hour and per user day"""
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, tzinfo=UTC))
+
+        hourly = {
+            (row.hour.hour, row.notification_type, row.status): row.count
+            for row in NotificationStatusHourly.objects.all()
+        }
+        self.assertEqual(hourly, {
+            (9, 'email', 'delivered'): 3, (10, 'email', 'failed'): 1, (8, 'push', 'pending'): 1,
+        })
+        daily = UserNotificationDaily.objects.get(user=self.user, day=date(2026, 10, 15), status='delivered')
+        self.assertEqual(daily.count, 2)
+
+    def test_refresh_is_idempotent_and_counts_late_rows(self):
+        """Test reruns recount the late window without double counting"""
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, tzinfo=UTC))
+        # Committed after the first run but stamped inside the late window
+        self.log(self.user, 'push', 'delivered', datetime(2026, 10, 16, 11, 30, tzinfo=UTC))
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, 5, tzinfo=UTC))
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, 6, tzinfo=UTC))
+
+        self.assertEqual(NotificationStatusHourly.objects.get(hour__day=15, hour__hour=9).count, 3)
+        self.assertEqual(
+            UserNotificationDaily.objects.get(user=self.user, day=date(2026, 10, 16), status='delivered').count, 1
+        )
+
+    def test_daily_refresh_only_reads_the_late_window(self):
+        """Test daily rows earlier in the day are kept without rereading their raw rows"""
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, tzinfo=UTC))
+        # Outside the next window (11:00 onwards), so a recount since midnight would lose it
+        NotificationStatusLog.objects.filter(notification_type='push').delete()
+        self.log(self.user, 'push', 'pending', datetime(2026, 10, 16, 11, 40, tzinfo=UTC))
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, 5, tzinfo=UTC))
+
+        self.assertEqual(
+            UserNotificationDaily.objects.get(user=self.user, day=date(2026, 10, 16), status='pending').count, 2
+        )
+        self.assertEqual(
+            list(UserNotificationHourly.objects.values_list('hour', 'count')),
+            [(datetime(2026, 10, 16, 11, tzinfo=UTC), 1)]
+        )
+
+    def test_rows_gone_from_the_window_are_taken_back(self):
+        """Test a recount that finds fewer rows lowers the daily row, dropping it at zero"""
+        self.log(self.user, 'push', 'delivered', datetime(2026, 10, 16, 11, 30, tzinfo=UTC))
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, tzinfo=UTC))
+        NotificationStatusLog.objects.filter(status='delivered', notification_type='push').delete()
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, 5, tzinfo=UTC))
+
+        self.assertFalse(UserNotificationDaily.objects.filter(day=date(2026, 10, 16), status='delivered').exists())
+        self.assertEqual(
+            UserNotificationDaily.objects.get(user=self.user, day=date(2026, 10, 15), status='delivered').count, 2
+        )
+
+    def test_buckets_outlive_archived_rows(self):
+        """Test buckets older than the late window survive deletion of their rows"""
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, tzinfo=UTC))
+        NotificationStatusLog.objects.filter(timestamp__lt=datetime(2026, 10, 16, tzinfo=UTC)).delete()
+        StatusRollupService.refresh(now=datetime(2026, 10, 16, 12, 5, tzinfo=UTC))
+
+        self.assertEqual(NotificationStatusHourly.objects.get(hour__day=15, hour__hour=9).count, 3)
+
+    def test_user_stats_endpoint(self):
+        """Test stats answer from the current user's daily rollups"""
+        call_command('rollup_status_logs', stdout=StringIO())
+        response = self.client.get('/api/v1/status/stats/', {'since': '2026-10-15', 'until': '2026-10-16'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual(data['scope'], 'user')
+        self.assertIsNotNone(data['as_of'])
+        email = data['totals']['email']
+        self.assertEqual((email['delivered'], email['failed'], email['total']), (2, 1, 3))
+        self.assertEqual(email['delivery_rate'], 0.6667)
+        self.assertIsNone(data['totals']['push']['failure_rate'])
+        self.assertEqual(data['series'][0], {
+            'day': '2026-10-15', 'notification_type': 'email', 'status': 'delivered', 'count': 2
+        })
+
+    def test_global_stats_require_staff(self):
+        """Test global stats are hourly, across users and staff only"""
+        call_command('rollup_status_logs', stdout=StringIO())
+        params = {'scope': 'global', 'since': '2026-10-15', 'until': '2026-10-15', 'type': 'email'}
+
+        response = self.client.get('/api/v1/status/stats/', params)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['error'], 'permission_denied')
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get('/api/v1/status/stats/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['totals']['email']['delivered'], 3)
+        self.assertEqual(response.data['data']['series'][0]['hour'], '2026-10-15T09:00:00+00:00')
+
+    def test_stats_range_is_bounded(self):
+        """Test reversed or oversized ranges are rejected"""
+        for params in ({'since': '2026-10-16', 'until': '2026-10-15'}, {'since': '2026-01-01', 'until': '2026-10-15'}):
+            response = self.client.get('/api/v1/status/stats/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['error'], 'validation_failed')
+
+    def test_default_range_ends_today(self):
+        """Test stats default to the last seven days"""
+        response = self.client.get('/api/v1/status/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        until = date.fromisoformat(response.data['data']['until'])
+        self.assertEqual(date.fromisoformat(response.data['data']['since']), until - timedelta(days=6))
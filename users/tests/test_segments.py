@@ -0,0 +1,70 @@
+# users/tests/test_segments.py
+import json
+from io import StringIO
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference
+from users.services import DeviceTokenService
+
+class SegmentExportTests(APITestCase):
+    def setUp(self):
+        self.emailable = self.make_user("emailable@example.com", email=True, push=False)
+        self.pushable = self.make_user("pushable@example.com", email=False, push=True, push_token="tok-1")
+        self.make_user("no-token@example.com", email=False, push=True)
+        inactive = self.make_user("inactive@example.com", email=True, push=True, push_token="tok-2")
+        inactive.is_active = False
+        inactive.save()
+        self.staff = self.make_user("staff@example.com", email=False, push=False)
+        self.staff.is_staff = True
+        self.staff.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.staff)}')
+
+    def make_user(self, address, email, push, push_token=None):
+        user = User.objects.create_user(email=address, password="testpass123", name=address, push_token=push_token)
+        UserPreference.objects.create(user=user, email=email, push=push)
+        if push_token:
+            DeviceTokenService.register(user.pk, [{'token': push_token}])
+        return user
+
+    def test_email_segment_ndjson(self):
+        """Test email segment streams only active, email-enabled users"""
+        response = self.client.get('/api/v1/users/segment/', {'segment': 'email'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['email'] for row in rows], ["emailable@example.com"])
+
+    def test_push_segment_csv(self):
+        """Test push segment requires a push token and renders CSV"""
+        response = self.client.get('/api/v1/users/segment/', {'segment': 'push', 'output': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,email,name,push_token")
+        self.assertEqual(lines[1:], [f"{self.pushable.id},pushable@example.com,pushable@example.com,tok-1"])
+
+    def test_segment_is_staff_only(self):
+        """Test a regular account cannot export recipients"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.emailable)}')
+        response = self.client.get('/api/v1/users/segment/', {'segment': 'email'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['error'], 'permission_denied')
+
+    def test_push_segment_has_a_row_per_device(self):
+        """Test devices registered without the legacy column are exported, pruned ones are not"""
+        DeviceTokenService.register(self.pushable.pk, [{'token': 'tok-3'}, {'token': 'tok-4'}])
+        DeviceTokenService.prune(['tok-1', 'tok-4'])
+        response = self.client.get('/api/v1/users/segment/', {'segment': 'push'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['push_token'] for row in rows], ['tok-3'])
+
+    def test_invalid_segment(self):
+        """Test unknown segments are rejected"""
+        response = self.client.get('/api/v1/users/segment/', {'segment': 'sms'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_segment_command(self):
+        """Test management command streams the same rows"""
+        out = StringIO()
+        call_command('export_segment', 'email', '--chunk-size', '1', stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['id'], str(self.emailable.id))
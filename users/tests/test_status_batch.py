@@ -0,0 +1,53 @@
+# users/tests/test_status_batch.py
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference, NotificationStatusLog
+
+class NotificationStatusBatchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="worker@example.com", password="testpass123", name="Worker")
+        UserPreference.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+    def test_batch_reports_per_item_results(self):
+        """Test valid events are inserted and invalid ones reported by index"""
+        events = [
+            {"notification_id": "n-1", "notification_type": "email", "status": "delivered"},
+            {"notification_id": "n-2", "notification_type": "push", "status": "failed", "error": "expired token"},
+            {"notification_id": "n-3", "notification_type": "push", "status": "failed"},
+            {"notification_id": "n-4", "notification_type": "sms", "status": "delivered"},
+            {"notification_type": "email", "status": "pending"},
+        ]
+        response = self.client.post('/api/v1/status/batch/', {"events": events}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+
+        data = response.data['data']
+        self.assertEqual((data['created'], data['failed']), (2, 3))
+        self.assertEqual(
+            [result.get('error') for result in data['results']],
+            [None, None, "missing_error", "invalid_notification_type", "validation_failed"]
+        )
+        self.assertEqual(
+            sorted(NotificationStatusLog.objects.values_list('notification_id', 'notification_type')),
+            [("n-1", "email"), ("n-2", "push")]
+        )
+
+    def test_batch_all_valid(self):
+        """Test a fully valid batch returns 201"""
+        events = [{"notification_id": f"n-{i}", "notification_type": "email", "status": "delivered"} for i in range(3)]
+        response = self.client.post('/api/v1/status/batch/', {"events": events}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(NotificationStatusLog.objects.count(), 3)
+
+    def test_batch_rejects_empty_payload(self):
+        """Test missing or empty events list is rejected"""
+        response = self.client.post('/api/v1/status/batch/', {"events": []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_single_endpoint_shares_rules(self):
+        """Test the single callback endpoint applies the same validation"""
+        response = self.client.post('/api/v1/push/status/', {"notification_id": "n-1", "status": "failed"}, format='json')
+        self.assertEqual(response.data['error'], "missing_error")
+        response = self.client.post('/api/v1/push/status/', {"notification_id": "n-1", "status": "delivered"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,112 @@
+# users/tests/test_status_stream.py
+import json
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference, NotificationStatusLog
+from users.streams import InMemoryStreamBackend, NotificationStatusStream
+
+STREAM = {
+    **settings.NOTIFICATION_STATUS_STREAM,
+    'ENABLED': True,
+    'BACKEND': 'users.streams.InMemoryStreamBackend',
+    'BATCH_SIZE': 2,
+}
+
+@override_settings(NOTIFICATION_STATUS_STREAM=STREAM)
+class NotificationStatusStreamTests(APITestCase):
+    def setUp(self):
+        InMemoryStreamBackend.reset()
+        self.user = User.objects.create_user(email="stream@example.com", password="testpass123", name="Stream")
+        UserPreference.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+    def test_callbacks_are_buffered_then_consumed(self):
+        """Test status callbacks return 202 and land in the log after consuming"""
+        response = self.client.post('/api/v1/email/status/', {"notification_id": "n-1", "status": "delivered"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        events = [
+            {"notification_id": "n-2", "notification_type": "push", "status": "pending"},
+            {"notification_id": "n-3", "notification_type": "push", "status": "failed", "error": "gone"},
+        ]
+        response = self.client.post('/api/v1/status/batch/', {"events": events}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(NotificationStatusLog.objects.exists())
+
+        out = StringIO()
+        call_command('consume_status_stream', '--once', stdout=out)
+        self.assertIn('processed=3', out.getvalue())
+        self.assertIn('pending=0', out.getvalue())
+        self.assertEqual(
+            sorted(NotificationStatusLog.objects.values_list('notification_id', 'notification_type', 'status')),
+            [("n-1", "email", "delivered"), ("n-2", "push", "pending"), ("n-3", "push", "failed")]
+        )
+
+    def test_redelivered_entries_are_not_duplicated(self):
+        """Test a batch read again before ack is written once"""
+        NotificationStatusStream.publish(self.user.pk, [
+            {"notification_id": "n-1", "notification_type": "email", "status": "delivered"}
+        ])
+        backend = NotificationStatusStream.get_backend()
+        entries = backend.read('worker-1', 10)
+        # Simulate a crash after commit but before ack
+        backend._state['pending'] = {entry_id: 'worker-1' for entry_id, _ in entries}
+        NotificationStatusStream.consume('worker-1', pending=True, backend=backend)
+        backend._state['pending'] = {entry_id: 'worker-1' for entry_id, _ in entries}
+        NotificationStatusStream.consume('worker-1', pending=True, backend=backend)
+
+        self.assertEqual(NotificationStatusLog.objects.count(), 1)
+        self.assertEqual(backend.stats()['pending'], 0)
+
+    def test_entries_of_a_crashed_consumer_are_claimed(self):
+        """Test entries read by a consumer that died are written by another one"""
+        NotificationStatusStream.publish(self.user.pk, [
+            {"notification_id": "n-1", "notification_type": "email", "status": "delivered"},
+            {"notification_id": "n-2", "notification_type": "push", "status": "failed", "error": "gone"},
+        ])
+        backend = NotificationStatusStream.get_backend()
+        backend.read('worker-a', 10)  # worker-a dies before writing or acking
+
+        call_command('consume_status_stream', '--once', '--consumer', 'worker-b', '--claim-idle-ms', '0', stdout=StringIO())
+        self.assertEqual(
+            sorted(NotificationStatusLog.objects.values_list('notification_id', flat=True)), ['n-1', 'n-2']
+        )
+        self.assertEqual(backend.stats()['pending'], 0)
+
+    def test_recently_read_entries_are_not_claimed(self):
+        """Test entries read less than CLAIM_IDLE_MS ago stay with their consumer"""
+        NotificationStatusStream.publish(self.user.pk, [
+            {"notification_id": "n-1", "notification_type": "email", "status": "delivered"}
+        ])
+        backend = NotificationStatusStream.get_backend()
+        backend.read('worker-a', 10)
+
+        self.assertEqual(NotificationStatusStream.consume('worker-b', claim_idle_ms=60000, backend=backend), 0)
+        self.assertEqual(backend.stats()['pending'], 1)
+
+    def test_invalid_entries_are_dropped_and_acked(self):
+        """Test entries that can never be written are acked instead of blocking the stream"""
+        good = {
+            'user_id': str(self.user.pk), 'notification_id': 'good', 'notification_type': 'email',
+            'status': 'delivered', 'error': None, 'timestamp': '2026-10-17T09:00:00+00:00',
+        }
+        backend = NotificationStatusStream.get_backend()
+        backend.add([
+            json.dumps(good),
+            json.dumps({key: value for key, value in good.items() if key != 'timestamp'}),
+            json.dumps({**good, 'timestamp': 'yesterday'}),
+            json.dumps({**good, 'user_id': 'not-a-uuid'}),
+            json.dumps({**good, 'status': 'exploded'}),
+            json.dumps(['not', 'an', 'object']),
+            '{broken',
+        ])
+
+        with self.assertLogs('users.streams', 'WARNING') as logs:
+            self.assertEqual(NotificationStatusStream.consume('worker-1', batch_size=10, backend=backend), 7)
+        self.assertEqual(len(logs.output), 6)
+        self.assertEqual(list(NotificationStatusLog.objects.values_list('notification_id', flat=True)), ['good'])
+        self.assertEqual(backend.stats()['pending'], 0)
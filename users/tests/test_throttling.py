@@ -0,0 +1,74 @@
+# users/tests/test_throttling.py
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference
+from users.throttling import InMemoryRateLimitBackend, RateLimiter
+
+def rate_limit(**rates):
+    return {
+        'ENABLED': True,
+        'BACKEND': 'users.throttling.InMemoryRateLimitBackend',
+        'RATES': {**settings.RATE_LIMIT['RATES'], **rates},
+    }
+
+class SlidingWindowTests(SimpleTestCase):
+    def setUp(self):
+        InMemoryRateLimitBackend.reset()
+
+    def test_limit_and_remaining(self):
+        """Test remaining quota counts down and the limit is enforced"""
+        backend = InMemoryRateLimitBackend()
+        results = [backend.hit('scope:ident', 3, 60) for _ in range(4)]
+        self.assertEqual([r.allowed for r in results], [True, True, True, False])
+        self.assertEqual([r.remaining for r in results], [2, 1, 0, 0])
+        self.assertTrue(backend.hit('scope:other', 3, 60).allowed)
+
+    def test_parse_rate(self):
+        """Test DRF style rate strings"""
+        self.assertEqual(RateLimiter.parse_rate('10/min'), (10, 60))
+        self.assertEqual(RateLimiter.parse_rate('20/hour'), (20, 3600))
+
+class EndpointThrottleTests(APITestCase):
+    def setUp(self):
+        InMemoryRateLimitBackend.reset()
+        self.user = User.objects.create_user(email="limited@example.com", password="testpass123", name="Limited")
+        UserPreference.objects.create(user=self.user)
+
+    @override_settings(RATE_LIMIT=rate_limit(login_email='2/min'))
+    def test_login_limited_per_email(self):
+        """Test repeated logins for one email get 429 with quota headers"""
+        credentials = {"email": "limited@example.com", "password": "wrong-pass"}
+        first = self.client.post('/api/v1/users/login/', credentials, format='json')
+        self.assertEqual(first['X-RateLimit-Limit'], '2')
+        self.assertEqual(first['X-RateLimit-Remaining'], '1')
+
+        self.client.post('/api/v1/auth/login/', credentials, format='json')
+        blocked = self.client.post('/api/v1/users/login/', credentials, format='json')
+        self.assertEqual(blocked.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', blocked)
+
+        other = self.client.post('/api/v1/users/login/', {"email": "other@example.com", "password": "x"}, format='json')
+        self.assertEqual(other.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(RATE_LIMIT=rate_limit(login_ip='2/min'))
+    def test_forwarded_for_does_not_bypass_ip_limit(self):
+        """Test a fresh X-Forwarded-For per request still hits the per-IP limit"""
+        codes = [
+            self.client.post(
+                '/api/v1/users/login/', {"email": f"user{i}@example.com", "password": "x"},
+                format='json', HTTP_X_FORWARDED_FOR=f"10.0.0.{i}"
+            ).status_code
+            for i in range(3)
+        ]
+        self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(RATE_LIMIT=rate_limit(status_callback='1/min'))
+    def test_status_callbacks_limited_per_credential(self):
+        """Test status callbacks are limited per authenticated service"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+        data = {"notification_id": "n-1", "status": "delivered"}
+        self.assertEqual(self.client.post('/api/v1/email/status/', data, format='json').status_code, 201)
+        self.assertEqual(self.client.post('/api/v1/email/status/', data, format='json').status_code, 429)
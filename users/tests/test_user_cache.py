@@ -0,0 +1,226 @@
+# users/tests/test_user_cache.py
+import json
+import os
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference
+from users import codecs
+from users.cache import invalidation_bus
+from users.services import PrincipalCacheService, UserCacheService
+
+class UserCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        PrincipalCacheService._local_cache().clear()
+        self.user = User.objects.create_user(
+            email="cached@example.com",
+            password="testpass123",
+            name="Cached User"
+        )
+        UserPreference.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.user)}')
+
+    def test_retrieve_is_read_through(self):
+        """Test retrieve is served from the cache after the first request"""
+        url = f'/api/v1/users/{self.user.id}/'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second.data['data'], first.data['data'])
+        self.assertEqual(second.data['data']['email'], "cached@example.com")
+
+    def test_push_token_update_refreshes_cache(self):
+        """Test update_push_token writes through to the cached entry"""
+        UserCacheService.get_user(self.user.id)
+        response = self.client.patch(
+            f'/api/v1/users/{self.user.id}/update_push_token/',
+            {"push_token": "device-token"},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(UserCacheService.get_user(self.user.id)['push_token'], "device-token")
+
+    def test_preference_update_refreshes_preferences(self):
+        """Test preference changes are visible through get_user_preferences"""
+        self.assertTrue(UserCacheService.get_user_preferences(self.user.id)['email'])
+        response = self.client.patch(
+            f'/api/v1/users/{self.user.id}/',
+            {"preferences": {"email": False, "push": True}},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(UserCacheService.get_user_preferences(self.user.id)['email'])
+
+    def test_unknown_user_returns_404(self):
+        """Test missing and malformed ids return 404"""
+        self.assertEqual(self.client.get('/api/v1/users/not-a-uuid/').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_lookup_backfills_cache(self):
+        """Test bulk lookup resolves misses in one query and caches them"""
+        other = User.objects.create_user(email="other@example.com", password="testpass123", name="Other")
+        UserPreference.objects.create(user=other, push=False)
+        cache.clear()
+        UserCacheService.get_user(self.user.id)
+        missing_id = "00000000-0000-0000-0000-000000000000"
+
+        response = self.client.post(
+            '/api/v1/users/bulk/',
+            {"ids": [str(self.user.id), str(other.id), missing_id]},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        users = response.data['data']['users']
+        self.assertEqual([u['id'] for u in users], [str(self.user.id), str(other.id)])
+        self.assertFalse(users[1]['preferences']['push'])
+        self.assertEqual(response.data['data']['not_found'], [missing_id])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(UserCacheService.get_users([self.user.id, other.id])), 2)
+
+
+@override_settings(USER_CACHE={**settings.USER_CACHE, 'L1_ENABLED': True, 'L1_TTL': 30, 'L1_MAXSIZE': 100})
+class TwoTierUserCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="tiered@example.com", password="testpass123", name="Tiered")
+        UserPreference.objects.create(user=self.user)
+        UserCacheService.drop_local(None)
+
+    def test_l1_serves_repeat_reads(self):
+        """Test the second read is an L1 hit and never reaches Redis"""
+        before = UserCacheService.get_stats()
+        UserCacheService.get_user(self.user.id)
+        cache.clear()
+        self.assertEqual(UserCacheService.get_user(self.user.id)['email'], "tiered@example.com")
+
+        after = UserCacheService.get_stats()
+        self.assertEqual(after['l1_hits'] - before['l1_hits'], 1)
+        self.assertEqual(after['l2_misses'] - before['l2_misses'], 1)
+
+    def test_remote_invalidation_drops_l1_entry(self):
+        """Test an invalidation published by another process clears L1"""
+        UserCacheService.get_user(self.user.id)
+        User.objects.filter(pk=self.user.pk).update(name="Renamed")
+        cache.clear()
+
+        invalidation_bus.handle(json.dumps({'origin': 'another-worker', 'ids': [str(self.user.id)]}))
+        self.assertEqual(UserCacheService.get_user(self.user.id)['name'], "Renamed")
+
+    def test_own_messages_are_ignored(self):
+        """Test a process does not drop entries it just wrote"""
+        UserCacheService.get_user(self.user.id)
+        invalidation_bus.handle(json.dumps({'origin': invalidation_bus.origin, 'ids': [str(self.user.id)]}))
+        self.assertEqual(UserCacheService.get_stats()['l1_size'], 1)
+
+    def test_forked_workers_get_their_own_origin(self):
+        """Test a worker forked after import does not share the parent's origin"""
+        parent = invalidation_bus.origin
+        with mock.patch('users.cache.os.getpid', return_value=os.getpid() + 1):
+            child = invalidation_bus.origin
+            self.assertNotEqual(child, parent)
+            self.assertEqual(invalidation_bus.origin, child)
+
+
+class StampedeProtectionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="stampede@example.com", password="testpass123", name="Stampede")
+        UserPreference.objects.create(user=self.user)
+        self.key = UserCacheService._cache_key(self.user.id)
+
+    def expire_soft(self):
+        user_data, _, version = UserCacheService._decode(cache.get(self.key))
+        cache.set(self.key, codecs.encode(UserCacheService._pack(user_data, 0, version), codecs.JSONCodec()), 60)
+
+    def test_stale_entry_is_served_while_another_request_refreshes(self):
+        """Test a stale entry is returned without a query when the refresh lock is held"""
+        UserCacheService.get_user(self.user.id)
+        self.expire_soft()
+        cache.add(f"lock:{self.key}", 1, 5)
+
+        with self.assertNumQueries(0):
+            user_data = UserCacheService.get_user(self.user.id)
+        self.assertEqual(user_data['email'], "stampede@example.com")
+
+    def test_stale_entry_is_refreshed_by_lock_holder(self):
+        """Test the request that wins the lock reloads the entry and releases the lock"""
+        UserCacheService.get_user(self.user.id)
+        self.expire_soft()
+        User.objects.filter(id=self.user.id).update(name="Renamed")
+
+        self.assertEqual(UserCacheService.get_user(self.user.id)['name'], "Renamed")
+        self.assertIsNone(cache.get(f"lock:{self.key}"))
+        self.assertGreater(UserCacheService._decode(cache.get(self.key))[1], 0)
+
+    @override_settings(USER_CACHE={**settings.USER_CACHE, 'LOCK_WAIT': 0})
+    def test_miss_falls_back_to_database_when_lock_is_stuck(self):
+        """Test a cold miss still loads from the database if the lock holder never fills the cache"""
+        cache.add(f"lock:{self.key}", 1, 5)
+        self.assertEqual(UserCacheService.get_user(self.user.id)['email'], "stampede@example.com")
+
+    def test_soft_expiry_is_jittered(self):
+        """Test soft expiries spread across the configured jitter window"""
+        user_data = UserCacheService.get_user(self.user.id)
+        expiries = {UserCacheService._decode(UserCacheService._encode(user_data, 1))[1] for _ in range(20)}
+        self.assertGreater(len(expiries), 1)
+
+    def test_bulk_lookup_refreshes_stale_entries(self):
+        """Test get_users reloads stale entries in its single query"""
+        UserCacheService.get_user(self.user.id)
+        self.expire_soft()
+        User.objects.filter(id=self.user.id).update(name="Bulk Renamed")
+
+        with self.assertNumQueries(1):
+            users = UserCacheService.get_users([str(self.user.id)])
+        self.assertEqual(users[str(self.user.id)]['name'], "Bulk Renamed")
+
+    def test_bulk_lookup_drops_stale_entries_of_deactivated_users(self):
+        """Test a stale entry whose user was deactivated is not returned and is purged"""
+        UserCacheService.get_user(self.user.id)
+        self.expire_soft()
+        User.objects.filter(id=self.user.id).update(is_active=False)
+
+        self.assertEqual(UserCacheService.get_users([str(self.user.id)]), {})
+        self.assertIsNone(cache.get(self.key))
+
+
+class CacheCodecTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="codec@example.com", password="testpass123", name="Codec")
+        UserPreference.objects.create(user=self.user)
+        self.key = UserCacheService._cache_key(self.user.id)
+
+    def test_entry_round_trips_through_codec(self):
+        """Test the compact entry decodes back to the serializer payload"""
+        user_data = UserCacheService.get_user(self.user.id)
+        cached_user = cache.get(self.key)
+        self.assertIsInstance(cached_user, bytes)
+        self.assertEqual(UserCacheService._decode(cached_user)[0], user_data)
+
+    def test_compression_round_trips(self):
+        """Test bodies over the threshold are compressed and still decode"""
+        value = ['x' * 2000]
+        encoded = codecs.encode(value, codecs.JSONCodec(), compress_min_size=1024)
+        self.assertTrue(encoded[0] & codecs.COMPRESSED)
+        self.assertLess(len(encoded), 2000)
+        self.assertEqual(codecs.decode(encoded), value)
+
+    def test_legacy_json_entry_is_served_as_stale(self):
+        """Test JSON text written by earlier releases is still readable"""
+        cache.set(self.key, json.dumps({'id': str(self.user.id), 'email': "codec@example.com"}), 60)
+        user_data, soft_expires, version = UserCacheService._decode(cache.get(self.key))
+        self.assertEqual(user_data['email'], "codec@example.com")
+        self.assertEqual((soft_expires, version), (0, None))
+
+    def test_other_layout_is_a_miss(self):
+        """Test entries packed for a different field layout are reloaded from the database"""
+        cache.set(self.key, codecs.encode([UserCacheService.LAYOUT + 1, 0, 'junk'], codecs.JSONCodec()), 60)
+        self.assertEqual(UserCacheService.get_user(self.user.id)['email'], "codec@example.com")
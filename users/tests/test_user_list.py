@@ -0,0 +1,66 @@
+# users/tests/test_user_list.py
+import base64
+import json
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.authentication import generate_jwt_token
+from users.models import User, UserPreference
+from users.services import DeviceTokenService
+
+class UserListTests(APITestCase):
+    def setUp(self):
+        self.users = []
+        for i in range(5):
+            user = User.objects.create_user(
+                email=f"user{i}@example.com",
+                password="testpass123",
+                name=f"User {i}",
+                push_token=f"tok-{i}" if i % 2 else None
+            )
+            UserPreference.objects.create(user=user, email=i != 0)
+            if user.push_token:
+                DeviceTokenService.register(user.pk, [{'token': user.push_token}])
+            self.users.append(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_jwt_token(self.users[0])}')
+
+    def collect(self, params):
+        emails, url = [], '/api/v1/users/'
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            emails += [user['email'] for user in response.data['data']['results']]
+            url, params = response.data['data']['next'], None
+        return emails
+
+    def test_cursor_pagination_walks_all_users_in_order(self):
+        """Test keyset pages cover every user exactly once in created order"""
+        self.assertEqual(self.collect({'page_size': 2}), [user.email for user in self.users])
+
+    def test_filters(self):
+        """Test preference and push token filters"""
+        self.assertEqual(self.collect({'has_push_token': 'true'}), ["user1@example.com", "user3@example.com"])
+        self.assertEqual(self.collect({'email_enabled': 'false'}), ["user0@example.com"])
+        # Devices registered through /users/devices/ count too
+        DeviceTokenService.register(self.users[2].pk, [{'token': 'device-only'}])
+        self.assertEqual(
+            self.collect({'has_push_token': 'false'}), ["user0@example.com", "user4@example.com"]
+        )
+
+    def test_inactive_users_excluded_by_default(self):
+        """Test list defaults to active users"""
+        self.users[4].is_active = False
+        self.users[4].save()
+        self.assertNotIn("user4@example.com", self.collect({}))
+        self.assertEqual(self.collect({'is_active': 'false'}), ["user4@example.com"])
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected"""
+        response = self.client.get('/api/v1/users/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_forged_cursor(self):
+        """Test well-formed cursors with values of the wrong type are rejected"""
+        for position in (["not-a-date", "zzz"], ["2026-10-17T00:00:00+00:00", "zzz"], [5, None]):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+            response = self.client.get('/api/v1/users/', {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
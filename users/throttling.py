@@ -0,0 +1,190 @@
+# users/throttling.py
+import hashlib
+import logging
+import threading
+import time
+from collections import namedtuple
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'limit', 'remaining', 'reset'])
+
+# Sliding window counter: the previous fixed window's count is weighted by
+# how much of it still overlaps the sliding window. Two small integer keys
+# per identity instead of one sorted-set member per request.
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local estimated = previous * (window - elapsed) / window + current
+if estimated >= limit then
+    return {0, 0, window - elapsed}
+end
+redis.call('INCR', KEYS[1])
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {1, math.floor(limit - estimated - 1), window - elapsed}
+"""
+
+
+class RedisRateLimitBackend:
+    """Sliding-window limits evaluated atomically in Redis with a Lua script."""
+    key_prefix = 'user_service:rl'
+
+    def __init__(self):
+        from django_redis import get_redis_connection
+
+        self.script = get_redis_connection('default').register_script(SLIDING_WINDOW_LUA)
+
+    def hit(self, key, limit, window):
+        window_ms = window * 1000
+        now_ms = int(time.time() * 1000)
+        index = now_ms // window_ms
+        allowed, remaining, reset_ms = self.script(
+            keys=[f'{self.key_prefix}:{key}:{index}', f'{self.key_prefix}:{key}:{index - 1}'],
+            args=[limit, window_ms, now_ms % window_ms]
+        )
+        return RateLimitResult(bool(allowed), limit, int(remaining), reset_ms / 1000)
+
+
+class InMemoryRateLimitBackend:
+    """Process-local implementation of the same algorithm, for tests and local runs."""
+    _windows = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._windows.clear()
+
+    def hit(self, key, limit, window):
+        window_ms = window * 1000
+        now_ms = int(time.time() * 1000)
+        index, elapsed = divmod(now_ms, window_ms)
+
+        with self._lock:
+            counts = self._windows.setdefault(key, {})
+            for stale in [i for i in counts if i < index - 1]:
+                del counts[stale]
+
+            estimated = counts.get(index - 1, 0) * (window_ms - elapsed) / window_ms + counts.get(index, 0)
+            if estimated >= limit:
+                return RateLimitResult(False, limit, 0, (window_ms - elapsed) / 1000)
+
+            counts[index] = counts.get(index, 0) + 1
+            return RateLimitResult(True, limit, int(limit - estimated - 1), (window_ms - elapsed) / 1000)
+
+
+class RateLimiter:
+    """Entry point for settings.RATE_LIMIT; rates use DRF's 'num/period' format."""
+    PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+    _backend = None
+    _backend_path = None
+
+    @classmethod
+    def get_backend(cls):
+        path = settings.RATE_LIMIT['BACKEND']
+        if cls._backend is None or cls._backend_path != path:
+            cls._backend = import_string(path)()
+            cls._backend_path = path
+        return cls._backend
+
+    @classmethod
+    def parse_rate(cls, rate):
+        num, period = rate.split('/')
+        return int(num), cls.PERIODS[period[0]]
+
+    @classmethod
+    def hit(cls, scope, ident):
+        """Count one request for ident in scope; None when the scope is not limited."""
+        config = settings.RATE_LIMIT
+        rate = config['RATES'].get(scope)
+        if not config['ENABLED'] or not rate:
+            return None
+
+        limit, window = cls.parse_rate(rate)
+        try:
+            return cls.get_backend().hit(f'{scope}:{ident}', limit, window)
+        except Exception:
+            # Fail open: losing the limiter must not take authentication down
+            logger.exception("Rate limit backend unavailable for scope %s", scope)
+            return None
+
+    @classmethod
+    def check(cls, checks):
+        """Apply several (scope, ident) limits; returns the most restrictive result."""
+        results = [cls.hit(scope, ident) for scope, ident in checks if ident is not None]
+        return most_restrictive(results)
+
+
+def most_restrictive(results):
+    results = [result for result in results if result is not None]
+    if not results:
+        return None
+    return min(results, key=lambda result: (result.allowed, result.remaining))
+
+def hash_ident(value):
+    # Keeps emails and other PII out of Redis key names
+    return hashlib.sha256(value.strip().lower().encode()).hexdigest()[:32]
+
+def apply_rate_limit_headers(response, result):
+    if result is not None:
+        response['X-RateLimit-Limit'] = str(result.limit)
+        response['X-RateLimit-Remaining'] = str(result.remaining)
+        response['X-RateLimit-Reset'] = str(int(result.reset) + 1)
+        if not result.allowed:
+            response['Retry-After'] = str(int(result.reset) + 1)
+    return response
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """DRF throttle backed by RateLimiter; identifies clients by IP unless overridden."""
+    scope = None
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        ident = self.get_ident_key(request, view)
+        self.result = RateLimiter.hit(self.scope, ident) if ident is not None else None
+        if self.result is None:
+            return True
+        # Remember the tightest limit for the X-RateLimit-* headers
+        request.rate_limit = most_restrictive([getattr(request, 'rate_limit', None), self.result])
+        return self.result.allowed
+
+    def wait(self):
+        return self.result.reset if self.result else None
+
+class LoginIPThrottle(SlidingWindowThrottle):
+    scope = 'login_ip'
+
+class LoginEmailThrottle(SlidingWindowThrottle):
+    scope = 'login_email'
+
+    def get_ident_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return hash_ident(email) if isinstance(email, str) and email else None
+
+class RegisterIPThrottle(SlidingWindowThrottle):
+    scope = 'register_ip'
+
+class StatusCallbackThrottle(SlidingWindowThrottle):
+    """Per service credential, i.e. the authenticated user posting callbacks."""
+    scope = 'status_callback'
+
+    def get_ident_key(self, request, view):
+        return request.user.pk if request.user and request.user.is_authenticated else self.get_ident(request)
+
+
+class RateLimitHeadersMixin:
+    """Adds X-RateLimit-* headers for whichever throttle ran on the request."""
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        return apply_rate_limit_headers(response, getattr(request, 'rate_limit', None))
@@ -1,6 +1,7 @@
 # users/urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import UserViewSet, NotificationStatusViewSet, HealthCheckView
 
 router = DefaultRouter()
@@ -15,6 +16,10 @@ urlpatterns = [
          NotificationStatusViewSet.as_view({'post': 'create'}), 
          name='notification-status-create'),
     
+    # Async auth endpoints (password hashing on the bounded pool; serve via ASGI)
+    path('api/v1/auth/register/', async_views.register, name='auth-register'),
+    path('api/v1/auth/login/', async_views.login, name='auth-login'),
+    
     # Health check
     path('health/', HealthCheckView.as_view(), name='health-check'),
 ]
\ No newline at end of file
@@ -4,20 +4,44 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from django.core.cache import cache
 
-from .models import User, UserPreference, NotificationStatusLog
+from .models import User, UserPreference, NotificationStatusLog, NotificationCurrentStatus
 from .serializers import (
     UserCreateSerializer, UserUpdateSerializer, UserResponseSerializer,
-    NotificationStatusSerializer, UserLoginSerializer
+    NotificationStatusSerializer, UserLoginSerializer, UserBulkLookupSerializer,
+    NotificationCurrentStatusSerializer, NotificationStatsQuerySerializer,
+    DeviceSerializer, DeviceRegisterSerializer, DeviceTokenListSerializer, USER_VALUES, STATUS_LOG_VALUES, user_row_data, status_log_row_data
 )
 from .authentication import generate_jwt_token
-from .services import UserCacheService
+from .filters import UserFilter, NotificationHistoryFilter
+from .pagination import KeysetPagination, NotificationHistoryPagination
+from .partitions import StatusLogPartitions
+from .routers import ReplicaReadsMixin
+from .services import (
+    UserCacheService, RecipientSegmentService, CurrentStatusService, LastLoginService, StatusRollupService,
+    DeviceTokenService
+)
+from .streams import NotificationStatusStream
+from .db.pool import connection_stats
+from .hash_pool import get_password_hash_pool
+from .throttling import (
+    RateLimitHeadersMixin, LoginIPThrottle, LoginEmailThrottle,
+    RegisterIPThrottle, StatusCallbackThrottle
+)
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadsMixin, RateLimitHeadersMixin, viewsets.ModelViewSet):
     queryset = User.objects.filter(is_active=True).select_related('preference')
+    replica_actions = ('list', 'retrieve', 'bulk')
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filterset_class = UserFilter
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -27,10 +51,21 @@ class UserViewSet(viewsets.ModelViewSet):
         return UserResponseSerializer
     
     def get_permissions(self):
-        if self.action == 'create':
+        if self.action in ['create', 'login']:
             return [AllowAny()]
         return [IsAuthenticated()]
     
+    def get_throttles(self):
+        if self.action == 'login':
+            return [LoginIPThrottle(), LoginEmailThrottle()]
+        if self.action == 'create':
+            return [RegisterIPThrottle()]
+        return []
+    
+    def perform_update(self, serializer):
+        user = serializer.save()
+        UserCacheService.set_user(user)
+    
     def create(self, request):
         """
         POST /api/v1/users/
@@ -52,14 +87,14 @@ class UserViewSet(viewsets.ModelViewSet):
             # Generate JWT token for immediate login
             token = generate_jwt_token(user)
             
-            # Invalidate cache
-            UserCacheService.invalidate_user(user.id)
+            # Warm the cache with the new user
+            user_data = UserCacheService.set_user(user)
             
             return Response({
                 "success": True,
                 "message": "User created successfully",
                 "data": {
-                    "user": UserResponseSerializer(user).data,
+                    "user": user_data,
                     "token": token
                 }
             }, status=status.HTTP_201_CREATED)
@@ -72,34 +107,252 @@ class UserViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     def list(self, request):
-        """Get all users (for internal use)"""
-        users = self.get_queryset()
-        serializer = UserResponseSerializer(users, many=True)
+        """
+        Get users page by page (for internal use)
+        GET /api/v1/users/?cursor=...&page_size=...&is_active=&created_after=
+            &created_before=&email_enabled=&push_enabled=&has_push_token=
+        """
+        queryset = self.filter_queryset(User.objects.all()).values(*USER_VALUES)
+        page = self.paginate_queryset(queryset)
         
         return Response({
             "success": True,
             "message": "Users retrieved successfully",
-            "data": serializer.data
+            "data": self.paginator.get_paginated_data([user_row_data(row) for row in page])
         })
     
+    def get_validators(self, request, version):
+        """ETag and Last-Modified (epoch seconds) for a cached user version"""
+        # JSON and msgpack bodies differ, so each representation gets its own strong ETag
+        etag = f'"{UserCacheService.LAYOUT:x}-{version:x}-{request.accepted_renderer.format}"'
+        return etag, version // 1_000_000
+    
     def retrieve(self, request, pk=None):
-        """Get specific user"""
-        try:
-            user = self.get_queryset().get(id=pk)
-            serializer = UserResponseSerializer(user)
-            
+        """
+        Get specific user
+        Supports If-None-Match / If-Modified-Since; revalidations are answered
+        from the user cache with an empty 304
+        """
+        cached = UserCacheService.get_user_version(pk)
+        if cached is None:
             return Response({
+                "success": False,
+                "error": "user_not_found",
+                "message": "User not found",
+                "data": {}
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        user_data, version = cached
+        response = None
+        if version is not None:  # None only for entries cached by older releases
+            etag, last_modified = self.get_validators(request, version)
+            response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        
+        if response is None:
+            response = Response({
                 "success": True,
                 "message": "User retrieved successfully",
-                "data": serializer.data
+                "data": user_data
             })
-        except User.DoesNotExist:
+        
+        if version is not None:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        # The body and ETag depend on the negotiated format; shared caches must key on it
+        patch_vary_headers(response, ['Accept'])
+        return response
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        POST /api/v1/users/bulk/
+        {
+          "ids": ["uuid", ...]
+        }
+        Resolve notification recipients in one call (for internal use)
+        """
+        serializer = UserBulkLookupSerializer(data=request.data)
+        if not serializer.is_valid():
             return Response({
                 "success": False,
-                "error": "user_not_found",
-                "message": "User not found",
+                "error": "validation_failed",
+                "message": "Please check your input",
+                "data": serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in serializer.validated_data['ids']))
+        users = UserCacheService.get_users(user_ids)
+        
+        return Response({
+            "success": True,
+            "message": "Users retrieved successfully",
+            "data": {
+                "users": [users[user_id] for user_id in user_ids if user_id in users],
+                "not_found": [user_id for user_id in user_ids if user_id not in users]
+            }
+        })
+    
+    @action(detail=False, methods=['get', 'post'])
+    def devices(self, request):
+        """
+        GET /api/v1/users/devices/
+        POST /api/v1/users/devices/
+        {
+          "devices": [{"token": "str", "platform": "ios|android|web"}, ...]
+        }
+        List or register the current user's push devices
+        """
+        if request.method == 'GET':
+            return Response({
+                "success": True,
+                "message": "Devices retrieved successfully",
+                "data": {"devices": DeviceTokenService.get_tokens([request.user.pk])[str(request.user.pk)]}
+            })
+        
+        serializer = DeviceRegisterSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                "success": False,
+                "error": "validation_failed",
+                "message": "Please check your input",
+                "data": serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        registered = DeviceTokenService.register(request.user.pk, serializer.validated_data['devices'])
+        return Response({
+            "success": True,
+            "message": "Devices registered successfully",
+            "data": {"registered": registered}
+        }, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'], url_path='devices/unregister')
+    def unregister_devices(self, request):
+        """
+        POST /api/v1/users/devices/unregister/
+        {
+          "tokens": ["str", ...]
+        }
+        Remove some of the current user's devices, e.g. on logout
+        """
+        serializer = DeviceTokenListSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                "success": False,
+                "error": "validation_failed",
+                "message": "Please check your input",
+                "data": serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        removed = DeviceTokenService.unregister(request.user.pk, serializer.validated_data['tokens'])
+        return Response({
+            "success": True,
+            "message": f"{removed} devices removed",
+            "data": {"removed": removed}
+        })
+    
+    @action(detail=False, methods=['post'], url_path='devices/prune')
+    def prune_devices(self, request):
+        """
+        POST /api/v1/users/devices/prune/
+        {
+          "tokens": ["str", ...]
+        }
+        Drop tokens the push provider rejected, whichever user owns them (staff only)
+        """
+        if not request.user.is_staff:
+            return Response({
+                "success": False,
+                "error": "permission_denied",
+                "message": "Pruning devices is limited to staff",
                 "data": {}
-            }, status=status.HTTP_404_NOT_FOUND)
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        serializer = DeviceTokenListSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                "success": False,
+                "error": "validation_failed",
+                "message": "Please check your input",
+                "data": serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        pruned = DeviceTokenService.prune(serializer.validated_data['tokens'])
+        return Response({
+            "success": True,
+            "message": f"{pruned} devices pruned",
+            "data": {"pruned": pruned}
+        })
+    
+    @action(detail=False, methods=['post'], url_path='devices/lookup')
+    def device_lookup(self, request):
+        """
+        POST /api/v1/users/devices/lookup/
+        {
+          "ids": ["uuid", ...]
+        }
+        Push devices for many users in one call, for fan-out (staff only)
+        """
+        if not request.user.is_staff:
+            return Response({
+                "success": False,
+                "error": "permission_denied",
+                "message": "Looking up devices is limited to staff",
+                "data": {}
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        serializer = UserBulkLookupSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                "success": False,
+                "error": "validation_failed",
+                "message": "Please check your input",
+                "data": serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in serializer.validated_data['ids']))
+        return Response({
+            "success": True,
+            "message": "Devices retrieved successfully",
+            "data": {"devices": DeviceTokenService.get_tokens(user_ids)}
+        })
+    
+    @action(detail=False, methods=['get'])
+    def segment(self, request):
+        """
+        GET /api/v1/users/segment/?segment=email|push&output=ndjson|csv
+        Stream every recipient in a campaign segment (staff only)
+        """
+        if not request.user.is_staff:
+            return Response({
+                "success": False,
+                "error": "permission_denied",
+                "message": "Exporting segments is limited to staff",
+                "data": {}
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        segment = request.query_params.get('segment')
+        output = request.query_params.get('output', 'ndjson')
+        
+        if segment not in RecipientSegmentService.SEGMENTS:
+            return Response({
+                "success": False,
+                "error": "invalid_segment",
+                "message": "Segment must be 'email' or 'push'",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if output not in RecipientSegmentService.CONTENT_TYPES:
+            return Response({
+                "success": False,
+                "error": "invalid_output",
+                "message": "Output must be 'ndjson' or 'csv'",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return StreamingHttpResponse(
+            RecipientSegmentService.stream(segment, output),
+            content_type=RecipientSegmentService.CONTENT_TYPES[output]
+        )
     
     @action(detail=False, methods=['post'], permission_classes=[AllowAny])
     def login(self, request):
@@ -109,14 +362,14 @@ class UserViewSet(viewsets.ModelViewSet):
             user = serializer.validated_data['user']
             token = generate_jwt_token(user)
             
-            user.save()  # Update last login
-            UserCacheService.invalidate_user(user.id)
+            LastLoginService.record(user)
+            user_data = UserCacheService.get_user(user.id)
             
             return Response({
                 "success": True,
                 "message": "Login successful",
                 "data": {
-                    "user": UserResponseSerializer(user).data,
+                    "user": user_data,
                     "token": token
                 }
             })
@@ -142,66 +395,111 @@ class UserViewSet(viewsets.ModelViewSet):
                 "data": {}
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        user.push_token = push_token
-        user.save()
-        UserCacheService.invalidate_user(user.id)
+        serializer = DeviceSerializer(data={"token": push_token})
+        if not serializer.is_valid():
+            return Response({
+                "success": False,
+                "error": "validation_failed",
+                "message": "Please check your input",
+                "data": serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        push_token = serializer.validated_data['token']
+        
+        # Older clients only know this endpoint; keep their device in the registry too,
+        # and never leave the legacy column updated without it
+        with transaction.atomic():
+            user.push_token = push_token
+            user.save()
+            DeviceTokenService.register(user.pk, [{"token": push_token}])
+        user_data = UserCacheService.set_user(user)
         
         return Response({
             "success": True,
             "message": "Push token updated successfully",
-            "data": UserResponseSerializer(user).data
+            "data": user_data
         })
 
-class NotificationStatusViewSet(viewsets.ModelViewSet):
+class NotificationStatusViewSet(ReplicaReadsMixin, RateLimitHeadersMixin, viewsets.ModelViewSet):
     queryset = NotificationStatusLog.objects.all()
+    replica_actions = ('history', 'stats')
     serializer_class = NotificationStatusSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = NotificationHistoryPagination
+    filterset_class = NotificationHistoryFilter
     
-    def create(self, request, notification_preference=None):
-        """
-        POST /api/v1/{notification_preference}/status/
-        {
-          "notification_id": "str",
-          "status": "delivered|pending|failed", 
-          "timestamp": "2024-01-01T10:00:00Z",  # optional
-          "error": "str"  # optional, required for failed status
-        }
-        """
+    def get_throttles(self):
+        if self.action in ['create', 'batch']:
+            return [StatusCallbackThrottle()]
+        return []
+    
+    @staticmethod
+    def validate_status_event(data, notification_type):
+        """Apply the status callback rules; return an error body or None"""
         # Validate notification_preference
-        if notification_preference not in ['email', 'push']:
-            return Response({
+        if notification_type not in ['email', 'push']:
+            return {
                 "success": False,
                 "error": "invalid_notification_type",
                 "message": "Notification type must be 'email' or 'push'",
                 "data": {}
-            }, status=status.HTTP_400_BAD_REQUEST)
+            }
         
         # Validate status
-        status_value = request.data.get('status')
+        status_value = data.get('status')
         if status_value not in ['delivered', 'pending', 'failed']:
-            return Response({
+            return {
                 "success": False, 
                 "error": "invalid_status",
                 "message": "Status must be 'delivered', 'pending', or 'failed'",
                 "data": {}
-            }, status=status.HTTP_400_BAD_REQUEST)
+            }
         
         # Validate error for failed status
-        if status_value == 'failed' and not request.data.get('error'):
-            return Response({
+        if status_value == 'failed' and not data.get('error'):
+            return {
                 "success": False,
                 "error": "missing_error",
                 "message": "Error field is required for failed status",
                 "data": {}
-            }, status=status.HTTP_400_BAD_REQUEST)
+            }
+        
+        return None
+    
+    def create(self, request, notification_preference=None):
+        """
+        POST /api/v1/{notification_preference}/status/
+        {
+          "notification_id": "str",
+          "status": "delivered|pending|failed", 
+          "timestamp": "2024-01-01T10:00:00Z",  # optional
+          "error": "str"  # optional, required for failed status
+        }
+        """
+        error = self.validate_status_event(request.data, notification_preference)
+        if error:
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
+            # Write-behind mode: the stream consumer inserts the row
+            if NotificationStatusStream.enabled():
+                NotificationStatusStream.publish(request.user.pk, [
+                    {**serializer.validated_data, "notification_type": notification_preference}
+                ])
+                
+                return Response({
+                    "success": True,
+                    "message": "Notification status accepted",
+                    "data": serializer.validated_data
+                }, status=status.HTTP_202_ACCEPTED)
+            
             # Add user and notification_type from context
-            notification_log = serializer.save(
-                user=request.user,
-                notification_type=notification_preference
-            )
+            with transaction.atomic():
+                notification_log = serializer.save(
+                    user=request.user,
+                    notification_type=notification_preference
+                )
+                CurrentStatusService.record([notification_log])
             
             return Response({
                 "success": True,
@@ -216,29 +514,169 @@ class NotificationStatusViewSet(viewsets.ModelViewSet):
             "data": serializer.errors
         }, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        POST /api/v1/status/batch/
+        {
+          "events": [
+            {
+              "notification_id": "str",
+              "notification_type": "email|push",
+              "status": "delivered|pending|failed",
+              "error": "str"  # optional, required for failed status
+            }
+          ]
+        }
+        Events are validated like single callbacks and valid ones are inserted
+        with one bulk_create (or published to the status stream when enabled). Results are reported per item, by index, so
+        callers can retry only the failures.
+        """
+        events = request.data.get('events') if isinstance(request.data, dict) else None
+        max_events = settings.NOTIFICATION_STATUS_BATCH_MAX
+        if not isinstance(events, list) or not events or len(events) > max_events:
+            return Response({
+                "success": False,
+                "error": "invalid_batch",
+                "message": f"events must be a list of 1 to {max_events} status events",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        results = []
+        valid_events = []
+        for index, event in enumerate(events):
+            if not isinstance(event, dict):
+                event = {}
+            error = self.validate_status_event(event, event.get('notification_type'))
+            if error is None:
+                serializer = self.get_serializer(data=event)
+                if serializer.is_valid():
+                    valid_events.append({**serializer.validated_data, "notification_type": event['notification_type']})
+                    results.append({"index": index, "success": True})
+                    continue
+                error = {
+                    "success": False,
+                    "error": "validation_failed",
+                    "message": "Please check your input",
+                    "data": serializer.errors
+                }
+            results.append({"index": index, **error})
+        
+        created = len(valid_events)
+        if NotificationStatusStream.enabled():
+            if valid_events:
+                NotificationStatusStream.publish(request.user.pk, valid_events)
+            success_status = status.HTTP_202_ACCEPTED
+        else:
+            logs = [NotificationStatusLog(user=request.user, **event) for event in valid_events]
+            with transaction.atomic():
+                NotificationStatusLog.objects.bulk_create(logs)
+                CurrentStatusService.record(logs)
+            success_status = status.HTTP_201_CREATED
+        
+        return Response({
+            "success": created == len(events),
+            "message": f"{created} of {len(events)} notification statuses logged",
+            "data": {
+                "created": created,
+                "failed": len(events) - created,
+                "results": results
+            }
+        }, status=success_status if created == len(events) else status.HTTP_207_MULTI_STATUS)
+    
     @action(detail=False, methods=['get'])
-    def history(self, request):
-        """Get notification history for current user"""
+    def current(self, request):
+        """
+        GET /api/v1/status/current/?notification_id=str&type=email|push
+        Current status of one notification, read by its unique key
+        """
+        notification_id = request.query_params.get('notification_id')
         notification_type = request.query_params.get('type')
         
-        queryset = NotificationStatusLog.objects.filter(user=request.user)
+        if not notification_id or notification_type not in ['email', 'push']:
+            return Response({
+                "success": False,
+                "error": "invalid_lookup",
+                "message": "notification_id and type ('email' or 'push') are required",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        if notification_type in ['email', 'push']:
-            queryset = queryset.filter(notification_type=notification_type)
+        try:
+            current_status = NotificationCurrentStatus.objects.get(
+                notification_id=notification_id,
+                notification_type=notification_type,
+                user=request.user
+            )
+        except NotificationCurrentStatus.DoesNotExist:
+            return Response({
+                "success": False,
+                "error": "notification_not_found",
+                "message": "Notification not found",
+                "data": {}
+            }, status=status.HTTP_404_NOT_FOUND)
         
-        queryset = queryset.order_by('-timestamp')
+        return Response({
+            "success": True,
+            "message": "Notification status retrieved successfully",
+            "data": NotificationCurrentStatusSerializer(current_status).data
+        })
+    
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """
+        Get notification history for current user, newest first
+        GET /api/v1/status/history/?cursor=...&page_size=...&type=email|push
+            &status=delivered|pending|failed&since=...&until=...&include_count=true
+        """
+        queryset = self.filter_queryset(NotificationStatusLog.objects.filter(user=request.user))
+        retention_start = StatusLogPartitions.retention_start()
+        if retention_start is not None and StatusLogPartitions.supported():
+            # Rows past retention may not be dropped yet; hide them and skip their partitions.
+            # Unpartitioned backends never expire rows, so they keep their full history
+            queryset = queryset.filter(timestamp__gte=retention_start)
         
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        page = self.paginate_queryset(queryset.values(*STATUS_LOG_VALUES))
+        return self.get_paginated_response([status_log_row_data(row) for row in page])
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Delivery statistics from the rollup tables, never the raw log
+        GET /api/v1/status/stats/?since=YYYY-MM-DD&until=YYYY-MM-DD&type=email|push&scope=user|global
+        scope=user (default) gives the current user's daily counts; scope=global
+        gives hourly counts across all users and is limited to staff.
+        """
+        serializer = NotificationStatsQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response({
+                "success": False,
+                "error": "validation_failed",
+                "message": "Please check your input",
+                "data": serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        query = serializer.validated_data
         
-        serializer = self.get_serializer(queryset, many=True)
+        if query['scope'] == 'global':
+            if not request.user.is_staff:
+                return Response({
+                    "success": False,
+                    "error": "permission_denied",
+                    "message": "Global statistics are limited to staff",
+                    "data": {}
+                }, status=status.HTTP_403_FORBIDDEN)
+            stats = StatusRollupService.global_stats(query['since'], query['until'], query.get('type'))
+        else:
+            stats = StatusRollupService.user_stats(request.user.pk, query['since'], query['until'], query.get('type'))
         
         return Response({
             "success": True,
-            "message": "Notification history retrieved successfully",
-            "data": serializer.data
+            "message": "Notification statistics retrieved successfully",
+            "data": {
+                "scope": query['scope'],
+                "since": query['since'].isoformat(),
+                "until": query['until'].isoformat(),
+                **stats
+            }
         })
 
 class HealthCheckView(APIView):
@@ -257,12 +695,23 @@ class HealthCheckView(APIView):
         except Exception as e:
             redis_status = f'unhealthy: {str(e)}'
         
+        dependencies = {
+            "database": db_status,
+            "redis": redis_status,
+            "database_connections": connection_stats(),
+            "password_hash_pool": get_password_hash_pool().stats(),
+            "user_cache": UserCacheService.get_stats()
+        }
+        
+        if NotificationStatusStream.enabled():
+            try:
+                dependencies["status_stream"] = NotificationStatusStream.get_backend().stats()
+            except Exception as e:
+                dependencies["status_stream"] = f'unhealthy: {str(e)}'
+        
         return Response({
             "status": "healthy",
             "service": "user-service",
             "timestamp": timezone.now().isoformat(),
-            "dependencies": {
-                "database": db_status,
-                "redis": redis_status
-            }
+            "dependencies": dependencies
         })